@@ -0,0 +1,44 @@
+-- Variants of the target tables with large payloads, see Large Payloads in README.md
+
+drop table gl_stream_array_clob purge
+/
+
+drop table gl_stream_array_blob purge
+/
+
+drop table gl_stream_array_json purge
+/
+
+-- CLOB payload, --payloadtype clob
+create table gl_stream_array_clob (
+  id varchar2(40) not null,
+  run_id varchar2(40) not null,
+  scenario varchar2(20) not null,
+  ts timestamp not null,
+  payload clob,
+  constraint gl_stream_array_clob_is_json check (payload is json)
+)
+lob (payload) store as securefile (cache)
+/
+
+-- BLOB payload with UTF-8 encoded JSON, --payloadtype blob
+create table gl_stream_array_blob (
+  id varchar2(40) not null,
+  run_id varchar2(40) not null,
+  scenario varchar2(20) not null,
+  ts timestamp not null,
+  payload blob,
+  constraint gl_stream_array_blob_is_json check (payload is json)
+)
+lob (payload) store as securefile (cache)
+/
+
+-- Native JSON payload stored as OSON, requires Oracle Database 21c+, --payloadtype json
+create table gl_stream_array_json (
+  id varchar2(40) not null,
+  run_id varchar2(40) not null,
+  scenario varchar2(20) not null,
+  ts timestamp not null,
+  payload json
+)
+/
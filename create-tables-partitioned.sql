@@ -0,0 +1,100 @@
+-- Partitioned variants of the target tables, see Partitioned Targets in README.md
+
+drop table gl_stream_array_hash purge
+/
+
+drop table gl_stream_array_list purge
+/
+
+drop table gl_stream_array_interval purge
+/
+
+drop table gl_stream_array_range purge
+/
+
+drop table gl_stream_fast_hash purge
+/
+
+-- Hash partitioned by id, inserts of all load processes are spread over 16 partitions
+create table gl_stream_array_hash (
+  id varchar2(40) not null,
+  run_id varchar2(40) not null,
+  scenario varchar2(20) not null,
+  ts timestamp not null,
+  payload varchar2(4000),
+  constraint gl_stream_array_hash_is_json check (payload is json)
+)
+partition by hash (id) partitions 16
+/
+
+-- Automatic list partitioned by run_id, every load process inserts into its own partition
+create table gl_stream_array_list (
+  id varchar2(40) not null,
+  run_id varchar2(40) not null,
+  scenario varchar2(20) not null,
+  ts timestamp not null,
+  payload varchar2(4000),
+  constraint gl_stream_array_list_is_json check (payload is json)
+)
+partition by list (run_id) automatic (
+  partition p_initial values ('initial')
+)
+/
+
+-- Interval partitioned by ts, one partition per hour
+create table gl_stream_array_interval (
+  id varchar2(40) not null,
+  run_id varchar2(40) not null,
+  scenario varchar2(20) not null,
+  ts timestamp not null,
+  payload varchar2(4000),
+  constraint gl_stream_array_interval_is_json check (payload is json)
+)
+partition by range (ts) interval (numtodsinterval(1, 'HOUR')) (
+  partition p_initial values less than (timestamp '2024-01-01 00:00:00')
+)
+/
+
+-- Range partitioned by id, partition P<n> holds the sequence identifiers of load process n (--idtype sequence)
+create table gl_stream_array_range (
+  id varchar2(40) not null,
+  run_id varchar2(40) not null,
+  scenario varchar2(20) not null,
+  ts timestamp not null,
+  payload varchar2(4000),
+  constraint gl_stream_array_range_is_json check (payload is json)
+)
+partition by range (id) (
+  partition p1 values less than ('00000002000000000000'),
+  partition p2 values less than ('00000003000000000000'),
+  partition p3 values less than ('00000004000000000000'),
+  partition p4 values less than ('00000005000000000000'),
+  partition p5 values less than ('00000006000000000000'),
+  partition p6 values less than ('00000007000000000000'),
+  partition p7 values less than ('00000008000000000000'),
+  partition p8 values less than ('00000009000000000000'),
+  partition p9 values less than ('00000010000000000000'),
+  partition p10 values less than ('00000011000000000000'),
+  partition p11 values less than ('00000012000000000000'),
+  partition p12 values less than ('00000013000000000000'),
+  partition p13 values less than ('00000014000000000000'),
+  partition p14 values less than ('00000015000000000000'),
+  partition p15 values less than ('00000016000000000000'),
+  partition p16 values less than ('00000017000000000000'),
+  partition pmax values less than (maxvalue)
+)
+/
+
+-- Hash partitioned by id, for Fast Ingest
+create table gl_stream_fast_hash (
+  id varchar2(40) not null,
+  run_id varchar2(40) not null,
+  scenario varchar2(20) not null,
+  ts timestamp not null,
+  payload varchar2(4000),
+  constraint gl_stream_fast_hash_is_json check (payload is json)
+)
+nocompress
+partition by hash (id) partitions 16
+memoptimize for write
+/
@@ -16,3 +16,21 @@ grant execute on dbms_cloud
 to loadgen
 /
 
+grant select on sys.v_$sysstat to loadgen
+/
+
+grant select on sys.v_$mystat to loadgen
+/
+
+grant select on sys.v_$statname to loadgen
+/
+
+grant select on sys.v_$system_event to loadgen
+/
+
+grant select on sys.v_$session_event to loadgen
+/
+
+grant select on sys.v_$memoptimize_write_area to loadgen
+/
+
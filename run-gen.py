@@ -5,6 +5,7 @@ Usage: python run-gen.py -s <scenario> -z <size> -t <threads> -d <duration> -x <
 """
 
 import string
+import re
 import time
 import datetime
 import random
@@ -16,6 +17,23 @@ import codecs
 import uuid
 import os
 import getopt
+import math
+import cProfile
+import pstats
+import threading
+import multiprocessing
+import itertools
+import functools
+import bisect
+import statistics
+import sqlite3
+import mmap
+import struct
+import socket
+import socketserver
+import queue
+import hmac
+import resource
 
 from dateutil.relativedelta import relativedelta
 from base64 import b64encode
@@ -24,6 +42,7 @@ import oracledb
 import oci
 
 from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 
 # ----------------------------------------------------
@@ -41,41 +60,150 @@ def get_input_parameters(p_argv):
       'scenario':    None,
       'size':        None,
       'threads':     None,
+      'autothreads': False,
       'thread':      None,
+      'reader':      None,
       'duration':    None,
       'minrec':      60,
       'maxrec':      100,
       'iterations':  1,
       'sleep':       0,
+      'chunkrows':   10000,
+      'chunkbytes':  4*1024*1024,
+      'idtype':      'uuid4',
+      'timestamps':  'row',
+      'schema':      None,
+      'payload':     'journal',
+      'payloadtype': 'varchar2',
+      'lobbind':     'direct',
       'table':       None,
+      'targets':     None,
+      'target':      None,
+      'partition':   None,
       'dbuser':      None,
       'dbpwd':       None,
       'dbconnect':   None,
       'topic':       None,
+      'readers':     0,
+      'queries':     'count_by_period,latest_rows,point_lookup',
+      'readerdelay': 0,
+      'readerrows':  10,
+      'readerwindow': 60,
+      'dbstats':     False,
+      'finishstats': 'counters',
+      'scanparallel': 4,
+      'scantimeout': 300,
+      'profile':     0,
+      'profiledir':  'profile',
+      'profiletop':  20,
+      'metricsport': 0,
+      'matrix':      None,
+      'store':       None,
+      'savebaseline': None,
+      'compare':     None,
+      'baseline':    None,
+      'threshold':   5,
+      'simrtt':      1.0,
+      'simcommit':   2.0,
+      'simrowus':    10.0,
+      'simdist':     'fixed',
+      'simcapacity': 0,
+      'simoutage':   None,
+      'record':      None,
+      'recordrows':  1000000,
+      'replay':      None,
+      'seed':        None,
+      'seedtime':    None,
+      'reconnect':   False,
+      'reconnectmax': 30,
+      'agentport':   0,
+      'agentbind':   '127.0.0.1',
+      'agenttoken':  os.environ.get('LOADGEN_AGENT_TOKEN'),
+      'agents':      None,
+      'agent':       None,
+      'startdelay':  5,
+      'interval':    10,
+      'fastsample':  5,
+      'fastflush':   0,
+      'fastdrain':   300,
+      'pin':         'none',
+      'clientcpu':   90,
       'loglevel':    'INFO'
    } 
      
    v_help = '''
    Options:
    -h, --help             Print help
-   -s, --scenario         Scenario (single, batch, array, fast, stream) [mandatory]
+   -s, --scenario         Scenario (single, batch, array, fast, stream, null, simulated) [mandatory]
    -z, --size             Size of database or streaming instance [mandatory]
-   -t, --threads          Number of threads [mandatory]
+   -t, --threads          Number of threads, auto starts one thread per available CPU not used by readers [mandatory]
    -d, --duration         Duration in seconds [mandatory]
-   -x, --minrec           Minimum number of records in iteration [{0}]
-   -y, --maxrec           Maximum number of records in iteration [{1}]
-   -i, --iterations       Number of iterations before write to database [{2}]
-   -e, --sleep            Sleep time in seconds between iterations [{3}]
+   -x, --minrec           Minimum number of records in iteration [{minrec}]
+   -y, --maxrec           Maximum number of records in iteration [{maxrec}]
+   -i, --iterations       Number of iterations before write to database [{iterations}]
+   -e, --sleep            Sleep time in seconds between iterations [{sleep}]
+       --chunkrows        Maximum number of rows inserted or put by one call, larger iterations are flushed in chunks [{chunkrows}]
+       --chunkbytes       Maximum size of serialized payloads inserted or put by one call, with suffix K or M [{chunkbytes}]
+       --idtype           Strategy of record identifiers ({id_types}) [{idtype}]
+       --timestamps       Timestamp of every row or one timestamp per chunk (row, batch) [{timestamps}]
+       --schema           JSON schema file of generated data lines instead of journal lines
+       --payload          Payload size profile (journal, fixed:<size>, uniform:<min>-<max>, histogram:<size>=<weight>,...), sizes in bytes with optional K or M [{payload}]
+       --payloadtype      Data type of payload column of target table (varchar2, clob, blob, json) [{payloadtype}]
+       --lobbind          Binding of LOB payload, directly as LONG or LONG RAW or as reused temporary LOBs (direct, templob) [{lobbind}]
    -b, --table            Name of target table [mandatory if scenario=single|batch|array|fast]
    -u, --dbuser           Database user [mandatory if scenario=single|batch|array|fast]
    -p, --dbpwd            Database user password [mandatory if scenario=single|batch|array|fast]
    -c, --dbconnect        Database connect string [mandatory if scenario=single|batch|array|fast]
    -o, --topic            Streaming topic OCID [mandatory if scenario=stream]
-       --loglevel         Log level [DEBUG, INFO, WARNING, ERROR, CRITICAL], default is {4}
-   '''.format(v_params['minrec'], v_params['maxrec'], v_params['iterations'], v_params['sleep'], v_params['loglevel'])
+       --targets          Comma separated targets <table>:<partition>@<dbconnect> assigned to threads round robin, every part is optional
+       --readers          Number of reader processes querying the target table during the load [{readers}]
+       --queries          Comma separated reader query templates ({query_templates}) [{queries}]
+       --readerdelay      Delay in seconds before readers start, used to measure writer degradation [{readerdelay}]
+       --readerrows       Number of rows returned by the latest_rows query [{readerrows}]
+       --readerwindow     Time window in seconds for reader queries filtering by timestamp [{readerwindow}]
+       --dbstats          Snapshot database statistics and wait events at init and finish and report deltas
+       --finishstats      Source of final row statistics (counters, scan) [{finishstats}]
+       --scanparallel     Degree of parallelism of the final table scan [{scanparallel}]
+       --scantimeout      Timeout in seconds of the final table scan [{scantimeout}]
+       --profile          Profile every load process for the given number of seconds from the start, 0 disables profiling [{profile}]
+       --profiledir       Directory for profiles of load processes and the merged profile [{profiledir}]
+       --profiletop       Number of hot functions reported from the merged profile [{profiletop}]
+       --metricsport      Port of HTTP endpoint with live Prometheus metrics, 0 disables the endpoint [{metricsport}]
+       --matrix           Run benchmark matrix defined in JSON config file, other parameters are defaults for the matrix
+       --store            SQLite file storing parameters and results of every run
+       --savebaseline     Save the run in the store as baseline with given name
+       --compare          Compare runs from the store, given as <run_id> or <base run_id>,<run_id>
+       --baseline         Name of baseline to compare the run with [mandatory if compare has single run_id]
+       --threshold        Change of throughput or latency in percent reported as regression [{threshold}]
+       --simrtt           Mean round-trip latency in milliseconds [{simrtt}, scenario=simulated]
+       --simcommit        Mean commit latency in milliseconds [{simcommit}, scenario=simulated]
+       --simrowus         Mean server time per row in microseconds [{simrowus}, scenario=simulated]
+       --simdist          Distribution of latencies (fixed, uniform, exponential, lognormal) [{simdist}, scenario=simulated]
+       --simcapacity      Capacity of simulated server in rows per second shared by all threads, 0 is unlimited [{simcapacity}, scenario=simulated]
+       --simoutage        Simulated outage <start>,<duration> in seconds from connect of every thread [scenario=simulated]
+       --record           Generate serialized journal lines into dataset file instead of running the load
+       --recordrows       Number of journal lines generated into dataset file [{recordrows}]
+       --replay           Replay journal lines from dataset file instead of generating them
+       --seed             Seed of random generator, every thread uses seed+thread for deterministic data
+       --seedtime         Time base of generated timestamps with seed, in ISO format [2024-01-01T00:00:00]
+       --reconnect        Keep threads running after failed iterations, reconnect with exponential backoff
+       --reconnectmax     Maximum backoff in seconds between reconnect attempts [{reconnectmax}]
+       --agentport        Run as agent executing load processes on command of coordinator on given port
+       --agentbind        Address the agent listens on, 0.0.0.0 for all interfaces [{agentbind}]
+       --agenttoken       Token shared by agents and coordinator, default is environment variable LOADGEN_AGENT_TOKEN
+       --agents           Run as coordinator of comma separated agents <host>:<port>, threads are started on every agent
+       --startdelay       Delay in seconds before synchronized start of load on all agents [{startdelay}]
+       --interval         Interval in seconds of throughput reported by agents [{interval}]
+       --fastsample       Interval in seconds of sampling of memoptimize write area, 0 disables sampling [{fastsample}, scenario=fast]
+       --fastflush        Interval in seconds of flushes of fast ingest data by every thread, 0 flushes only at the end [{fastflush}, scenario=fast]
+       --fastdrain        Timeout in seconds of waiting for fast ingest data applied to the table after the load [{fastdrain}, scenario=fast]
+       --pin              Pin every load process to one CPU core or to CPUs of one NUMA node round robin (none, core, numa) [{pin}]
+       --clientcpu        CPU utilization in percent of client host or load processes reported as client-bound run [{clientcpu}]
+       --loglevel         Log level [DEBUG, INFO, WARNING, ERROR, CRITICAL], default is {loglevel}
+   '''.format(query_templates=', '.join(g_query_templates.keys()), id_types=', '.join(g_id_types), **v_params)
 
    try:
-      (v_opts, v_args) = getopt.getopt(p_argv[1:],"hs:z:t:d:x:y:i:e:b:u:p:c:o:",['help','scenario=','size=','threads=','duration=','minrec=','maxrec=','iterations=','sleep=','table=','dbuser=','dbpwd=','dbconnect=','topic=','loglevel='])
+      (v_opts, v_args) = getopt.getopt(p_argv[1:],"hs:z:t:d:x:y:i:e:b:u:p:c:o:",['help','scenario=','size=','threads=','duration=','minrec=','maxrec=','iterations=','sleep=','table=','dbuser=','dbpwd=','dbconnect=','topic=','targets=','chunkrows=','chunkbytes=','idtype=','timestamps=','schema=','payload=','payloadtype=','lobbind=','readers=','queries=','readerdelay=','readerrows=','readerwindow=','dbstats','finishstats=','scanparallel=','scantimeout=','profile=','profiledir=','profiletop=','metricsport=','matrix=','store=','savebaseline=','compare=','baseline=','threshold=','simrtt=','simcommit=','simrowus=','simdist=','simcapacity=','simoutage=','record=','recordrows=','replay=','seed=','seedtime=','reconnect','reconnectmax=','agentport=','agentbind=','agenttoken=','agents=','startdelay=','interval=','fastsample=','fastflush=','fastdrain=','pin=','clientcpu=','loglevel='])
    except getopt.GetoptError:
       g_logger.error ('Unknown parameter or parameter with missing value')
       print (v_usage)
@@ -90,7 +218,10 @@ def get_input_parameters(p_argv):
       elif v_opt in ('-z', '--size'):
          v_params['size'] = v_arg
       elif v_opt in ('-t', '--threads'):
-         v_params['threads'] = int(v_arg)
+         if v_arg == 'auto':
+            v_params['autothreads'] = True
+         else:
+            v_params['threads'] = int(v_arg)
       elif v_opt in ('-d', '--duration'):
          v_params['duration'] = int(v_arg)
       elif v_opt in ('-x', '--minrec'):
@@ -111,73 +242,261 @@ def get_input_parameters(p_argv):
          v_params['dbconnect'] = v_arg
       elif v_opt in ('-o', '--topic'):
          v_params['topic'] = v_arg
+      elif v_opt in ('--targets',):
+         v_params['targets'] = v_arg
+      elif v_opt in ('--chunkrows',):
+         v_params['chunkrows'] = int(v_arg)
+      elif v_opt in ('--chunkbytes',):
+         v_params['chunkbytes'] = parse_payload_size(v_arg)
+      elif v_opt in ('--idtype',):
+         v_params['idtype'] = v_arg
+      elif v_opt in ('--timestamps',):
+         v_params['timestamps'] = v_arg
+      elif v_opt in ('--schema',):
+         v_params['schema'] = v_arg
+      elif v_opt in ('--payload',):
+         v_params['payload'] = v_arg
+      elif v_opt in ('--payloadtype',):
+         v_params['payloadtype'] = v_arg
+      elif v_opt in ('--lobbind',):
+         v_params['lobbind'] = v_arg
+      elif v_opt in ('--readers',):
+         v_params['readers'] = int(v_arg)
+      elif v_opt in ('--queries',):
+         v_params['queries'] = v_arg
+      elif v_opt in ('--readerdelay',):
+         v_params['readerdelay'] = int(v_arg)
+      elif v_opt in ('--readerrows',):
+         v_params['readerrows'] = int(v_arg)
+      elif v_opt in ('--readerwindow',):
+         v_params['readerwindow'] = int(v_arg)
+      elif v_opt in ('--dbstats',):
+         v_params['dbstats'] = True
+      elif v_opt in ('--finishstats',):
+         v_params['finishstats'] = v_arg
+      elif v_opt in ('--scanparallel',):
+         v_params['scanparallel'] = int(v_arg)
+      elif v_opt in ('--scantimeout',):
+         v_params['scantimeout'] = int(v_arg)
+      elif v_opt in ('--profile',):
+         v_params['profile'] = int(v_arg)
+      elif v_opt in ('--profiledir',):
+         v_params['profiledir'] = v_arg
+      elif v_opt in ('--profiletop',):
+         v_params['profiletop'] = int(v_arg)
+      elif v_opt in ('--metricsport',):
+         v_params['metricsport'] = int(v_arg)
+      elif v_opt in ('--matrix',):
+         v_params['matrix'] = v_arg
+      elif v_opt in ('--store',):
+         v_params['store'] = v_arg
+      elif v_opt in ('--savebaseline',):
+         v_params['savebaseline'] = v_arg
+      elif v_opt in ('--compare',):
+         v_params['compare'] = v_arg
+      elif v_opt in ('--baseline',):
+         v_params['baseline'] = v_arg
+      elif v_opt in ('--threshold',):
+         v_params['threshold'] = float(v_arg)
+      elif v_opt in ('--simrtt',):
+         v_params['simrtt'] = float(v_arg)
+      elif v_opt in ('--simcommit',):
+         v_params['simcommit'] = float(v_arg)
+      elif v_opt in ('--simrowus',):
+         v_params['simrowus'] = float(v_arg)
+      elif v_opt in ('--simdist',):
+         v_params['simdist'] = v_arg
+      elif v_opt in ('--simcapacity',):
+         v_params['simcapacity'] = int(v_arg)
+      elif v_opt in ('--simoutage',):
+         v_params['simoutage'] = v_arg
+      elif v_opt in ('--record',):
+         v_params['record'] = v_arg
+      elif v_opt in ('--recordrows',):
+         v_params['recordrows'] = int(v_arg)
+      elif v_opt in ('--replay',):
+         v_params['replay'] = v_arg
+      elif v_opt in ('--seed',):
+         v_params['seed'] = int(v_arg)
+      elif v_opt in ('--seedtime',):
+         v_params['seedtime'] = v_arg
+      elif v_opt in ('--reconnect',):
+         v_params['reconnect'] = True
+      elif v_opt in ('--reconnectmax',):
+         v_params['reconnectmax'] = int(v_arg)
+      elif v_opt in ('--agentport',):
+         v_params['agentport'] = int(v_arg)
+      elif v_opt in ('--agentbind',):
+         v_params['agentbind'] = v_arg
+      elif v_opt in ('--agenttoken',):
+         v_params['agenttoken'] = v_arg
+      elif v_opt in ('--agents',):
+         v_params['agents'] = v_arg
+      elif v_opt in ('--startdelay',):
+         v_params['startdelay'] = int(v_arg)
+      elif v_opt in ('--interval',):
+         v_params['interval'] = int(v_arg)
+      elif v_opt in ('--fastsample',):
+         v_params['fastsample'] = float(v_arg)
+      elif v_opt in ('--fastflush',):
+         v_params['fastflush'] = float(v_arg)
+      elif v_opt in ('--fastdrain',):
+         v_params['fastdrain'] = int(v_arg)
+      elif v_opt in ('--pin',):
+         v_params['pin'] = v_arg
+      elif v_opt in ('--clientcpu',):
+         v_params['clientcpu'] = float(v_arg)
       elif v_opt in ('--loglevel'):
          v_params['loglevel'] = v_arg.upper()
 
-   if v_params['scenario'] == None:
-      g_logger.error ('Missing value for parameter "scenario"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['scenario'] not in ('single', 'batch', 'array', 'fast', 'stream'):
-      g_logger.error ('Parameter "scenario" must have value "single", "batch", "array", "fast", or "stream"')
-      print (v_usage)
-      sys.exit(2)
-   if v_params['size'] == None:
-      g_logger.error ('Missing value for parameter "size"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['threads'] == None:
-      g_logger.error ('Missing value for parameter "threads"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['duration'] == None:
-      g_logger.error ('Missing value for parameter "duration"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['minrec'] == None:
-      g_logger.error ('Missing value for parameter "minrec"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['maxrec'] == None:
-      g_logger.error ('Missing value for parameter "maxrec"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['iterations'] == None:
-      g_logger.error ('Missing value for parameter "iterations"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['sleep'] == None:
-      g_logger.error ('Missing value for parameter "sleep"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['table'] == None and v_params['scenario'] in ('single', 'batch', 'array', 'fast'):
-      g_logger.error ('Missing value for parameter "table"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['dbuser'] == None and v_params['scenario'] in ('single', 'batch', 'array', 'fast'):
-      g_logger.error ('Missing value for parameter "dbuser"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['dbpwd'] == None and v_params['scenario'] in ('single', 'batch', 'array', 'fast'):
-      g_logger.error ('Missing value for parameter "dbpwd"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['dbconnect'] == None and v_params['scenario'] in ('single', 'batch', 'array', 'fast'):
-      g_logger.error ('Missing value for parameter "dbconnect"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['topic'] == None and v_params['scenario'] == ('stream'):
-      g_logger.error ('Missing value for parameter "topic"')
-      print (v_usage)
-      sys.exit(2)
-   elif v_params['loglevel'] not in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'):
-      g_logger.error ('Missing or invalid value for parameter "loglevel"')
+   # Number of threads is resolved after readers are known, agents resolve it again for their host
+   if v_params['autothreads']:
+      v_params['threads'] = get_auto_threads(v_params)
+
+   if v_params['compare'] != None:
+      if v_params['store'] == None:
+         v_error = 'Missing value for parameter "store"'
+      elif len(v_params['compare'].split(',')) not in (1, 2):
+         v_error = 'Parameter "compare" must have value <run_id> or <base run_id>,<run_id>'
+      elif len(v_params['compare'].split(',')) == 1 and v_params['baseline'] == None:
+         v_error = 'Missing value for parameter "baseline"'
+      else:
+         v_error = None
+   elif v_params['record'] != None:
+      if v_params['recordrows'] <= 0:
+         v_error = 'Parameter "recordrows" must be greater than 0'
+      elif v_params['seedtime'] != None and check_seed_time(v_params) != None:
+         v_error = check_seed_time(v_params)
+      elif v_params['schema'] != None:
+         v_error = check_schema(v_params)
+      else:
+         v_error = None
+   elif v_params['agentport'] > 0:
+      if v_params['interval'] <= 0:
+         v_error = 'Parameter "interval" must be greater than 0'
+      elif v_params['agenttoken'] == None and not is_loopback_address(v_params['agentbind']):
+         v_error = 'Parameter "agenttoken" is required if agent listens on other than loopback address'
+      else:
+         v_error = None
+   elif v_params['matrix'] == None:
+      v_error = check_input_parameters(v_params)
+   else:
+      v_error = None
+
+   if v_error != None:
+      g_logger.error (v_error)
       print (v_usage)
       sys.exit(2)
 
    return v_params
 
 
+# ----------------------------------------------------
+# Check input parameters and return error message or None
+# ----------------------------------------------------
+def check_input_parameters(p_params):
+
+   v_error = None
+
+   if p_params['scenario'] == None:
+      v_error = 'Missing value for parameter "scenario"'
+   elif p_params['scenario'] not in ('single', 'batch', 'array', 'fast', 'stream', 'null', 'simulated'):
+      v_error = 'Parameter "scenario" must have value "single", "batch", "array", "fast", "stream", "null", or "simulated"'
+   elif p_params['size'] == None:
+      v_error = 'Missing value for parameter "size"'
+   elif p_params['threads'] == None:
+      v_error = 'Missing value for parameter "threads"'
+   elif p_params['duration'] == None:
+      v_error = 'Missing value for parameter "duration"'
+   elif p_params['minrec'] == None:
+      v_error = 'Missing value for parameter "minrec"'
+   elif p_params['maxrec'] == None:
+      v_error = 'Missing value for parameter "maxrec"'
+   elif p_params['iterations'] == None:
+      v_error = 'Missing value for parameter "iterations"'
+   elif p_params['sleep'] == None:
+      v_error = 'Missing value for parameter "sleep"'
+   elif p_params['table'] == None and p_params['scenario'] in ('single', 'batch', 'array', 'fast'):
+      v_error = 'Missing value for parameter "table"'
+   elif p_params['dbuser'] == None and p_params['scenario'] in ('single', 'batch', 'array', 'fast'):
+      v_error = 'Missing value for parameter "dbuser"'
+   elif p_params['dbpwd'] == None and p_params['scenario'] in ('single', 'batch', 'array', 'fast'):
+      v_error = 'Missing value for parameter "dbpwd"'
+   elif p_params['dbconnect'] == None and p_params['scenario'] in ('single', 'batch', 'array', 'fast'):
+      v_error = 'Missing value for parameter "dbconnect"'
+   elif p_params['topic'] == None and p_params['scenario'] == ('stream'):
+      v_error = 'Missing value for parameter "topic"'
+   elif p_params['targets'] != None and p_params['scenario'] == 'stream':
+      v_error = 'Parameter "targets" is not supported if scenario=stream'
+   elif p_params['chunkrows'] <= 0:
+      v_error = 'Parameter "chunkrows" must be greater than 0'
+   elif p_params['chunkbytes'] == None or p_params['chunkbytes'] <= 0:
+      v_error = 'Parameter "chunkbytes" must be size greater than 0, e.g. 512K or 4M'
+   elif p_params['idtype'] not in g_id_types:
+      v_error = 'Parameter "idtype" must have one of values {}'.format(', '.join(g_id_types))
+   elif p_params['timestamps'] not in ('row', 'batch'):
+      v_error = 'Parameter "timestamps" must have value "row" or "batch"'
+   elif p_params['schema'] != None and p_params['agents'] == None and check_schema(p_params) != None:
+      v_error = check_schema(p_params)
+   elif get_payload_profile(p_params['payload']) == None:
+      v_error = 'Parameter "payload" must have value journal, fixed:<size>, uniform:<min>-<max>, or histogram:<size>=<weight>,...'
+   elif p_params['payloadtype'] not in ('varchar2', 'clob', 'blob', 'json'):
+      v_error = 'Parameter "payloadtype" must have value "varchar2", "clob", "blob", or "json"'
+   elif p_params['payloadtype'] != 'varchar2' and p_params['scenario'] not in ('single', 'batch', 'array'):
+      v_error = 'Parameter "payloadtype" is supported only if scenario=single|batch|array, fast ingest does not support LOB columns'
+   elif p_params['payloadtype'] == 'varchar2' and p_params['scenario'] in ('single', 'batch', 'array', 'fast') and get_payload_max_size(p_params) > g_payload_varchar2_max_size:
+      v_error = 'Parameter "payload" with sizes above {0} bytes requires parameter "payloadtype" clob, blob, or json'.format(g_payload_varchar2_max_size)
+   elif p_params['lobbind'] not in ('direct', 'templob'):
+      v_error = 'Parameter "lobbind" must have value "direct" or "templob"'
+   elif p_params['readers'] > 0 and p_params['scenario'] not in ('single', 'batch', 'array', 'fast'):
+      v_error = 'Parameter "readers" is supported only if scenario=single|batch|array|fast'
+   elif p_params['dbstats'] and p_params['scenario'] not in ('single', 'batch', 'array', 'fast'):
+      v_error = 'Parameter "dbstats" is supported only if scenario=single|batch|array|fast'
+   elif p_params['finishstats'] not in ('counters', 'scan'):
+      v_error = 'Parameter "finishstats" must have value "counters" or "scan"'
+   elif any(v_query not in g_query_templates for v_query in p_params['queries'].split(',')):
+      v_error = 'Parameter "queries" must contain only values {}'.format(', '.join(g_query_templates.keys()))
+   elif p_params['simdist'] not in ('fixed', 'uniform', 'exponential', 'lognormal'):
+      v_error = 'Parameter "simdist" must have value "fixed", "uniform", "exponential", or "lognormal"'
+   elif p_params['simoutage'] != None and not re.fullmatch('[0-9]+,[0-9]+', p_params['simoutage']):
+      v_error = 'Parameter "simoutage" must have value <start>,<duration>'
+   elif p_params['replay'] != None and p_params['agents'] == None and not os.path.isfile(p_params['replay']):
+      v_error = 'Dataset file "{}" given by parameter "replay" does not exist'.format(p_params['replay'])
+   elif p_params['seedtime'] != None and check_seed_time(p_params) != None:
+      v_error = check_seed_time(p_params)
+   elif p_params['agents'] != None and any(len(v_agent.rsplit(':', 1)) != 2 or not v_agent.rsplit(':', 1)[1].isdigit() for v_agent in p_params['agents'].split(',')):
+      v_error = 'Parameter "agents" must have value <host>:<port>[,<host>:<port>...]'
+   elif p_params['interval'] <= 0:
+      v_error = 'Parameter "interval" must be greater than 0'
+   elif p_params['fastsample'] < 0:
+      v_error = 'Parameter "fastsample" must be greater than or equal to 0'
+   elif p_params['fastflush'] < 0:
+      v_error = 'Parameter "fastflush" must be greater than or equal to 0'
+   elif p_params['fastdrain'] <= 0:
+      v_error = 'Parameter "fastdrain" must be greater than 0'
+   elif p_params['pin'] not in ('none', 'core', 'numa'):
+      v_error = 'Parameter "pin" must have value "none", "core", or "numa"'
+   elif p_params['pin'] != 'none' and not hasattr(os, 'sched_setaffinity'):
+      v_error = 'Parameter "pin" is supported only on Linux'
+   elif p_params['clientcpu'] <= 0 or p_params['clientcpu'] > 100:
+      v_error = 'Parameter "clientcpu" must be greater than 0 and at most 100'
+   elif p_params['savebaseline'] != None and p_params['store'] == None:
+      v_error = 'Parameter "savebaseline" requires parameter "store"'
+   elif p_params['loglevel'] not in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'):
+      v_error = 'Missing or invalid value for parameter "loglevel"'
+
+   # Messages above the limit of OCI Streaming fail
+   if v_error == None and p_params['scenario'] == 'stream' and get_payload_max_size(p_params) > g_payload_stream_max_size:
+      g_logger.warning ('Parameter "payload" has sizes above {0} bytes, OCI Streaming rejects such messages'.format(g_payload_stream_max_size))
+
+   # Degradation of writers needs time without readers
+   if v_error == None and p_params['readers'] > 0 and p_params['readerdelay'] == 0:
+      g_logger.warning ('Writer degradation is not measured, set parameter "readerdelay" to let writers run alone before readers start')
+
+
+   return v_error
+
+
 # ----------------------------------------------------
 # Initialize logging
 # ----------------------------------------------------
@@ -211,6 +530,14 @@ def initialize_logging (p_logger_name, p_level):
 # CONTENT GENERATION FUNCTIONS
 # ----------------------------------------------------
 
+# Time base of timestamps generated with seed and its tick per call of the clock, so that seeded data do not depend on the wall clock
+g_seed_time_base = datetime.datetime(2024, 1, 1)
+g_seed_clock_tick = datetime.timedelta(milliseconds=1)
+
+# Clock of generated timestamps, set by set_generator_clock()
+g_generator_clock = datetime.datetime.today
+
+
 # ----------------------------------------------------
 # Get random string
 # ----------------------------------------------------
@@ -218,6 +545,53 @@ def get_random_string(p_choices, p_min_length, p_max_length):
     return ''.join(random.choices(p_choices, k=random.randrange(p_min_length,p_max_length+1)))
 
 
+# ----------------------------------------------------
+# Parse time base of seeded data, None if invalid
+# ----------------------------------------------------
+def get_seed_time(p_seed_time):
+
+    try:
+        return datetime.datetime.fromisoformat(p_seed_time)
+    except ValueError:
+        return None
+
+
+# ----------------------------------------------------
+# Check time base of seeded data and return error message or None
+# ----------------------------------------------------
+def check_seed_time(p_params):
+
+    if p_params['seed'] == None:
+        return 'Parameter "seedtime" requires parameter "seed"'
+    if get_seed_time(p_params['seedtime']) == None:
+        return 'Parameter "seedtime" must be timestamp in ISO format, e.g. 2024-01-01T00:00:00'
+
+    return None
+
+
+# ----------------------------------------------------
+# Set clock of generated timestamps, with seed it starts at fixed time base and ticks on every call
+# ----------------------------------------------------
+def set_generator_clock(p_params):
+
+    global g_generator_clock
+
+    if p_params['seed'] == None:
+        g_generator_clock = datetime.datetime.today
+        return
+
+    v_time_base = get_seed_time(p_params['seedtime']) if p_params['seedtime'] != None else g_seed_time_base
+    v_ticks = itertools.count()
+    g_generator_clock = lambda: v_time_base + next(v_ticks)*g_seed_clock_tick
+
+
+# ----------------------------------------------------
+# Get current time of generated data
+# ----------------------------------------------------
+def get_generator_time():
+    return g_generator_clock()
+
+
 # ----------------------------------------------------
 # Get random integer
 # ----------------------------------------------------
@@ -256,7 +630,7 @@ def get_journal_lines(p_minrec, p_maxrec):
     v_line_count = get_random_integer(p_minrec, p_maxrec)
     v_entered_debit_amount_sum = 0
     v_entered_credit_amount_sum = 0
-    v_current_datetime = datetime.datetime.today()
+    v_current_datetime = g_generator_clock()
     v_posted_date = v_current_datetime.replace(microsecond=0, second=0, minute=0, hour=0)
     v_period_date = v_posted_date + relativedelta(months=1, day=1, days=-1)
 
@@ -347,429 +721,2345 @@ def get_journal_lines(p_minrec, p_maxrec):
 
 
 # ----------------------------------------------------
-# Generate array of journals
+# Generate lines of journals or schema documents lazily, only one journal is kept in memory
 # ----------------------------------------------------
-def get_journals(p_journal_count, p_minrec, p_maxrec):
-
-    v_journal_lines = []
+def get_journals(p_journal_count, fn_generate):
 
     for v_journal_number in range(1,p_journal_count+1):
-        v_journal_lines = v_journal_lines + get_journal_lines(p_minrec, p_maxrec)
+        yield from fn_generate()
 
-    return v_journal_lines
+
+# ----------------------------------------------------
+# SCHEMA FUNCTIONS
+# ----------------------------------------------------
+
+# Named character sets of string fields, other values of chars are used as given
+g_schema_chars = {
+    'lowercase': string.ascii_lowercase,
+    'uppercase': string.ascii_uppercase,
+    'digits': string.digits,
+    'alphanumeric': string.ascii_uppercase + string.digits,
+    'hex': '0123456789abcdef'
+}
+
+# Field types, values of types without cardinality are not drawn from pools
+g_schema_field_types = ('constant', 'string', 'integer', 'float', 'choice', 'boolean', 'uuid', 'timestamp', 'sequence', 'line_number')
+g_schema_pool_types = ('string', 'integer', 'float', 'choice', 'boolean', 'uuid')
+
+# Replace arguments of timestamp truncation
+g_schema_truncate = {
+    'second': 'microsecond=0',
+    'minute': 'microsecond=0, second=0',
+    'hour': 'microsecond=0, second=0, minute=0',
+    'day': 'microsecond=0, second=0, minute=0, hour=0',
+    'month': 'microsecond=0, second=0, minute=0, hour=0, day=1',
+    'month_end': 'microsecond=0, second=0, minute=0, hour=0, day=1'
+}
 
 
 # ----------------------------------------------------
-# CONNECT FUNCTIONS
+# Get namespace of compiled schema functions with random functions of given generator bound to names
 # ----------------------------------------------------
+def get_schema_namespace(p_random, p_constants):
+
+    return {
+        '_c': p_constants,
+        '_choices': p_random.choices,
+        '_randint': p_random.randint,
+        '_random': p_random.random,
+        '_uniform': p_random.uniform,
+        '_gauss': p_random.gauss,
+        '_expovariate': p_random.expovariate,
+        '_getrandbits': p_random.getrandbits,
+        '_uuid': uuid.UUID,
+        '_today': get_generator_time,
+        '_timedelta': datetime.timedelta,
+        '_relativedelta': relativedelta,
+        '_round': round,
+        '_int': int,
+        '_str': str,
+        '_min': min,
+        '_max': max,
+        '_next': next
+    }
+
 
 # ----------------------------------------------------
-# Normal connect to database
+# Add constant used by compiled schema and return expression referencing it
 # ----------------------------------------------------
-def connect_oracle(p_params):
+def add_schema_constant(p_constants, p_value):
 
-    v_context = {
-       'connection':  None,
-       'cursor':      None
-    } 
+    p_constants.append(p_value)
+    return '_c[{}]'.format(len(p_constants)-1)
 
-    oracledb.init_oracle_client()
 
-    try:
-        v_context['connection'] = oracledb.connect(
-            user=p_params['dbuser'],
-            password=p_params['dbpwd'],
-            dsn=p_params['dbconnect']
-        )
-        v_context['cursor'] = v_context['connection'].cursor()
+# ----------------------------------------------------
+# Get expression of random length, count or number from value or [min, max]
+# ----------------------------------------------------
+def get_schema_range(p_name, p_value, p_default=None):
 
-    except Exception as e:
-        g_logger.warning ('Cannot connect to the database: {0}'.format(e))
-        raise
+    if p_value == None:
+        p_value = p_default
+    if isinstance(p_value, int) and not isinstance(p_value, bool):
+        p_value = [p_value, p_value]
+    if not isinstance(p_value, list) or len(p_value) != 2 or not all(isinstance(v_value, int) and not isinstance(v_value, bool) for v_value in p_value) or p_value[0] < 0 or p_value[0] > p_value[1]:
+        raise ValueError('Field "{}" must have length or count as number or [min, max]'.format(p_name))
 
-    return v_context
+    return str(p_value[0]) if p_value[0] == p_value[1] else '_randint({}, {})'.format(p_value[0], p_value[1])
 
 
 # ----------------------------------------------------
-# Connect to database for fast ingest
+# Get expression of numeric field with distribution limited by min and max
 # ----------------------------------------------------
-def connect_oracle_fast(p_params):
+def get_schema_number(p_name, p_field):
+
+    v_min = p_field.get('min', 0)
+    v_max = p_field.get('max', 100)
+    if not all(isinstance(v_value, (int, float)) for v_value in (v_min, v_max)) or v_min > v_max:
+        raise ValueError('Field "{}" must have numeric min not greater than max'.format(p_name))
+
+    v_distribution = p_field.get('distribution', 'uniform')
+    v_mean = float(p_field.get('mean', (v_min+v_max)/2))
+    if v_distribution == 'uniform':
+        if p_field['type'] == 'integer':
+            return '_randint({}, {})'.format(int(v_min), int(v_max))
+        v_expression = '_uniform({}, {})'.format(float(v_min), float(v_max))
+    elif v_distribution == 'normal':
+        v_expression = '_min(_max(_gauss({}, {}), {}), {})'.format(v_mean, float(p_field.get('stddev', (v_max-v_min)/6)), float(v_min), float(v_max))
+    elif v_distribution == 'exponential':
+        if v_mean <= v_min:
+            raise ValueError('Field "{}" must have mean greater than min'.format(p_name))
+        v_expression = '_min({} + _expovariate({}), {})'.format(float(v_min), 1/(v_mean-v_min), float(v_max))
+    else:
+        raise ValueError('Field "{}" has unknown distribution "{}"'.format(p_name, v_distribution))
 
-    v_context = {
-       'connection':  None,
-       'cursor':      None
-    } 
+    if p_field['type'] == 'integer':
+        return '_int(_round({}))'.format(v_expression)
+    elif 'round' in p_field:
+        return '_round({}, {})'.format(v_expression, int(p_field['round']))
+    else:
+        return v_expression
 
-    oracledb.init_oracle_client()
 
-    try:
-        v_context['connection'] = oracledb.connect(
-            user=p_params['dbuser'],
-            password=p_params['dbpwd'],
-            dsn=p_params['dbconnect']
-        )
-        v_context['cursor'] = v_context['connection'].cursor()
-        v_context['cursor'].execute('alter session set optimizer_ignore_hints = false')
+# ----------------------------------------------------
+# Get expression of timestamp field derived from time of document or line
+# ----------------------------------------------------
+def get_schema_timestamp(p_name, p_field, p_constants, p_now):
+
+    v_truncate = p_field.get('truncate')
+    if v_truncate != None and v_truncate not in g_schema_truncate:
+        raise ValueError('Field "{}" must have truncate {}'.format(p_name, ', '.join(g_schema_truncate.keys())))
+
+    v_expression = p_now
+    if v_truncate != None:
+        v_expression = '{}.replace({})'.format(v_expression, g_schema_truncate[v_truncate])
+    if v_truncate == 'month_end':
+        v_expression = '({} + _relativedelta(months=1, days=-1))'.format(v_expression)
+    if 'offset' in p_field:
+        v_offset = p_field['offset']
+        if not isinstance(v_offset, list) or len(v_offset) != 2 or not all(isinstance(v_value, (int, float)) for v_value in v_offset) or v_offset[0] > v_offset[1]:
+            raise ValueError('Field "{}" must have offset in seconds as [min, max]'.format(p_name))
+        v_expression = '({} + _timedelta(seconds=_uniform({}, {})))'.format(v_expression, float(v_offset[0]), float(v_offset[1]))
+
+    v_format = p_field.get('format', 'iso')
+    if v_format == 'iso':
+        return '{}.isoformat()'.format(v_expression)
+    elif v_format == 'epoch_ms':
+        return '_int({}.timestamp()*1000)'.format(v_expression)
+    else:
+        return '{}.strftime({})'.format(v_expression, add_schema_constant(p_constants, str(v_format)))
 
-    except Exception as e:
-        g_logger.warning ('Cannot connect to the database for fast ingest: {0}'.format(e))
-        raise
 
-    return v_context
+# ----------------------------------------------------
+# Get Python expression generating value of schema field
+# - values of fields with cardinality are drawn from pool generated once, the same in all load processes
+# ----------------------------------------------------
+def get_schema_expression(p_name, p_field, p_constants, p_now, p_is_line, p_sequence_offset):
+
+    if not isinstance(p_field, dict) or p_field.get('type') not in g_schema_field_types:
+        raise ValueError('Field "{}" must have type {}'.format(p_name, ', '.join(g_schema_field_types)))
+
+    v_type = p_field['type']
+    if v_type == 'constant':
+        v_expression = add_schema_constant(p_constants, p_field.get('value'))
+    elif v_type == 'string':
+        v_chars = g_schema_chars.get(p_field.get('chars', 'alphanumeric'), p_field.get('chars'))
+        if not isinstance(v_chars, str) or len(v_chars) == 0:
+            raise ValueError('Field "{}" must have chars {} or string of characters'.format(p_name, ', '.join(g_schema_chars.keys())))
+        v_expression = "''.join(_choices({}, k={}))".format(add_schema_constant(p_constants, v_chars), get_schema_range(p_name, p_field.get('length'), 10))
+        if 'prefix' in p_field:
+            v_expression = '{} + {}'.format(add_schema_constant(p_constants, str(p_field['prefix'])), v_expression)
+    elif v_type in ('integer', 'float'):
+        v_expression = get_schema_number(p_name, p_field)
+    elif v_type == 'choice':
+        v_values = p_field.get('values')
+        if not isinstance(v_values, list) or len(v_values) == 0:
+            raise ValueError('Field "{}" must have non-empty list of values'.format(p_name))
+        if 'weights' in p_field:
+            if not isinstance(p_field['weights'], list) or len(p_field['weights']) != len(v_values):
+                raise ValueError('Field "{}" must have one weight per value'.format(p_name))
+            v_expression = '_choices({}, cum_weights={})[0]'.format(add_schema_constant(p_constants, v_values), add_schema_constant(p_constants, list(itertools.accumulate(p_field['weights']))))
+        else:
+            v_expression = '{}[_int(_random()*{})]'.format(add_schema_constant(p_constants, v_values), len(v_values))
+    elif v_type == 'boolean':
+        v_expression = '(_random() < {})'.format(float(p_field.get('probability', 0.5)))
+    elif v_type == 'uuid':
+        v_expression = '_str(_uuid(int=_getrandbits(128), version=4))'
+    elif v_type == 'timestamp':
+        v_expression = get_schema_timestamp(p_name, p_field, p_constants, p_now)
+    elif v_type == 'sequence':
+        v_expression = '_next({})'.format(add_schema_constant(p_constants, itertools.count(int(p_field.get('start', 1)) + p_sequence_offset)))
+    else:
+        if not p_is_line:
+            raise ValueError('Field "{}" of type line_number must be a line field'.format(p_name))
+        v_expression = '_line_number'
+
+    if 'cardinality' in p_field:
+        if v_type not in g_schema_pool_types or not isinstance(p_field['cardinality'], int) or p_field['cardinality'] <= 0:
+            raise ValueError('Field "{}" must have positive cardinality and type {}'.format(p_name, ', '.join(g_schema_pool_types)))
+        fn_value = eval('lambda: {}'.format(v_expression), get_schema_namespace(random.Random(p_name), p_constants))
+        v_pool = [ fn_value() for i in range(p_field['cardinality']) ]
+        v_expression = '{}[_int(_random()*{})]'.format(add_schema_constant(p_constants, v_pool), len(v_pool))
+
+    if 'null_probability' in p_field:
+        v_expression = '(None if _random() < {} else {})'.format(float(p_field['null_probability']), v_expression)
+
+    return v_expression
 
 
 # ----------------------------------------------------
-# Connect to streaming
+# Compile schema into function generating lines of one document, the fields become inline expressions
+# - header fields are evaluated once per document and copied to every line, like the journal header
+# - lines are returned flat, or nested in one document under the name given by lines.array
 # ----------------------------------------------------
-def connect_streaming(p_params):
+def compile_schema(p_schema, p_minrec, p_maxrec, p_sequence_offset=0):
 
-    v_context = {
-       'config':       None,
-       'adminclient':  None,
-       'stream':       None,
-       'streamclient': None
-    } 
+    if not isinstance(p_schema, dict) or not isinstance(p_schema.get('header', {}), dict) or not isinstance(p_schema.get('lines', {}), dict):
+        raise ValueError('Schema must be object with objects header and lines')
 
-    try:
-        v_context['config'] = oci.config.from_file()
-    except Exception as e:
-        g_logger.warning ('Cannot read OCI config default file: {0}'.format(e))
-        raise
+    v_constants = []
+    v_header = p_schema.get('header', {})
+    v_lines = p_schema.get('lines')
+    v_line_fields = v_lines.get('fields', {}) if v_lines != None else {}
+    if len(v_header) + len(v_line_fields) == 0:
+        raise ValueError('Schema must have at least one field')
 
-    try:
-        v_context['adminclient'] = oci.streaming.StreamAdminClient(config=v_context['config'])
-    except Exception as e:
-        g_logger.warning ('Cannot get StreamAdminClient: {0}'.format(e))
-        raise
+    v_key = p_schema.get('key', next(iter(v_header), None) or next(iter(v_line_fields)))
+    if v_key not in v_header and v_key not in v_line_fields:
+        raise ValueError('Key "{}" must be a field of header or lines'.format(v_key))
 
-    try:
-        v_context['stream'] = v_context['adminclient'].get_stream(stream_id=p_params['topic']).data
-    except Exception as e:
-        g_logger.warning ('Cannot get stream: {0}'.format(e))
-        raise
+    v_code = [ 'def generate():', '    _now = _today()' ]
+    for i, (v_name, v_field) in enumerate(v_header.items()):
+        v_code.append('    _h{} = {}'.format(i, get_schema_expression(v_name, v_field, v_constants, '_now', False, p_sequence_offset)))
+    v_header_items = [ '{!r}: _h{}'.format(v_name, i) for i, v_name in enumerate(v_header) ]
 
-    try:
-       v_context['streamclient'] = oci.streaming.StreamClient(config=v_context['config'], service_endpoint=v_context['stream'].messages_endpoint)
-    except Exception as e:
-        g_logger.warning ('Cannot get StreamClient: {0}'.format(e))
-        raise
+    if v_lines == None:
+        v_code.append('    return [{{{}}}]'.format(', '.join(v_header_items)))
+    else:
+        v_line_items = [ '{!r}: {}'.format(v_name, get_schema_expression(v_name, v_field, v_constants, '_line_now', True, p_sequence_offset)) for v_name, v_field in v_line_fields.items() ]
+        v_code.append('    _lines = []')
+        v_code.append('    for _line_number in range(1, {}+1):'.format(get_schema_range('lines', v_lines.get('count'), [p_minrec, p_maxrec])))
+        if any(v_field.get('type') == 'timestamp' for v_field in v_line_fields.values()):
+            v_code.append('        _line_now = _today()')
+        if 'array' in v_lines:
+            v_code.append('        _lines.append({{{}}})'.format(', '.join(v_line_items)))
+            v_code.append('    return [{{{}}}]'.format(', '.join(v_header_items + [ '{!r}: _lines'.format(str(v_lines['array'])) ])))
+            if v_key not in v_header:
+                raise ValueError('Key "{}" must be a header field if lines are nested'.format(v_key))
+        else:
+            v_code.append('        _lines.append({{{}}})'.format(', '.join(v_header_items + v_line_items)))
+            v_code.append('    return _lines')
 
-    return v_context
+    v_namespace = get_schema_namespace(random, v_constants)
+    exec('\n'.join(v_code), v_namespace)
+
+    return { 'name': p_schema.get('name', 'schema'), 'key': v_key, 'generate': v_namespace['generate'], 'code': '\n'.join(v_code) }
 
 
 # ----------------------------------------------------
-# RUN FUNCTIONS
+# Load schema from JSON file and compile it
 # ----------------------------------------------------
+def load_schema(p_file_name, p_minrec, p_maxrec, p_sequence_offset=0):
+
+    with open(p_file_name) as v_file:
+        v_schema = json.load(v_file)
+
+    return compile_schema(v_schema, p_minrec, p_maxrec, p_sequence_offset)
+
 
 # ----------------------------------------------------
-# Run with commit after every row
+# Check schema file and return error message or None
 # ----------------------------------------------------
-def run_single(p_params, p_context, p_scenario_name, p_run_id):
+def check_schema(p_params):
 
     try:
-        v_data_array = get_journals(p_params["iterations"], p_params["minrec"], p_params["maxrec"])
-    except Exception as e:
-        g_logger.warning ('Data generator failed with exception: {0}'.format(e))
-        raise
+        v_generator = load_schema(p_params['schema'], p_params['minrec'], p_params['maxrec'])
+        v_generator['generate']()
+    except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+        return 'Schema file "{0}" given by parameter "schema" is invalid: {1}'.format(p_params['schema'], e)
 
-    v_data_count = 0
-    v_failure_count = 0
-    v_sql = 'insert into {} (ts, id, scenario, run_id, payload) values (:ts, :id, :scenario, :run_id, :payload)'.format(p_params["table"])
-    v_data_size = 0
+    return None
 
-    for v_data_line in v_data_array:
 
-        v_timestamp = datetime.datetime.today()
-        v_uuid = str(uuid.uuid4())
-        v_data_line_json = json.dumps(v_data_line)
-        v_data_size = v_data_size + (len(v_data_line_json)+len(v_uuid)+len(str(v_timestamp)))
+# ----------------------------------------------------
+# Get generator of data lines, journal lines by default, compiled once per load process
+# ----------------------------------------------------
+def get_generator(p_params):
 
-        p_context['cursor'].setinputsizes = (oracledb.DB_TYPE_TIMESTAMP)
-        p_context['cursor'].execute(v_sql, ts=v_timestamp, id=v_uuid, scenario=p_scenario_name, run_id=p_run_id, payload=v_data_line_json)
-        p_context['connection'].commit()
+    if p_params['schema'] == None:
+        return { 'name': 'journal', 'key': 'journal_external_reference', 'generate': functools.partial(get_journal_lines, p_params['minrec'], p_params['maxrec']) }
 
-        v_data_count = v_data_count+1
+    # Sequences of load processes start in disjoint ranges, like identifiers of strategy sequence
+    v_sequence_offset = 0
+    if p_params['thread'] != None:
+        v_sequence_offset = (get_worker_index(p_params)[0]-1) * g_sequence_range
 
-    return v_data_count, v_failure_count, v_data_size, v_data_size
+    v_generator = load_schema(p_params['schema'], p_params['minrec'], p_params['maxrec'], v_sequence_offset)
+    g_logger.debug ('Compiled schema {0}:\n{1}'.format(v_generator['name'], v_generator['code']))
+    return v_generator
 
 
 # ----------------------------------------------------
-# Run with commit after the batch
+# PAYLOAD FUNCTIONS
 # ----------------------------------------------------
-def run_batch(p_params, p_context, p_scenario_name, p_run_id):
 
-    try:
-        v_data_array = get_journals(p_params["iterations"], p_params["minrec"], p_params["maxrec"])
-    except Exception as e:
-        g_logger.warning ('Data generator failed with exception: {0}'.format(e))
-        raise
+# Number of pool lines the attachment of payload may start at, so that payloads of the same size differ
+g_payload_pool_window = 64
 
-    v_data_count = 0
-    v_failure_count = 0
-    v_sql = 'insert into {} (ts, id, scenario, run_id, payload) values (:ts, :id, :scenario, :run_id, :payload)'.format(p_params["table"])
-    v_data_size = 0
+# Multipliers of size suffixes of payload profiles
+g_payload_size_units = { '': 1, 'K': 1024, 'M': 1024*1024 }
 
-    for v_data_line in v_data_array:
+# Maximum payload size of varchar2 column and of message of OCI Streaming
+g_payload_varchar2_max_size = 4000
+g_payload_stream_max_size = 1024*1024
 
-        v_timestamp = datetime.datetime.today()
-        v_uuid = str(uuid.uuid4())
-        v_data_line_json = json.dumps(v_data_line)
-        v_data_size = v_data_size + (len(v_data_line_json)+len(v_uuid)+len(str(v_timestamp)))
+# Number of LOB chunks written by one call when temporary LOBs are rewritten
+g_lob_write_chunks = 32
 
-        p_context['cursor'].setinputsizes = (oracledb.DB_TYPE_TIMESTAMP)
-        p_context['cursor'].execute(v_sql, ts=v_timestamp, id=v_uuid, scenario=p_scenario_name, run_id=p_run_id, payload=v_data_line_json)
+# Maximum number of temporary LOBs per connection, limits rows of executemany() with temporary LOBs
+g_lob_pool_size = 1000
 
-        v_data_count = v_data_count+1
 
-    p_context['connection'].commit()
+# ----------------------------------------------------
+# Parse payload size such as 512, 64K or 2M into bytes, None if invalid
+# ----------------------------------------------------
+def parse_payload_size(p_size):
 
-    return v_data_count, v_failure_count, v_data_size, v_data_size
+    v_match = re.fullmatch('([0-9]+)([KM]?)', p_size.strip().upper())
+    if v_match == None or int(v_match.group(1)) == 0:
+        return None
+
+    return int(v_match.group(1)) * g_payload_size_units[v_match.group(2)]
 
 
 # ----------------------------------------------------
-# Run with array insert
+# Parse payload size profile journal, fixed:<size>, uniform:<min>-<max> or histogram:<size>=<weight>,...
+# - returns dictionary with sizes and weights, None if invalid
 # ----------------------------------------------------
-def run_array(p_params, p_context, p_scenario_name, p_run_id):
+def get_payload_profile(p_payload):
 
-    try:
-        v_data_array = get_journals(p_params["iterations"], p_params["minrec"], p_params["maxrec"])
-    except Exception as e:
-        g_logger.warning ('Data generator failed with exception: {0}'.format(e))
-        raise
+    (v_type, v_sep, v_spec) = p_payload.partition(':')
 
-    v_data_count = 0
-    v_failure_count = 0
-    v_sql = 'insert into {} (ts, id, scenario, run_id, payload) values (:ts, :id, :scenario, :run_id, :payload)'.format(p_params["table"])
-    v_data = []
-    v_data_size = 0
+    try:
+        if v_type == 'journal' and v_spec == '':
+            return { 'type': v_type, 'sizes': [], 'weights': [] }
+        elif v_type == 'fixed':
+            v_sizes = [ parse_payload_size(v_spec) ]
+            v_weights = [ 1 ]
+        elif v_type == 'uniform':
+            (v_min, v_max) = v_spec.split('-')
+            v_sizes = [ parse_payload_size(v_min), parse_payload_size(v_max) ]
+            v_weights = [ 1, 1 ]
+        elif v_type == 'histogram':
+            v_buckets = [ v_bucket.split('=') for v_bucket in v_spec.split(',') ]
+            v_sizes = [ parse_payload_size(v_size) for (v_size, v_weight) in v_buckets ]
+            v_weights = [ float(v_weight) for (v_size, v_weight) in v_buckets ]
+        else:
+            return None
+    except ValueError:
+        return None
 
-    for v_data_line in v_data_array:
+    if None in v_sizes or min(v_weights) < 0 or sum(v_weights) <= 0 or (v_type == 'uniform' and v_sizes[0] > v_sizes[1]):
+        return None
 
-        v_timestamp = datetime.datetime.today()
-        v_uuid = str(uuid.uuid4())
-        v_data_line_json = json.dumps(v_data_line)
-        v_data_size = v_data_size + (len(v_data_line_json)+len(v_uuid)+len(str(v_timestamp)))
+    return { 'type': v_type, 'sizes': v_sizes, 'weights': v_weights }
 
-        v_data.append((v_timestamp, v_uuid, p_scenario_name, p_run_id, v_data_line_json))
-        v_data_count = v_data_count+1
 
-    p_context['cursor'].setinputsizes = (oracledb.DB_TYPE_TIMESTAMP)
-    p_context['cursor'].executemany(v_sql, v_data)
-    p_context['connection'].commit()
-    
-    return v_data_count, v_failure_count, v_data_size, v_data_size
+# ----------------------------------------------------
+# Get maximum payload size of the profile, 0 for journal lines
+# ----------------------------------------------------
+def get_payload_max_size(p_params):
+    return max(get_payload_profile(p_params['payload'])['sizes'], default=0)
 
 
 # ----------------------------------------------------
-# Run with array insert and memoptimize write
+# Initialize payload generator with pool of serialized journal lines large enough for the largest payload
 # ----------------------------------------------------
-def run_fast(p_params, p_context, p_scenario_name, p_run_id):
+def init_payload(p_params, p_generator):
 
-    try:
-        v_data_array = get_journals(p_params["iterations"], p_params["minrec"], p_params["maxrec"])
-    except Exception as e:
-        g_logger.warning ('Data generator failed with exception: {0}'.format(e))
-        raise
+    v_profile = get_payload_profile(p_params['payload'])
+    v_payload = { 'profile': v_profile, 'pool': '', 'starts': [], 'ends': [] }
+    if v_profile['type'] == 'journal':
+        return v_payload
 
-    v_data_count = 0
-    v_failure_count = 0
-    v_sql = 'insert /*+ MEMOPTIMIZE_WRITE */ into {} (ts, id, scenario, run_id, payload) values (:ts, :id, :scenario, :run_id, :payload)'.format(p_params["table"])
-    v_data = []
-    v_data_size = 0
+    # Journal lines are generated once per load process, payloads are slices of their concatenation
+    v_lines = []
+    v_length = 0
+    while len(v_lines) <= g_payload_pool_window or v_length < max(v_profile['sizes']) + v_payload['starts'][g_payload_pool_window]:
+        for v_data_line in p_generator['generate']():
+            v_data_line_json = json.dumps(v_data_line)
+            v_payload['starts'].append(v_length)
+            v_payload['ends'].append(v_length + len(v_data_line_json))
+            v_lines.append(v_data_line_json)
+            v_length = v_length + len(v_data_line_json) + 1
 
-    for v_data_line in v_data_array:
+    v_payload['pool'] = ','.join(v_lines)
 
-        v_timestamp = datetime.datetime.today()
-        v_uuid = str(uuid.uuid4())
-        v_data_line_json = json.dumps(v_data_line)
-        v_data_size = v_data_size + (len(v_data_line_json)+len(v_uuid)+len(str(v_timestamp)))
+    return v_payload
 
-        v_data.append((v_timestamp, v_uuid, p_scenario_name, p_run_id, v_data_line_json))
-        v_data_count = v_data_count+1
 
-    p_context['cursor'].setinputsizes = (oracledb.DB_TYPE_TIMESTAMP)
-    p_context['cursor'].executemany(v_sql, v_data)
-    # commit is not used with fast ingest
-    #p_context['connection'].commit()
+# ----------------------------------------------------
+# Get random payload size from profile
+# ----------------------------------------------------
+def get_payload_size(p_profile):
 
-    return v_data_count, v_failure_count, v_data_size, v_data_size
+    if p_profile['type'] == 'uniform':
+        return random.randint(p_profile['sizes'][0], p_profile['sizes'][1])
+    else:
+        return random.choices(p_profile['sizes'], weights=p_profile['weights'], k=1)[0]
 
 
 # ----------------------------------------------------
-# Put messages to streaming with retries
-# - necessary to wrap the standard put_messages() as it does not retry partial failures
+# Extend serialized journal line to payload size of the profile
+# - journal lines from the pool are attached, the rest up to the exact size is padding
+# - payload smaller than the journal line keeps the journal line
 # ----------------------------------------------------
-def put_messages_with_retry(p_streamclient, p_stream_id, p_messages, p_data, p_max_retries):
-
-    # Put messages to the stream
-    v_retry_count = 0
-    v_sleep_base_time_sec = 30/1000
-    v_sleep_max_time_sec = 3
-    v_sleep_total_sec = 0
-
-    try:
-        v_put_message_result = p_streamclient.put_messages(stream_id=p_stream_id, put_messages_details=p_messages, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-        v_data_total_count = len(v_put_message_result.data.entries)
-        v_data_failure_count = v_put_message_result.data.failures
-        v_data_success_count = v_data_total_count - v_data_failure_count
-        g_logger.debug('Put messages attempt: retry_count={}, data_total_count={}, data_retry_count={}, data_success_count={}, data_failure_count={}, sleep_time_ms={}'.format(v_retry_count, v_data_total_count, v_data_total_count, v_data_success_count, v_data_failure_count, round(v_sleep_total_sec*1000)))
-    except Exception as e:
-        g_logger.error ('Put messages failed with exception: {0}'.format(e))
-        raise
+def get_payload_json(p_payload, p_data_line_json):
 
-    # Retry for the failed messages
-    while v_data_failure_count > 0 and v_retry_count <= p_max_retries:
+    if p_payload['profile']['type'] == 'journal':
+        return p_data_line_json
 
-        v_exponential_backoff_sleep_base = min(v_sleep_base_time_sec * (2 ** v_retry_count), v_sleep_max_time_sec)
-        v_sleep_time = (v_exponential_backoff_sleep_base / 2.0) + random.uniform(0, v_exponential_backoff_sleep_base / 2.0)
+    v_prefix = ', "attachment_lines": ['
+    v_suffix = '], "padding": "'
+    v_available = get_payload_size(p_payload['profile']) - (len(p_data_line_json) + len(v_prefix) + len(v_suffix) + 1)
+    if v_available < 0:
+        return p_data_line_json
 
-        time.sleep(v_sleep_time)
+    # Attach whole lines fitting into available size, starting at random line of the pool window
+    v_start = p_payload['starts'][random.randrange(g_payload_pool_window)]
+    v_end = v_start
+    v_last = bisect.bisect_right(p_payload['ends'], v_start + v_available) - 1
+    if v_last >= 0 and p_payload['ends'][v_last] > v_start:
+        v_end = p_payload['ends'][v_last]
 
-        v_retry_data = []
-        v_retry_count = v_retry_count+1
-        v_sleep_total_sec = v_sleep_total_sec + v_sleep_time
+    return ''.join((p_data_line_json[:-1], v_prefix, p_payload['pool'][v_start:v_end], v_suffix, 'x' * (v_available - (v_end - v_start)), '"}'))
 
-        for v_entry_index in range(len(v_put_message_result.data.entries)):
-            v_entry = v_put_message_result.data.entries[v_entry_index]
-            if v_entry.error:
-                #g_logger.debug('Put messages error: {}: {}'.format(v_entry.error, v_entry.error_message))
-                v_retry_data.append(p_data[v_entry_index])
 
-        v_retry_messages = oci.streaming.models.PutMessagesDetails(messages=v_retry_data)
-    
-        try:
-            v_put_message_result = p_streamclient.put_messages(stream_id=p_stream_id, put_messages_details=v_retry_messages, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
-            v_data_retry_count = len(v_put_message_result.data.entries)
-            v_data_failure_count = v_put_message_result.data.failures
-            v_data_success_count = v_data_success_count + (v_data_retry_count - v_data_failure_count)
-            g_logger.debug('Put messages attempt: retry_count={}, data_total_count={}, data_retry_count={}, data_success_count={}, data_failure_count={}, sleep_time_ms={}'.format(v_retry_count, v_data_total_count, v_data_retry_count, v_data_success_count, v_data_failure_count, round(v_sleep_total_sec*1000)))
-        except Exception as e:
-            g_logger.error ('Put messages failed with exception: {0}'.format(e))
-            raise
+# ----------------------------------------------------
+# Get input type of payload bind variable, None for default binding of varchar2
+# - values are bound directly as LONG or LONG RAW, or as temporary LOBs rewritten for every row
+# ----------------------------------------------------
+def get_payload_input_type(p_params):
 
-    return v_retry_count, v_data_total_count, v_data_success_count, v_data_failure_count
+    if p_params['payloadtype'] == 'varchar2':
+        return None
+    elif p_params['lobbind'] == 'templob':
+        return oracledb.DB_TYPE_BLOB if p_params['payloadtype'] == 'blob' else oracledb.DB_TYPE_CLOB
+    else:
+        return oracledb.DB_TYPE_LONG_RAW if p_params['payloadtype'] == 'blob' else oracledb.DB_TYPE_LONG
 
 
 # ----------------------------------------------------
-# Produce data to streaming
+# Get bind value of payload, the index is the position of the row in executemany()
+# - temporary LOBs are created once per position and connection, then overwritten in chunk multiples and trimmed
 # ----------------------------------------------------
-def run_streaming(p_params, p_context, p_scenario_name, p_run_id):
+def get_payload_bind(p_params, p_context, p_data_line_json, p_index):
 
-    # Generate data
-    try:
-        v_data_array = get_journals(p_params["iterations"], p_params["minrec"], p_params["maxrec"])
-    except Exception as e:
-        g_logger.warning ('Data generator failed with exception; {0}'.format(e))
+    if p_params['payloadtype'] == 'varchar2':
+        return p_data_line_json
+
+    v_value = p_data_line_json.encode() if p_params['payloadtype'] == 'blob' else p_data_line_json
+    if p_params['lobbind'] == 'direct':
+        return v_value
+
+    # Temporary LOBs belong to the connection, they are recreated after reconnect
+    if p_context.get('lob_connection') is not p_context['connection']:
+        free_payload_lobs(p_context)
+        p_context['lob_connection'] = p_context['connection']
+
+    while len(p_context['lobs']) <= p_index:
+        v_lob = p_context['connection'].createlob(get_payload_input_type(p_params))
+        if 'lob_write_size' not in p_context:
+            p_context['lob_write_size'] = v_lob.getchunksize() * g_lob_write_chunks
+        p_context['lobs'].append(v_lob)
+        p_context['lob_sizes'].append(0)
+
+    v_lob = p_context['lobs'][p_index]
+    for v_offset in range(0, len(v_value), p_context['lob_write_size']):
+        v_lob.write(v_value[v_offset:v_offset+p_context['lob_write_size']], v_offset+1)
+    if p_context['lob_sizes'][p_index] > len(v_value):
+        v_lob.trim(len(v_value))
+    p_context['lob_sizes'][p_index] = len(v_value)
+
+    return v_lob
+
+
+# ----------------------------------------------------
+# Get maximum number of rows of one executemany(), bounded by the pool of temporary LOBs
+# ----------------------------------------------------
+def get_payload_chunk_rows(p_params):
+
+    if p_params['payloadtype'] != 'varchar2' and p_params['lobbind'] == 'templob':
+        return min(p_params['chunkrows'], g_lob_pool_size)
+
+    return p_params['chunkrows']
+
+
+# ----------------------------------------------------
+# Free temporary LOBs of the connection, the driver frees them once they are not referenced
+# ----------------------------------------------------
+def free_payload_lobs(p_context):
+
+    p_context['lobs'] = []
+    p_context['lob_sizes'] = []
+    p_context.pop('lob_connection', None)
+
+
+# ----------------------------------------------------
+# DATA SOURCE FUNCTIONS
+# ----------------------------------------------------
+
+# Dataset file header: magic, number of lines, offset of index with offsets of lines
+g_dataset_magic = b'LGDATA01'
+g_dataset_header = struct.Struct('<8sQQ')
+g_dataset_length = struct.Struct('<I')
+g_dataset_offset = struct.Struct('<Q')
+
+
+# ----------------------------------------------------
+# Get serialized data lines with keys for one iteration lazily, generated or replayed
+# - time spent in the generator is accounted here, not in the phases of the consumer
+# ----------------------------------------------------
+def get_data_lines(p_params, p_context, p_stats):
+
+    # Generator and pool of the payload are built once per load process
+    if 'payload' not in p_context:
+        v_time = time.perf_counter()
+        p_context['generator'] = get_generator(p_params)
+        p_context['payload'] = init_payload(p_params, p_context['generator'])
+        add_phase_time(p_stats, 'generate', v_time)
+
+    v_time = time.perf_counter()
+
+    if 'replay' in p_context:
+        for (v_data_key, v_data_line_json) in get_replay_lines(p_context['replay'], p_params['iterations'] * ((p_params['minrec']+p_params['maxrec'])//2)):
+            v_time = add_phase_time(p_stats, 'generate', v_time)
+            v_data_line_json = get_payload_json(p_context['payload'], v_data_line_json)
+            add_phase_time(p_stats, 'serialize', v_time)
+            yield (v_data_key, v_data_line_json)
+            v_time = time.perf_counter()
+        return
+
+    try:
+        v_key = p_context['generator']['key']
+        for v_data_line in get_journals(p_params["iterations"], p_context['generator']['generate']):
+            v_time = add_phase_time(p_stats, 'generate', v_time)
+            v_data_line_json = get_payload_json(p_context['payload'], json.dumps(v_data_line))
+            add_phase_time(p_stats, 'serialize', v_time)
+            yield (str(v_data_line[v_key]), v_data_line_json)
+            v_time = time.perf_counter()
+    except Exception as e:
+        g_logger.warning ('Data generator failed with exception: {0}'.format(e))
+        raise
+
+
+# ----------------------------------------------------
+# Split data lines into chunks of at most given number of lines and serialized bytes
+# ----------------------------------------------------
+def get_data_chunks(p_data_lines, p_chunk_rows, p_chunk_bytes):
+
+    v_data_chunk = []
+    v_chunk_size = 0
+    for v_data_line in p_data_lines:
+        v_data_chunk.append(v_data_line)
+        v_chunk_size = v_chunk_size + len(v_data_line[1])
+        if len(v_data_chunk) >= p_chunk_rows or v_chunk_size >= p_chunk_bytes:
+            yield v_data_chunk
+            v_data_chunk = []
+            v_chunk_size = 0
+
+    if len(v_data_chunk) > 0:
+        yield v_data_chunk
+
+
+# ----------------------------------------------------
+# Generate journal lines into dataset file
+# ----------------------------------------------------
+def run_record(p_params):
+
+    v_start = time.perf_counter()
+    random.seed(p_params['seed'])
+    set_generator_clock(p_params)
+    v_generator = get_generator(p_params)
+
+    v_offsets = []
+    v_position = g_dataset_header.size
+
+    with open(p_params['record'], 'wb') as v_file:
+
+        # Header is written after the index is known
+        v_file.write(bytes(g_dataset_header.size))
+
+        # Lines are stored as length-prefixed key and serialized line
+        while len(v_offsets) < p_params['recordrows']:
+            for v_data_line in get_journals(p_params['iterations'], v_generator['generate']):
+                v_key = str(v_data_line[v_generator['key']]).encode()
+                v_value = json.dumps(v_data_line).encode()
+                v_file.write(g_dataset_length.pack(len(v_key)))
+                v_file.write(v_key)
+                v_file.write(g_dataset_length.pack(len(v_value)))
+                v_file.write(v_value)
+                v_offsets.append(v_position)
+                v_position = v_position + 2*g_dataset_length.size + len(v_key) + len(v_value)
+                if len(v_offsets) >= p_params['recordrows']:
+                    break
+
+        # Index of line offsets allows disjoint slices per thread
+        for v_offset in v_offsets:
+            v_file.write(g_dataset_offset.pack(v_offset))
+
+        v_file.seek(0)
+        v_file.write(g_dataset_header.pack(g_dataset_magic, len(v_offsets), v_position))
+
+    v_result = {
+        'type' : 'record',
+        'file' : p_params['record'],
+        'minrec' : p_params['minrec'],
+        'maxrec' : p_params['maxrec'],
+        'seed' : p_params['seed'],
+        'schema' : p_params['schema'],
+        'lines' : len(v_offsets),
+        'bytes' : os.path.getsize(p_params['record']),
+        'elapsed_sec_total' : round(time.perf_counter()-v_start, 3)
+    }
+    print_result(v_result)
+
+    return v_result
+
+
+# ----------------------------------------------------
+# Get index of load process and number of load processes across all agents
+# ----------------------------------------------------
+def get_worker_index(p_params):
+
+    if p_params['agent'] == None:
+        return (p_params['thread'], p_params['threads'])
+
+    v_agent_count = len(p_params['agents'].split(','))
+    return ((p_params['agent']-1)*p_params['threads'] + p_params['thread'], v_agent_count*p_params['threads'])
+
+
+# ----------------------------------------------------
+# Open dataset file for replay of slice belonging to the thread
+# ----------------------------------------------------
+def open_replay(p_params):
+
+    v_file = open(p_params['replay'], 'rb')
+    v_mmap = mmap.mmap(v_file.fileno(), 0, access=mmap.ACCESS_READ)
+    (v_magic, v_line_count, v_index_offset) = g_dataset_header.unpack_from(v_mmap, 0)
+
+    if v_magic != g_dataset_magic:
+        raise ValueError('File {} is not a dataset file'.format(p_params['replay']))
+
+    # Threads replay disjoint slices, small datasets are shared by all threads
+    (v_worker, v_worker_count) = get_worker_index(p_params)
+    v_slice_size = v_line_count // v_worker_count
+    if v_slice_size > 0:
+        v_first = (v_worker-1) * v_slice_size
+        v_last = v_first + v_slice_size
+    else:
+        v_first = 0
+        v_last = v_line_count
+
+    v_replay = {
+        'file': v_file,
+        'mmap': v_mmap,
+        'view': memoryview(v_mmap),
+        'index_offset': v_index_offset,
+        'first': v_first,
+        'last': v_last,
+        'position': v_first
+    }
+
+    return v_replay
+
+
+# ----------------------------------------------------
+# Get next lines from replayed slice lazily, wrapping around at the end of slice
+# ----------------------------------------------------
+def get_replay_lines(p_replay, p_line_count):
+
+    v_view = p_replay['view']
+
+    for i in range(p_line_count):
+
+        (v_offset,) = g_dataset_offset.unpack_from(v_view, p_replay['index_offset'] + p_replay['position']*g_dataset_offset.size)
+        (v_key_length,) = g_dataset_length.unpack_from(v_view, v_offset)
+        v_offset = v_offset + g_dataset_length.size
+        v_key = str(v_view[v_offset:v_offset+v_key_length], 'utf-8')
+        v_offset = v_offset + v_key_length
+        (v_value_length,) = g_dataset_length.unpack_from(v_view, v_offset)
+        v_offset = v_offset + g_dataset_length.size
+
+        p_replay['position'] = p_replay['position']+1
+        if p_replay['position'] >= p_replay['last']:
+            p_replay['position'] = p_replay['first']
+
+        yield (v_key, str(v_view[v_offset:v_offset+v_value_length], 'utf-8'))
+
+
+# ----------------------------------------------------
+# Close dataset file
+# ----------------------------------------------------
+def close_replay(p_replay):
+
+    p_replay['view'].release()
+    p_replay['mmap'].close()
+    p_replay['file'].close()
+
+
+# ----------------------------------------------------
+# IDENTIFIER FUNCTIONS
+# ----------------------------------------------------
+
+# Identifier strategies
+g_id_types = ('uuid4', 'uuid7', 'ulid', 'sequence', 'reverse')
+
+# Variant hex digit of UUID indexed by random hex digit, keeps the two random low bits
+g_uuid_variant_digits = '89ab89ab89ab89ab'
+
+# Crockford base32 alphabet of ULID
+g_ulid_alphabet = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+# Number of sequence identifiers reserved for every load process
+g_sequence_range = 10**12
+
+
+# ----------------------------------------------------
+# Get UUID string with dashes from 32 hex digits
+# ----------------------------------------------------
+def get_uuid_string(p_hex):
+    return p_hex[0:8]+'-'+p_hex[8:12]+'-'+p_hex[12:16]+'-'+p_hex[16:20]+'-'+p_hex[20:32]
+
+
+# ----------------------------------------------------
+# Get millisecond timestamp and counter for time ordered identifiers, monotonic within load process
+# ----------------------------------------------------
+def get_ordered_time(p_state, p_count, p_counter_max):
+
+    v_time_ms = int(time.time()*1000)
+
+    # Counter continues within the same millisecond, overflow moves to the next millisecond
+    if v_time_ms <= p_state['time_ms']:
+        v_time_ms = p_state['time_ms']
+        v_counter = p_state['counter']
+    else:
+        v_counter = 0
+
+    if v_counter + p_count > p_counter_max:
+        v_time_ms = v_time_ms+1
+        v_counter = 0
+
+    p_state['time_ms'] = v_time_ms
+    p_state['counter'] = v_counter + p_count
+
+    return v_time_ms, v_counter
+
+
+# ----------------------------------------------------
+# Get identifiers for batch of rows using the configured strategy
+# ----------------------------------------------------
+def get_ids(p_params, p_context, p_count):
+
+    if 'ids' not in p_context:
+        (v_worker, v_worker_count) = get_worker_index(p_params)
+        p_context['ids'] = { 'time_ms': 0, 'counter': 0, 'ulid_random': 0, 'sequence': v_worker*g_sequence_range }
+    v_state = p_context['ids']
+
+    # Random UUID, random bytes of the batch are read from the OS at once
+    if p_params['idtype'] == 'uuid4':
+        v_hex = os.urandom(16*p_count).hex()
+        return [ v_hex[i:i+8]+'-'+v_hex[i+8:i+12]+'-4'+v_hex[i+13:i+16]+'-'+g_uuid_variant_digits[int(v_hex[i+16], 16)]+v_hex[i+17:i+20]+'-'+v_hex[i+20:i+32] for i in range(0, 32*p_count, 32) ]
+
+    # Time ordered UUIDv7 with 12 bit counter in rand_a (RFC 9562, method 1)
+    elif p_params['idtype'] == 'uuid7':
+        v_random = os.urandom(8*p_count)
+        v_ids = []
+        while len(v_ids) < p_count:
+            (v_time_ms, v_counter) = get_ordered_time(v_state, min(p_count-len(v_ids), 4096), 4096)
+            v_prefix = (v_time_ms << 16) | (7 << 12)
+            for v_counter in range(v_counter, v_state['counter']):
+                v_rand_b = int.from_bytes(v_random[8*len(v_ids):8*len(v_ids)+8], 'big') & 0x3fffffffffffffff
+                v_ids.append(get_uuid_string('{:016x}{:016x}'.format(v_prefix | v_counter, (2 << 62) | v_rand_b)))
+        return v_ids
+
+    # Time ordered ULID, random part is incremented within the same millisecond
+    elif p_params['idtype'] == 'ulid':
+        (v_time_ms, v_counter) = get_ordered_time(v_state, p_count, 2**32)
+        if v_counter == 0:
+            v_state['ulid_random'] = int.from_bytes(os.urandom(10), 'big') >> 32 << 32
+        v_ids = []
+        for i in range(p_count):
+            v_value = (v_time_ms << 80) | (v_state['ulid_random'] + v_counter + i)
+            v_ids.append(''.join(g_ulid_alphabet[(v_value >> v_shift) & 31] for v_shift in range(125, -5, -5)))
+        return v_ids
+
+    # Sequence from range reserved for the load process, inserts go to the right edge of index
+    elif p_params['idtype'] == 'sequence':
+        v_sequence = v_state['sequence']
+        v_state['sequence'] = v_sequence + p_count
+        return [ '{:020d}'.format(v_sequence+i) for i in range(p_count) ]
+
+    # Sequence with reversed digits, inserts are spread over index like with reverse key index
+    elif p_params['idtype'] == 'reverse':
+        v_sequence = v_state['sequence']
+        v_state['sequence'] = v_sequence + p_count
+        return [ '{:020d}'.format(v_sequence+i)[::-1] for i in range(p_count) ]
+
+
+# ----------------------------------------------------
+# STATISTICS FUNCTIONS
+# ----------------------------------------------------
+
+# Latency histogram with logarithmic buckets (~5% relative error), mergeable across processes
+g_histogram_min_sec = 0.00001
+g_histogram_base = 1.1
+
+
+# ----------------------------------------------------
+# Add latency to histogram
+# ----------------------------------------------------
+def add_to_histogram(p_histogram, p_seconds):
+
+    if p_seconds <= g_histogram_min_sec:
+        v_bucket = 0
+    else:
+        v_bucket = int(math.log(p_seconds/g_histogram_min_sec, g_histogram_base))+1
+
+    v_key = str(v_bucket)
+    p_histogram[v_key] = p_histogram.get(v_key, 0)+1
+
+
+# ----------------------------------------------------
+# Merge source histogram into target histogram
+# ----------------------------------------------------
+def merge_histograms(p_target, p_source):
+
+    for v_key, v_count in p_source.items():
+        p_target[v_key] = p_target.get(v_key, 0)+v_count
+
+    return p_target
+
+
+# ----------------------------------------------------
+# Get upper bound of histogram bucket in seconds
+# ----------------------------------------------------
+def get_histogram_bucket_bound(p_bucket):
+    return g_histogram_min_sec * (g_histogram_base ** p_bucket)
+
+
+# ----------------------------------------------------
+# Get percentiles in milliseconds from histogram
+# ----------------------------------------------------
+def get_histogram_percentiles(p_histogram, p_percentiles=(50, 90, 95, 99, 99.9)):
+
+    v_buckets = sorted((int(v_key), v_count) for v_key, v_count in p_histogram.items())
+    v_total_count = sum(v_count for v_bucket, v_count in v_buckets)
+
+    v_result = { 'count': v_total_count }
+    for v_percentile in p_percentiles:
+        v_name = 'p{}_ms'.format(v_percentile).replace('.', '_')
+        v_result[v_name] = None
+        v_threshold = v_total_count * v_percentile / 100
+        v_running_count = 0
+        for v_bucket, v_count in v_buckets:
+            v_running_count = v_running_count+v_count
+            if v_running_count >= v_threshold:
+                v_result[v_name] = round(get_histogram_bucket_bound(v_bucket)*1000, 3)
+                break
+
+    return v_result
+
+
+# Phases of load iteration measured by add_phase_time()
+g_phases = ('generate', 'timestamp', 'uuid', 'serialize', 'encode', 'bind', 'execute', 'commit', 'flush', 'sleep')
+
+
+# ----------------------------------------------------
+# Add time elapsed since start to phase and return current time
+# ----------------------------------------------------
+def add_phase_time(p_stats, p_phase, p_start):
+
+    v_now = time.perf_counter()
+    p_stats['phase_sec'][p_phase] += v_now-p_start
+    return v_now
+
+
+# ----------------------------------------------------
+# Get share of phases in percent of elapsed time without sleep, with the unmeasured time as phase "other"
+# ----------------------------------------------------
+def get_phase_share(p_phase_sec, p_elapsed_sec):
+
+    v_busy_sec = p_elapsed_sec - p_phase_sec.get('sleep', 0)
+    v_phase_share = dict()
+    for v_phase, v_seconds in p_phase_sec.items():
+        if v_phase != 'sleep':
+            v_phase_share[v_phase] = round(v_seconds/v_busy_sec*100, 2) if v_busy_sec > 0 else None
+
+    return v_phase_share
+
+
+# ----------------------------------------------------
+# Get peak resident set size of the current process in MB
+# ----------------------------------------------------
+def get_peak_rss_mb():
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    v_maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        v_maxrss = v_maxrss / 1024
+
+    return round(v_maxrss / 1024, 1)
+
+
+# ----------------------------------------------------
+# CLIENT FUNCTIONS
+# ----------------------------------------------------
+
+# Interval of sampling of client host CPU and network in seconds
+g_client_sample_sec = 1
+
+# Directory with NUMA nodes of Linux host
+g_numa_node_dir = '/sys/devices/system/node'
+
+
+# ----------------------------------------------------
+# Get sorted list of CPUs available to the current process
+# ----------------------------------------------------
+def get_available_cpus():
+
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    else:
+        return list(range(os.cpu_count() or 1))
+
+
+# ----------------------------------------------------
+# Get number of load processes for threads=auto, one per available CPU not used by readers
+# ----------------------------------------------------
+def get_auto_threads(p_params):
+
+    return max(len(get_available_cpus()) - p_params['readers'], 1)
+
+
+# ----------------------------------------------------
+# Parse Linux CPU list such as 0-3,8-11
+# ----------------------------------------------------
+def parse_cpu_list(p_cpu_list):
+
+    v_cpus = []
+    for v_range in p_cpu_list.strip().split(','):
+        if v_range == '':
+            continue
+        (v_first, v_sep, v_last) = v_range.partition('-')
+        v_cpus.extend(range(int(v_first), int(v_last or v_first)+1))
+
+    return v_cpus
+
+
+# ----------------------------------------------------
+# Get CPUs of NUMA nodes limited to the available CPUs, single node if topology is unknown
+# ----------------------------------------------------
+def get_numa_nodes():
+
+    v_available = set(get_available_cpus())
+    v_nodes = []
+    try:
+        v_node_names = sorted((v_name for v_name in os.listdir(g_numa_node_dir) if re.fullmatch('node[0-9]+', v_name)), key=lambda v_name: int(v_name[4:]))
+        for v_node_name in v_node_names:
+            with open(os.path.join(g_numa_node_dir, v_node_name, 'cpulist')) as v_file:
+                v_cpus = [ v_cpu for v_cpu in parse_cpu_list(v_file.read()) if v_cpu in v_available ]
+            if len(v_cpus) > 0:
+                v_nodes.append(v_cpus)
+    except OSError:
+        v_nodes = []
+
+    if len(v_nodes) == 0:
+        v_nodes = [ sorted(v_available) ]
+
+    return v_nodes
+
+
+# ----------------------------------------------------
+# Pin load process to CPU core or NUMA node round robin by thread and return the CPUs
+# ----------------------------------------------------
+def set_worker_affinity(p_params):
+
+    if p_params['pin'] == 'core':
+        v_cpus = get_available_cpus()
+        v_cpus = [ v_cpus[(p_params['thread']-1) % len(v_cpus)] ]
+    else:
+        v_nodes = get_numa_nodes()
+        v_cpus = v_nodes[(p_params['thread']-1) % len(v_nodes)]
+
+    os.sched_setaffinity(0, v_cpus)
+    return v_cpus
+
+
+# ----------------------------------------------------
+# Get resource usage of the current process, I/O counters are None if not available
+# ----------------------------------------------------
+def get_process_usage():
+
+    v_rusage = resource.getrusage(resource.RUSAGE_SELF)
+    v_usage = {
+        'cpu_sec': v_rusage.ru_utime + v_rusage.ru_stime,
+        'voluntary_ctx_switches': v_rusage.ru_nvcsw,
+        'involuntary_ctx_switches': v_rusage.ru_nivcsw,
+        'io_read_bytes': None,
+        'io_write_bytes': None
+    }
+
+    # Bytes read and written by system calls, dominated by network traffic of the load process
+    try:
+        with open('/proc/self/io') as v_file:
+            v_io = dict(v_line.split(':', 1) for v_line in v_file if ':' in v_line)
+        v_usage['io_read_bytes'] = int(v_io['rchar'])
+        v_usage['io_write_bytes'] = int(v_io['wchar'])
+    except (OSError, KeyError, ValueError):
+        pass
+
+    return v_usage
+
+
+# ----------------------------------------------------
+# Get resource usage of the current process since start snapshot
+# ----------------------------------------------------
+def get_process_usage_delta(p_start, p_end, p_elapsed_sec):
+
+    v_delta = dict()
+    for v_key, v_value in p_end.items():
+        v_delta[v_key] = v_value - p_start[v_key] if v_value != None and p_start[v_key] != None else None
+
+    v_delta['cpu_sec'] = round(v_delta['cpu_sec'], 3)
+    v_delta['cpu_pct'] = round(v_delta['cpu_sec']/p_elapsed_sec*100, 2) if p_elapsed_sec > 0 else None
+    return v_delta
+
+
+# ----------------------------------------------------
+# Get sample of host CPU time, idle time and network bytes, None if not available
+# ----------------------------------------------------
+def get_host_sample():
+
+    try:
+        # Only user, nice, system, idle, iowait, irq, softirq and steal, guest time is included in user time
+        with open('/proc/stat') as v_file:
+            v_cpu_times = [ int(v_value) for v_value in v_file.readline().split()[1:9] ]
+
+        v_rx_bytes = 0
+        v_tx_bytes = 0
+        with open('/proc/net/dev') as v_file:
+            for v_line in v_file.readlines()[2:]:
+                (v_interface, v_counters) = v_line.split(':', 1)
+                if v_interface.strip() != 'lo':
+                    v_counters = v_counters.split()
+                    v_rx_bytes = v_rx_bytes + int(v_counters[0])
+                    v_tx_bytes = v_tx_bytes + int(v_counters[8])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    return {
+        'time': time.perf_counter(),
+        'cpu_total': sum(v_cpu_times),
+        'cpu_idle': v_cpu_times[3] + v_cpu_times[4],
+        'net_rx_bytes': v_rx_bytes,
+        'net_tx_bytes': v_tx_bytes
+    }
+
+
+# ----------------------------------------------------
+# Get CPU utilization of host in percent between two samples
+# ----------------------------------------------------
+def get_host_cpu_util(p_start, p_end):
+
+    v_total = p_end['cpu_total'] - p_start['cpu_total']
+    return round((1 - (p_end['cpu_idle'] - p_start['cpu_idle'])/v_total)*100, 2) if v_total > 0 else None
+
+
+# ----------------------------------------------------
+# Sample host CPU and network until stopped and store the telemetry in client dictionary
+# ----------------------------------------------------
+def run_client_sampler(p_client, p_stop):
+
+    v_first = get_host_sample()
+    if v_first == None:
+        p_stop.wait()
+        return
+
+    v_previous = v_first
+    v_max_util = None
+    while not p_stop.wait(g_client_sample_sec):
+        v_sample = get_host_sample()
+        if v_sample == None:
+            continue
+        v_util = get_host_cpu_util(v_previous, v_sample)
+        if v_util != None:
+            v_max_util = max(v_max_util or 0, v_util)
+        v_previous = v_sample
+
+    v_last = get_host_sample()
+    if v_last == None:
+        return
+    v_elapsed_sec = v_last['time'] - v_first['time']
+    p_client['cpu_util_avg_pct'] = get_host_cpu_util(v_first, v_last)
+    p_client['cpu_util_max_pct'] = v_max_util
+    p_client['net_rx_bytes'] = v_last['net_rx_bytes'] - v_first['net_rx_bytes']
+    p_client['net_tx_bytes'] = v_last['net_tx_bytes'] - v_first['net_tx_bytes']
+    p_client['net_rx_mb_per_sec'] = round(p_client['net_rx_bytes']/1024/1024/v_elapsed_sec, 2) if v_elapsed_sec > 0 else None
+    p_client['net_tx_mb_per_sec'] = round(p_client['net_tx_bytes']/1024/1024/v_elapsed_sec, 2) if v_elapsed_sec > 0 else None
+
+
+# ----------------------------------------------------
+# Decide if the run is limited by the client, the host CPU or the load processes are saturated
+# ----------------------------------------------------
+def is_client_bound(p_params, p_result_sum):
+
+    v_host_util = p_result_sum['client'].get('cpu_util_avg_pct')
+    v_worker_util = p_result_sum['cpu_pct']
+
+    return (v_host_util != None and v_host_util >= p_params['clientcpu']) or (v_worker_util != None and v_worker_util >= p_params['clientcpu'])
+
+
+# ----------------------------------------------------
+# CONNECT FUNCTIONS
+# ----------------------------------------------------
+
+# ----------------------------------------------------
+# Normal connect to database
+# ----------------------------------------------------
+def connect_oracle(p_params):
+
+    v_context = {
+       'connection':  None,
+       'cursor':      None
+    } 
+
+    oracledb.init_oracle_client()
+
+    try:
+        v_context['connection'] = oracledb.connect(
+            user=p_params['dbuser'],
+            password=p_params['dbpwd'],
+            dsn=p_params['dbconnect']
+        )
+        v_context['cursor'] = v_context['connection'].cursor()
+
+    except Exception as e:
+        g_logger.warning ('Cannot connect to the database: {0}'.format(e))
+        raise
+
+    return v_context
+
+
+# ----------------------------------------------------
+# Connect to database for fast ingest
+# ----------------------------------------------------
+def connect_oracle_fast(p_params):
+
+    v_context = {
+       'connection':  None,
+       'cursor':      None
+    } 
+
+    oracledb.init_oracle_client()
+
+    try:
+        v_context['connection'] = oracledb.connect(
+            user=p_params['dbuser'],
+            password=p_params['dbpwd'],
+            dsn=p_params['dbconnect']
+        )
+        v_context['cursor'] = v_context['connection'].cursor()
+        v_context['cursor'].execute('alter session set optimizer_ignore_hints = false')
+        v_context['flush_time'] = time.perf_counter()
+
+    except Exception as e:
+        g_logger.warning ('Cannot connect to the database for fast ingest: {0}'.format(e))
+        raise
+
+    return v_context
+
+
+# ----------------------------------------------------
+# Connect to streaming
+# ----------------------------------------------------
+def connect_streaming(p_params):
+
+    v_context = {
+       'config':       None,
+       'adminclient':  None,
+       'stream':       None,
+       'streamclient': None
+    } 
+
+    try:
+        v_context['config'] = oci.config.from_file()
+    except Exception as e:
+        g_logger.warning ('Cannot read OCI config default file: {0}'.format(e))
+        raise
+
+    try:
+        v_context['adminclient'] = oci.streaming.StreamAdminClient(config=v_context['config'])
+    except Exception as e:
+        g_logger.warning ('Cannot get StreamAdminClient: {0}'.format(e))
+        raise
+
+    try:
+        v_context['stream'] = v_context['adminclient'].get_stream(stream_id=p_params['topic']).data
+    except Exception as e:
+        g_logger.warning ('Cannot get stream: {0}'.format(e))
+        raise
+
+    try:
+       v_context['streamclient'] = oci.streaming.StreamClient(config=v_context['config'], service_endpoint=v_context['stream'].messages_endpoint)
+    except Exception as e:
+        g_logger.warning ('Cannot get StreamClient: {0}'.format(e))
+        raise
+
+    return v_context
+
+
+# ----------------------------------------------------
+# Connect to simulated database
+# ----------------------------------------------------
+def connect_simulated(p_params):
+
+    global g_simulated_outage
+
+    v_context = {
+       'random':  random.Random()
+    }
+
+    # Outage window is relative to the first connect of the load process
+    if p_params['simoutage'] != None and g_simulated_outage == None:
+        (v_outage_start, v_outage_duration) = [ int(v_value) for v_value in p_params['simoutage'].split(',') ]
+        g_simulated_outage = (time.time()+v_outage_start, time.time()+v_outage_start+v_outage_duration)
+
+    # Connection takes several round trips
+    time.sleep(get_simulated_latency(v_context['random'], p_params['simrtt']*3/1000, p_params['simdist']))
+    check_simulated_outage()
+
+    return v_context
+
+
+# ----------------------------------------------------
+# RUN FUNCTIONS
+# ----------------------------------------------------
+
+# ----------------------------------------------------
+# Run with commit after every row
+# ----------------------------------------------------
+def run_single(p_params, p_context, p_scenario_name, p_run_id, p_stats):
+
+    v_data_count = 0
+    v_failure_count = 0
+    v_sql = 'insert into {} (ts, id, scenario, run_id, payload) values (:ts, :id, :scenario, :run_id, :payload)'.format(get_target_table(p_params))
+    v_input_type = get_payload_input_type(p_params)
+    v_data_size = 0
+
+    # Generate or replay serialized data lazily, identifiers are generated per chunk
+    for v_data_chunk in get_data_chunks(get_data_lines(p_params, p_context, p_stats), p_params['chunkrows'], p_params['chunkbytes']):
+
+        v_time = time.perf_counter()
+        v_ids = get_ids(p_params, p_context, len(v_data_chunk))
+        v_time = add_phase_time(p_stats, 'uuid', v_time)
+
+        # Every row is committed separately, so it always gets its own timestamp
+        for (v_data_key, v_data_line_json), v_id in zip(v_data_chunk, v_ids):
+
+            v_timestamp = datetime.datetime.today()
+            v_time = add_phase_time(p_stats, 'timestamp', v_time)
+            v_data_size = v_data_size + (len(v_data_line_json)+len(v_id)+len(str(v_timestamp)))
+
+            p_context['cursor'].setinputsizes(ts=oracledb.DB_TYPE_TIMESTAMP, payload=v_input_type)
+            v_payload = get_payload_bind(p_params, p_context, v_data_line_json, 0)
+            v_time = add_phase_time(p_stats, 'bind', v_time)
+            if not execute_row(p_context, v_sql, ts=v_timestamp, id=v_id, scenario=p_scenario_name, run_id=p_run_id, payload=v_payload):
+                v_failure_count = v_failure_count+1
+                v_time = add_phase_time(p_stats, 'execute', v_time)
+                continue
+            v_time = add_phase_time(p_stats, 'execute', v_time)
+            p_context['connection'].commit()
+            v_time = add_phase_time(p_stats, 'commit', v_time)
+
+            v_data_count = v_data_count+1
+
+    return v_data_count, v_failure_count, v_data_size, v_data_size
+
+
+# ----------------------------------------------------
+# Run with commit after the batch
+# ----------------------------------------------------
+def run_batch(p_params, p_context, p_scenario_name, p_run_id, p_stats):
+
+    v_data_count = 0
+    v_failure_count = 0
+    v_sql = 'insert into {} (ts, id, scenario, run_id, payload) values (:ts, :id, :scenario, :run_id, :payload)'.format(get_target_table(p_params))
+    v_input_type = get_payload_input_type(p_params)
+    v_data_size = 0
+
+    # Generate or replay serialized data lazily, identifiers are generated per chunk
+    for v_data_chunk in get_data_chunks(get_data_lines(p_params, p_context, p_stats), p_params['chunkrows'], p_params['chunkbytes']):
+
+        v_time = time.perf_counter()
+        v_ids = get_ids(p_params, p_context, len(v_data_chunk))
+        v_time = add_phase_time(p_stats, 'uuid', v_time)
+
+        if p_params['timestamps'] == 'batch':
+            v_timestamp = datetime.datetime.today()
+            v_timestamp_size = len(str(v_timestamp))
+            v_time = add_phase_time(p_stats, 'timestamp', v_time)
+
+        for (v_data_key, v_data_line_json), v_id in zip(v_data_chunk, v_ids):
+
+            if p_params['timestamps'] == 'row':
+                v_timestamp = datetime.datetime.today()
+                v_timestamp_size = len(str(v_timestamp))
+                v_time = add_phase_time(p_stats, 'timestamp', v_time)
+            v_data_size = v_data_size + (len(v_data_line_json)+len(v_id)+v_timestamp_size)
+
+            p_context['cursor'].setinputsizes(ts=oracledb.DB_TYPE_TIMESTAMP, payload=v_input_type)
+            v_payload = get_payload_bind(p_params, p_context, v_data_line_json, 0)
+            v_time = add_phase_time(p_stats, 'bind', v_time)
+            if execute_row(p_context, v_sql, ts=v_timestamp, id=v_id, scenario=p_scenario_name, run_id=p_run_id, payload=v_payload):
+                v_data_count = v_data_count+1
+            else:
+                v_failure_count = v_failure_count+1
+            v_time = add_phase_time(p_stats, 'execute', v_time)
+
+    v_time = time.perf_counter()
+    p_context['connection'].commit()
+    v_time = add_phase_time(p_stats, 'commit', v_time)
+
+    return v_data_count, v_failure_count, v_data_size, v_data_size
+
+
+# ----------------------------------------------------
+# Run with array insert
+# ----------------------------------------------------
+def run_array(p_params, p_context, p_scenario_name, p_run_id, p_stats):
+
+    v_data_count = 0
+    v_failure_count = 0
+    v_sql = 'insert into {} (ts, id, scenario, run_id, payload) values (:ts, :id, :scenario, :run_id, :payload)'.format(get_target_table(p_params))
+    v_input_type = get_payload_input_type(p_params)
+    v_data_size = 0
+
+    # Generate or replay serialized data lazily, insert in chunks within one transaction
+    for v_data_chunk in get_data_chunks(get_data_lines(p_params, p_context, p_stats), get_payload_chunk_rows(p_params), p_params['chunkbytes']):
+
+        v_time = time.perf_counter()
+        v_data = []
+        v_ids = get_ids(p_params, p_context, len(v_data_chunk))
+        v_time = add_phase_time(p_stats, 'uuid', v_time)
+
+        if p_params['timestamps'] == 'batch':
+            v_timestamp = datetime.datetime.today()
+            v_timestamp_size = len(str(v_timestamp))
+            v_time = add_phase_time(p_stats, 'timestamp', v_time)
+
+        for (v_data_key, v_data_line_json), v_id in zip(v_data_chunk, v_ids):
+
+            if p_params['timestamps'] == 'row':
+                v_timestamp = datetime.datetime.today()
+                v_timestamp_size = len(str(v_timestamp))
+                v_time = add_phase_time(p_stats, 'timestamp', v_time)
+            v_data_size = v_data_size + (len(v_data_line_json)+len(v_id)+v_timestamp_size)
+
+            v_data.append((v_timestamp, v_id, p_scenario_name, p_run_id, get_payload_bind(p_params, p_context, v_data_line_json, len(v_data))))
+            v_time = add_phase_time(p_stats, 'bind', v_time)
+
+        # Rows failing with row level errors are counted as failures, the rest of the chunk is inserted
+        p_context['cursor'].setinputsizes(oracledb.DB_TYPE_TIMESTAMP, None, None, None, v_input_type)
+        p_context['cursor'].executemany(v_sql, v_data, batcherrors=True, arraydmlrowcounts=True)
+        v_data_count = v_data_count + sum(p_context['cursor'].getarraydmlrowcounts())
+        v_failure_count = v_failure_count + get_batch_error_count(p_context['cursor'])
+        v_time = add_phase_time(p_stats, 'execute', v_time)
+
+    v_time = time.perf_counter()
+    p_context['connection'].commit()
+    v_time = add_phase_time(p_stats, 'commit', v_time)
+    
+    return v_data_count, v_failure_count, v_data_size, v_data_size
+
+
+# ----------------------------------------------------
+# Run with array insert and memoptimize write
+# ----------------------------------------------------
+def run_fast(p_params, p_context, p_scenario_name, p_run_id, p_stats):
+
+    v_data_count = 0
+    v_failure_count = 0
+    v_sql = 'insert /*+ MEMOPTIMIZE_WRITE */ into {} (ts, id, scenario, run_id, payload) values (:ts, :id, :scenario, :run_id, :payload)'.format(get_target_table(p_params))
+    v_data_size = 0
+
+    # Generate or replay serialized data lazily, insert in chunks
+    for v_data_chunk in get_data_chunks(get_data_lines(p_params, p_context, p_stats), p_params['chunkrows'], p_params['chunkbytes']):
+
+        v_time = time.perf_counter()
+        v_data = []
+        v_ids = get_ids(p_params, p_context, len(v_data_chunk))
+        v_time = add_phase_time(p_stats, 'uuid', v_time)
+
+        if p_params['timestamps'] == 'batch':
+            v_timestamp = datetime.datetime.today()
+            v_timestamp_size = len(str(v_timestamp))
+            v_time = add_phase_time(p_stats, 'timestamp', v_time)
+
+        for (v_data_key, v_data_line_json), v_id in zip(v_data_chunk, v_ids):
+
+            if p_params['timestamps'] == 'row':
+                v_timestamp = datetime.datetime.today()
+                v_timestamp_size = len(str(v_timestamp))
+                v_time = add_phase_time(p_stats, 'timestamp', v_time)
+            v_data_size = v_data_size + (len(v_data_line_json)+len(v_id)+v_timestamp_size)
+
+            v_data.append((v_timestamp, v_id, p_scenario_name, p_run_id, v_data_line_json))
+            v_time = add_phase_time(p_stats, 'bind', v_time)
+
+        # Rows failing with row level errors are counted as failures, the rest of the chunk is inserted
+        p_context['cursor'].setinputsizes(oracledb.DB_TYPE_TIMESTAMP)
+        p_context['cursor'].executemany(v_sql, v_data, batcherrors=True, arraydmlrowcounts=True)
+        v_data_count = v_data_count + sum(p_context['cursor'].getarraydmlrowcounts())
+        v_failure_count = v_failure_count + get_batch_error_count(p_context['cursor'])
+        v_time = add_phase_time(p_stats, 'execute', v_time)
+
+    # commit is not used with fast ingest, data are flushed from large pool periodically if required
+    #p_context['connection'].commit()
+    if p_params['fastflush'] > 0 and time.perf_counter()-p_context['flush_time'] >= p_params['fastflush']:
+        flush_fast_ingest(p_context, p_stats)
+
+    return v_data_count, v_failure_count, v_data_size, v_data_size
+
+
+# ----------------------------------------------------
+# Run with generation and serialization only, data are discarded
+# ----------------------------------------------------
+def run_null(p_params, p_context, p_scenario_name, p_run_id, p_stats):
+
+    v_data_count = 0
+    v_failure_count = 0
+    v_data_size = 0
+
+    # Generate or replay serialized data lazily, bind in chunks
+    for v_data_chunk in get_data_chunks(get_data_lines(p_params, p_context, p_stats), p_params['chunkrows'], p_params['chunkbytes']):
+
+        v_time = time.perf_counter()
+        v_data = []
+        v_ids = get_ids(p_params, p_context, len(v_data_chunk))
+        v_time = add_phase_time(p_stats, 'uuid', v_time)
+
+        if p_params['timestamps'] == 'batch':
+            v_timestamp = datetime.datetime.today()
+            v_timestamp_size = len(str(v_timestamp))
+            v_time = add_phase_time(p_stats, 'timestamp', v_time)
+
+        for (v_data_key, v_data_line_json), v_id in zip(v_data_chunk, v_ids):
+
+            if p_params['timestamps'] == 'row':
+                v_timestamp = datetime.datetime.today()
+                v_timestamp_size = len(str(v_timestamp))
+                v_time = add_phase_time(p_stats, 'timestamp', v_time)
+            v_data_size = v_data_size + (len(v_data_line_json)+len(v_id)+v_timestamp_size)
+
+            v_data.append((v_timestamp, v_id, p_scenario_name, p_run_id, v_data_line_json))
+            v_data_count = v_data_count+1
+            v_time = add_phase_time(p_stats, 'bind', v_time)
+
+        # data are discarded
+        v_data = None
+
+    return v_data_count, v_failure_count, v_data_size, v_data_size
+
+
+# ----------------------------------------------------
+# Get random latency in seconds from configured distribution
+# ----------------------------------------------------
+def get_simulated_latency(p_random, p_mean_sec, p_distribution):
+
+    if p_mean_sec <= 0:
+        return 0
+    elif p_distribution == 'uniform':
+        return p_random.uniform(0, 2*p_mean_sec)
+    elif p_distribution == 'exponential':
+        return p_random.expovariate(1/p_mean_sec)
+    elif p_distribution == 'lognormal':
+        v_sigma = 0.5
+        return p_random.lognormvariate(math.log(p_mean_sec)-v_sigma*v_sigma/2, v_sigma)
+    else:
+        return p_mean_sec
+
+
+# ----------------------------------------------------
+# Wait for simulated server with limited capacity shared by all threads
+# ----------------------------------------------------
+def wait_simulated_server(p_params, p_row_count):
+
+    if g_simulated_server == None:
+        return
+
+    # The server processes rows sequentially at the capacity rate, requests queue behind each other
+    with g_simulated_server.get_lock():
+        v_start = max(time.time(), g_simulated_server.value)
+        g_simulated_server.value = v_start + p_row_count/p_params['simcapacity']
+        v_end = g_simulated_server.value
+
+    time.sleep(max(v_end-time.time(), 0))
+
+
+# ----------------------------------------------------
+# Raise connection error during simulated outage
+# ----------------------------------------------------
+def check_simulated_outage():
+
+    if g_simulated_outage != None and g_simulated_outage[0] <= time.time() < g_simulated_outage[1]:
+        raise ConnectionError('Simulated outage')
+
+
+# ----------------------------------------------------
+# Run with array insert into simulated database
+# ----------------------------------------------------
+def run_simulated(p_params, p_context, p_scenario_name, p_run_id, p_stats):
+
+    v_data_count = 0
+    v_failure_count = 0
+    v_data_size = 0
+
+    # Generate or replay serialized data lazily, insert in chunks within one transaction
+    for v_data_chunk in get_data_chunks(get_data_lines(p_params, p_context, p_stats), p_params['chunkrows'], p_params['chunkbytes']):
+
+        v_time = time.perf_counter()
+        v_data = []
+        v_ids = get_ids(p_params, p_context, len(v_data_chunk))
+        v_time = add_phase_time(p_stats, 'uuid', v_time)
+
+        if p_params['timestamps'] == 'batch':
+            v_timestamp = datetime.datetime.today()
+            v_timestamp_size = len(str(v_timestamp))
+            v_time = add_phase_time(p_stats, 'timestamp', v_time)
+
+        for (v_data_key, v_data_line_json), v_id in zip(v_data_chunk, v_ids):
+
+            if p_params['timestamps'] == 'row':
+                v_timestamp = datetime.datetime.today()
+                v_timestamp_size = len(str(v_timestamp))
+                v_time = add_phase_time(p_stats, 'timestamp', v_time)
+            v_data_size = v_data_size + (len(v_data_line_json)+len(v_id)+v_timestamp_size)
+
+            v_data.append((v_timestamp, v_id, p_scenario_name, p_run_id, v_data_line_json))
+            v_data_count = v_data_count+1
+            v_time = add_phase_time(p_stats, 'bind', v_time)
+
+        # Array insert takes one round trip plus server time per row, limited by server capacity
+        check_simulated_outage()
+        time.sleep(get_simulated_latency(p_context['random'], p_params['simrtt']/1000 + len(v_data)*p_params['simrowus']/1000000, p_params['simdist']))
+        wait_simulated_server(p_params, len(v_data))
+        v_time = add_phase_time(p_stats, 'execute', v_time)
+
+    v_time = time.perf_counter()
+    check_simulated_outage()
+    time.sleep(get_simulated_latency(p_context['random'], p_params['simcommit']/1000, p_params['simdist']))
+    v_time = add_phase_time(p_stats, 'commit', v_time)
+
+    return v_data_count, v_failure_count, v_data_size, v_data_size
+
+
+# ----------------------------------------------------
+# Put messages to streaming with retries
+# - necessary to wrap the standard put_messages() as it does not retry partial failures
+# ----------------------------------------------------
+def put_messages_with_retry(p_streamclient, p_stream_id, p_messages, p_data, p_max_retries):
+
+    # Put messages to the stream
+    v_retry_count = 0
+    v_sleep_base_time_sec = 30/1000
+    v_sleep_max_time_sec = 3
+    v_sleep_total_sec = 0
+
+    try:
+        v_put_message_result = p_streamclient.put_messages(stream_id=p_stream_id, put_messages_details=p_messages, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+        v_data_total_count = len(v_put_message_result.data.entries)
+        v_data_failure_count = v_put_message_result.data.failures
+        v_data_success_count = v_data_total_count - v_data_failure_count
+        g_logger.debug('Put messages attempt: retry_count={}, data_total_count={}, data_retry_count={}, data_success_count={}, data_failure_count={}, sleep_time_ms={}'.format(v_retry_count, v_data_total_count, v_data_total_count, v_data_success_count, v_data_failure_count, round(v_sleep_total_sec*1000)))
+    except Exception as e:
+        g_logger.error ('Put messages failed with exception: {0}'.format(e))
         raise
 
-    v_data_count = 0
-    v_failure_count = 0
-    v_timestamp = datetime.datetime.today()
-    v_data = []
-    v_data_size = 0
-    v_encoded_size = 0
+    # Retry for the failed messages
+    while v_data_failure_count > 0 and v_retry_count <= p_max_retries:
+
+        v_exponential_backoff_sleep_base = min(v_sleep_base_time_sec * (2 ** v_retry_count), v_sleep_max_time_sec)
+        v_sleep_time = (v_exponential_backoff_sleep_base / 2.0) + random.uniform(0, v_exponential_backoff_sleep_base / 2.0)
+
+        time.sleep(v_sleep_time)
+
+        v_retry_data = []
+        v_retry_count = v_retry_count+1
+        v_sleep_total_sec = v_sleep_total_sec + v_sleep_time
+
+        for v_entry_index in range(len(v_put_message_result.data.entries)):
+            v_entry = v_put_message_result.data.entries[v_entry_index]
+            if v_entry.error:
+                #g_logger.debug('Put messages error: {}: {}'.format(v_entry.error, v_entry.error_message))
+                v_retry_data.append(p_data[v_entry_index])
+
+        v_retry_messages = oci.streaming.models.PutMessagesDetails(messages=v_retry_data)
+    
+        try:
+            v_put_message_result = p_streamclient.put_messages(stream_id=p_stream_id, put_messages_details=v_retry_messages, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY)
+            v_data_retry_count = len(v_put_message_result.data.entries)
+            v_data_failure_count = v_put_message_result.data.failures
+            v_data_success_count = v_data_success_count + (v_data_retry_count - v_data_failure_count)
+            g_logger.debug('Put messages attempt: retry_count={}, data_total_count={}, data_retry_count={}, data_success_count={}, data_failure_count={}, sleep_time_ms={}'.format(v_retry_count, v_data_total_count, v_data_retry_count, v_data_success_count, v_data_failure_count, round(v_sleep_total_sec*1000)))
+        except Exception as e:
+            g_logger.error ('Put messages failed with exception: {0}'.format(e))
+            raise
+
+    return v_retry_count, v_data_total_count, v_data_success_count, v_data_failure_count
+
+
+# ----------------------------------------------------
+# Produce data to streaming
+# ----------------------------------------------------
+def run_streaming(p_params, p_context, p_scenario_name, p_run_id, p_stats):
+
+    v_time = time.perf_counter()
+    v_data_count = 0
+    v_success_count = 0
+    v_failure_count = 0
+    v_timestamp = datetime.datetime.today()
+    v_data_size = 0
+    v_encoded_size = 0
+    v_time = add_phase_time(p_stats, 'timestamp', v_time)
+
+    # Message envelope is serialized once, the serialized data line is embedded into it
+    v_value_prefix = '{"uuid": "'
+    v_value_infix = '", "run_id": {}, "scenario": {}, "timestamp": {}, "data": '.format(json.dumps(p_run_id), json.dumps(p_params['scenario']), json.dumps(v_timestamp.isoformat()))
+    v_value_suffix = '}'
+
+    # Generate or replay serialized data lazily, put messages in chunks
+    for v_data_chunk in get_data_chunks(get_data_lines(p_params, p_context, p_stats), p_params['chunkrows'], p_params['chunkbytes']):
+
+        v_time = time.perf_counter()
+        v_data = []
+        v_ids = get_ids(p_params, p_context, len(v_data_chunk))
+        v_time = add_phase_time(p_stats, 'uuid', v_time)
+
+        # Create array of messages for streaming
+        for (v_key_string, v_data_line_json), v_id in zip(v_data_chunk, v_ids):
+
+            v_value_string = v_value_prefix + v_id + v_value_infix + v_data_line_json + v_value_suffix
+            v_time = add_phase_time(p_stats, 'serialize', v_time)
+            v_value_encoded = b64encode(v_value_string.encode()).decode()
+            v_key_encoded = b64encode(v_key_string.encode()).decode()
+            v_data_size = v_data_size + (len(v_value_string)+len(v_key_string))
+            v_encoded_size = v_encoded_size + (len(v_value_encoded)+len(v_key_encoded))
+            v_time = add_phase_time(p_stats, 'encode', v_time)
+
+            v_data.append(oci.streaming.models.PutMessagesDetailsEntry(key=v_key_encoded, value=v_value_encoded))
+            v_time = add_phase_time(p_stats, 'bind', v_time)
+
+        v_messages = oci.streaming.models.PutMessagesDetails(messages=v_data)
+        v_time = add_phase_time(p_stats, 'bind', v_time)
+
+        # Put messages to the stream
+        (v_retry_count, v_chunk_count, v_chunk_success_count, v_chunk_failure_count) = put_messages_with_retry(
+            p_streamclient=p_context['streamclient'],
+            p_stream_id=p_params['topic'],
+            p_messages=v_messages,
+            p_data=v_data,
+            p_max_retries=8
+        )
+        v_time = add_phase_time(p_stats, 'execute', v_time)
+        p_stats['retry_count'] += v_retry_count
+        v_data_count = v_data_count + v_chunk_count
+        v_success_count = v_success_count + v_chunk_success_count
+        v_failure_count = v_failure_count + v_chunk_failure_count
+
+    return v_success_count, v_failure_count, v_data_size, v_encoded_size
+
+
+# ----------------------------------------------------
+# Truncate the target table
+# ----------------------------------------------------
+def run_truncate(p_params, p_context):
+
+    v_tables = get_target_tables(p_params)
+    for v_table in v_tables:
+        v_sql = 'truncate table {}'.format(v_table)
+        p_context['cursor'].execute(v_sql)
+
+    v_result = {
+        'type' : 'init',
+        'scenario' : p_params['scenario'],
+        'table' : ','.join(v_tables),
+        'size' : p_params['size'],
+        'message' : 'table truncated'
+    }
+
+    return v_result
+
+
+# ----------------------------------------------------
+# Get segment statistics and scan of target tables in one database
+# ----------------------------------------------------
+def get_finish_stats(p_params, p_context, p_tables, p_scan):
+
+    v_binds = { 'table_name_{}'.format(i): v_table for i, v_table in enumerate(p_tables) }
+    # LOB segments and LOB index segments of payload columns stored out of row are included and reported separately
+    v_sql = '''
+        select
+          nvl(sum(s.bytes),0) as bytes,
+          nvl(sum(s.blocks),0) as blocks,
+          nvl(sum(case when l.segment_name is not null then s.bytes end),0) as lob_bytes
+        from user_segments s
+        left join (
+          select segment_name from user_lobs where table_name in ({0})
+          union
+          select index_name from user_lobs where table_name in ({0})
+        ) l on l.segment_name = s.segment_name
+        where s.segment_name in ({0})
+          or l.segment_name is not null
+    '''.format(', '.join('upper(:{})'.format(v_bind) for v_bind in v_binds))
+
+    v_stats = dict()
+    for row in p_context['cursor'].execute(v_sql, **v_binds):
+        v_stats['bytes'] = row[0]
+        v_stats['blocks'] = row[1]
+        v_stats['lob_bytes'] = row[2]
+
+    # Full scan of the target tables in parallel, bounded by call timeout
+    if p_scan:
+
+        v_sql = '''
+            select /*+ parallel({1}) */
+              count(distinct run_id) as threads,
+              count(*) as inserts,
+              nvl(min(ts),systimestamp) as start_ts,
+              nvl(max(ts),systimestamp) as end_ts
+            from ({0})
+        '''.format(' union all '.join('select run_id, ts from {}'.format(v_table) for v_table in p_tables), p_params['scanparallel'])
+
+        p_context['connection'].call_timeout = p_params['scantimeout']*1000
+
+        try:
+            for row in p_context['cursor'].execute(v_sql):
+                v_stats['threads'] = row[0]
+                v_stats['inserts'] = row[1]
+                v_stats['start_ts'] = row[2]
+                v_stats['end_ts'] = row[3]
+        except oracledb.DatabaseError as e:
+            g_logger.warning ('Scan of table {0} at {1} failed or exceeded {2} seconds, using counters: {3}'.format(','.join(p_tables), p_params['dbconnect'], p_params['scantimeout'], e))
+
+    return v_stats
+
+
+# ----------------------------------------------------
+# Get final statistics
+# ----------------------------------------------------
+def run_finish(p_params, p_context, p_summary=None):
+
+    # Row statistics are taken from the counters of load processes by default
+    if p_summary != None:
+        v_threads = p_summary['threads']
+        v_inserts = p_summary['total_data_count']
+        v_start_ts = p_summary['load_start_datetime']
+        v_end_ts = p_summary['load_end_datetime']
+    else:
+        v_threads = None
+        v_inserts = None
+        v_start_ts = datetime.datetime.today()
+        v_end_ts = v_start_ts
+
+    v_tables = get_target_tables(p_params)
+    v_scan = p_params['finishstats'] == 'scan' or p_summary == None
+    v_scan_start = time.perf_counter()
+
+    # Segment statistics are cheap and always collected, for all partitions of all target tables in every database
+    v_stats_list = []
+    for v_dbconnect, v_dbconnect_tables in get_target_tables_by_dbconnect(p_params).items():
+
+        # Targets in other databases are queried over their own connection
+        if v_dbconnect == p_params['dbconnect']:
+            v_stats_list.append(get_finish_stats(p_params, p_context, v_dbconnect_tables, v_scan))
+        else:
+            v_params = dict(p_params, dbconnect=v_dbconnect)
+            v_context = connect_oracle(v_params)
+            try:
+                v_stats_list.append(get_finish_stats(v_params, v_context, v_dbconnect_tables, v_scan))
+            finally:
+                close_oracle(v_params, v_context)
+
+    v_bytes = sum(v_stats['bytes'] for v_stats in v_stats_list)
+    v_blocks = sum(v_stats['blocks'] for v_stats in v_stats_list)
+    v_lob_bytes = sum(v_stats['lob_bytes'] for v_stats in v_stats_list)
+
+    v_source = 'counters'
+    v_scan_sec = None
+
+    # Row statistics from the scan are used only if all databases were scanned
+    if v_scan:
+        if all('inserts' in v_stats for v_stats in v_stats_list):
+            v_threads = sum(v_stats['threads'] for v_stats in v_stats_list)
+            v_inserts = sum(v_stats['inserts'] for v_stats in v_stats_list)
+            v_start_ts = min(v_stats['start_ts'] for v_stats in v_stats_list)
+            v_end_ts = max(v_stats['end_ts'] for v_stats in v_stats_list)
+            v_source = 'scan'
+        else:
+            v_source = 'scan_failed'
+        v_scan_sec = round(time.perf_counter()-v_scan_start, 3)
+
+    v_result = {
+       'type' : 'database',
+       'scenario' : p_params['scenario'],
+       'table' : ','.join(v_tables),
+       'size' : p_params['size'],
+       'threads' : v_threads,
+       'start_ts' : v_start_ts.strftime('%Y/%0m/%0d %H:%M:%S,%f'),
+       'end_ts' : v_end_ts.strftime('%Y/%0m/%0d %H:%M:%S,%f'),
+       'inserts' : v_inserts,
+       'bytes' : v_bytes,
+       'lob_bytes' : v_lob_bytes,
+       'blocks' : v_blocks,
+       'source' : v_source,
+       'scan_sec' : v_scan_sec
+    }
+
+    return v_result
+
+
+# ----------------------------------------------------
+# TARGET FUNCTIONS
+# ----------------------------------------------------
+
+# ----------------------------------------------------
+# Get targets as list of (table, partition, dbconnect), missing parts are taken from parameters
+# ----------------------------------------------------
+def get_targets(p_params):
+
+    if p_params['targets'] == None:
+        return [ (p_params['table'], None, p_params['dbconnect']) ]
+
+    v_targets = []
+    for v_target in p_params['targets'].split(','):
+        (v_table_partition, v_separator, v_dbconnect) = v_target.partition('@')
+        (v_table, v_separator, v_partition) = v_table_partition.partition(':')
+        v_targets.append((v_table or p_params['table'], v_partition or None, v_dbconnect or p_params['dbconnect']))
+
+    return v_targets
+
+
+# ----------------------------------------------------
+# Get distinct target tables
+# ----------------------------------------------------
+def get_target_tables(p_params):
+    return list(dict.fromkeys(v_table for (v_table, v_partition, v_dbconnect) in get_targets(p_params)))
+
+
+# ----------------------------------------------------
+# Get distinct target tables grouped by connect string
+# ----------------------------------------------------
+def get_target_tables_by_dbconnect(p_params):
+
+    v_tables = dict()
+    for (v_table, v_partition, v_dbconnect) in get_targets(p_params):
+        v_tables.setdefault(v_dbconnect, [])
+        if v_table not in v_tables[v_dbconnect]:
+            v_tables[v_dbconnect].append(v_table)
+
+    return v_tables
+
+
+# ----------------------------------------------------
+# Assign target to load process round robin by its index across all agents
+# ----------------------------------------------------
+def set_worker_target(p_params):
+
+    v_targets = get_targets(p_params)
+    (v_worker, v_worker_count) = get_worker_index(p_params)
+    set_target(p_params, v_targets[(v_worker-1) % len(v_targets)])
+
+
+# ----------------------------------------------------
+# Assign target to reader round robin by its index across all agents, the same way as load processes
+# ----------------------------------------------------
+def set_reader_target(p_params):
+
+    v_targets = get_targets(p_params)
+    v_reader = p_params['reader'] if p_params['agent'] == None else (p_params['agent']-1)*p_params['readers'] + p_params['reader']
+    set_target(p_params, v_targets[(v_reader-1) % len(v_targets)])
+
+
+# ----------------------------------------------------
+# Set table, partition and connect string of target to parameters of load process or reader
+# ----------------------------------------------------
+def set_target(p_params, p_target):
+
+    (v_table, v_partition, v_dbconnect) = p_target
+
+    p_params['table'] = v_table
+    p_params['partition'] = v_partition
+    p_params['dbconnect'] = v_dbconnect
+    p_params['target'] = '{}{}{}'.format(v_table, ':'+v_partition if v_partition != None else '', '@'+v_dbconnect if v_dbconnect != None else '')
+
+
+# ----------------------------------------------------
+# Get target table with partition extension for insert statements
+# ----------------------------------------------------
+def get_target_table(p_params):
+
+    if p_params['partition'] != None:
+        return '{} partition ({})'.format(p_params['table'], p_params['partition'])
+    return p_params['table']
+
+
+# ----------------------------------------------------
+# Add throughput of load process or of summary result to throughput per target
+# ----------------------------------------------------
+def add_targets_to_sum(p_result_sum, p_result):
+
+    if 'target' in p_result:
+        v_targets = { p_result['target']: {
+            'threads' : 1,
+            'elapsed_sec_total' : p_result['elapsed_sec_total'],
+            'total_data_count' : p_result['total_data_count'],
+            'total_failure_count' : p_result['total_failure_count'],
+            'total_data_size' : p_result['total_data_size']
+        } }
+    else:
+        v_targets = p_result['targets']
+
+    for v_target, v_target_result in v_targets.items():
+        if v_target not in p_result_sum['targets']:
+            p_result_sum['targets'][v_target] = copy.deepcopy(v_target_result)
+        else:
+            v_target_sum = p_result_sum['targets'][v_target]
+            v_target_sum['threads'] = v_target_sum['threads'] + v_target_result['threads']
+            v_target_sum['elapsed_sec_total'] = max(v_target_sum['elapsed_sec_total'], v_target_result['elapsed_sec_total'])
+            v_target_sum['total_data_count'] = v_target_sum['total_data_count'] + v_target_result['total_data_count']
+            v_target_sum['total_failure_count'] = v_target_sum['total_failure_count'] + v_target_result['total_failure_count']
+            v_target_sum['total_data_size'] = v_target_sum['total_data_size'] + v_target_result['total_data_size']
+
+
+# ----------------------------------------------------
+# READER FUNCTIONS
+# ----------------------------------------------------
+
+# Query templates executed by readers against the target table during the load
+g_query_templates = {
+    'count_by_period': {
+        'sql': '''
+            select json_value(payload, '$.period_code') as period_code, count(*) as journal_lines
+            from {0}
+            where ts >= systimestamp - numtodsinterval(:window, 'SECOND')
+            group by json_value(payload, '$.period_code')
+        ''',
+        'binds': ('window',)
+    },
+    'latest_rows': {
+        'sql': 'select id, run_id, ts, payload from {0} order by ts desc fetch first :rows rows only',
+        'binds': ('rows',)
+    },
+    'point_lookup': {
+        'sql': 'select id, run_id, ts, payload from {0} where id = :id',
+        'binds': ('id',)
+    },
+    'run_summary': {
+        'sql': '''
+            select run_id, count(*) as journal_lines, max(ts) as last_ts
+            from {0}
+            where ts >= systimestamp - numtodsinterval(:window, 'SECOND')
+            group by run_id
+        ''',
+        'binds': ('window',)
+    }
+}
+
+
+# ----------------------------------------------------
+# Get sample of recently inserted ids for point lookups
+# ----------------------------------------------------
+def get_reader_ids(p_params, p_context):
+
+    v_sql = 'select id from {} where ts >= systimestamp - numtodsinterval(:window, \'SECOND\') fetch first 100 rows only'.format(get_target_table(p_params))
+    return [ row[0] for row in p_context['cursor'].execute(v_sql, window=p_params['readerwindow']) ]
+
+
+# ----------------------------------------------------
+# Run one reader query and return number of fetched rows
+# ----------------------------------------------------
+def run_query(p_params, p_context, p_query_name, p_ids):
+
+    v_template = g_query_templates[p_query_name]
+    v_values = {
+        'window': p_params['readerwindow'],
+        'rows': p_params['readerrows'],
+        'id': random.choice(p_ids) if len(p_ids) > 0 else str(uuid.uuid4())
+    }
+    v_binds = { v_name: v_values[v_name] for v_name in v_template['binds'] }
+
+    p_context['cursor'].execute(v_template['sql'].format(get_target_table(p_params)), v_binds)
+    return len(p_context['cursor'].fetchall())
+
+
+# ----------------------------------------------------
+# DATABASE STATISTICS FUNCTIONS
+# ----------------------------------------------------
+
+# Statistics from v$sysstat and v$mystat included in dbstats snapshots
+g_dbstats_statistics = (
+    'user commits',
+    'user calls',
+    'execute count',
+    'DB time',
+    'CPU used by this session',
+    'session logical reads',
+    'db block changes',
+    'physical writes',
+    'redo size',
+    'redo entries',
+    'redo synch writes',
+    'redo synch time',
+    'redo log space requests',
+    'bytes sent via SQL*Net to client',
+    'bytes received via SQL*Net from client',
+    'SQL*Net roundtrips to/from client'
+)
+
+# Number of top wait events reported in dbstats record
+g_dbstats_top_events = 10
+
+
+# ----------------------------------------------------
+# Get snapshot of system or session statistics and wait events
+# ----------------------------------------------------
+def get_dbstats_snapshot(p_context, p_session):
+
+    v_binds = { 'name{}'.format(i): v_name for i, v_name in enumerate(g_dbstats_statistics) }
+    v_names = ','.join(':{}'.format(v_bind) for v_bind in v_binds)
+
+    if p_session:
+        v_statistics_sql = '''
+            select n.name, s.value
+            from v$mystat s join v$statname n on n.statistic# = s.statistic#
+            where n.name in ({0})
+        '''.format(v_names)
+        v_events_sql = '''
+            select event, wait_class, total_waits, time_waited_micro
+            from v$session_event
+            where sid = sys_context('userenv', 'sid') and wait_class <> 'Idle'
+        '''
+    else:
+        v_statistics_sql = 'select name, value from v$sysstat where name in ({0})'.format(v_names)
+        v_events_sql = '''
+            select event, wait_class, total_waits, time_waited_micro
+            from v$system_event
+            where wait_class <> 'Idle'
+        '''
+
+    v_snapshot = {
+        'timestamp': datetime.datetime.today(),
+        'statistics': dict(),
+        'events': dict()
+    }
+
+    for row in p_context['cursor'].execute(v_statistics_sql, v_binds):
+        v_snapshot['statistics'][row[0]] = row[1]
+
+    for row in p_context['cursor'].execute(v_events_sql):
+        v_snapshot['events'][row[0]] = {
+            'wait_class': row[1],
+            'total_waits': row[2],
+            'time_waited_micro': row[3]
+        }
+
+    return v_snapshot
+
+
+# ----------------------------------------------------
+# Get difference between two snapshots
+# ----------------------------------------------------
+def get_dbstats_delta(p_start, p_end):
+
+    v_delta = {
+        'elapsed_sec': (p_end['timestamp']-p_start['timestamp']).total_seconds(),
+        'statistics': dict(),
+        'events': dict()
+    }
+
+    for v_name, v_value in p_end['statistics'].items():
+        v_delta['statistics'][v_name] = v_value - p_start['statistics'].get(v_name, 0)
+
+    for v_event, v_end_event in p_end['events'].items():
+        v_start_event = p_start['events'].get(v_event, {'total_waits': 0, 'time_waited_micro': 0})
+        v_total_waits = v_end_event['total_waits'] - v_start_event['total_waits']
+        if v_total_waits > 0:
+            v_delta['events'][v_event] = {
+                'wait_class': v_end_event['wait_class'],
+                'total_waits': v_total_waits,
+                'time_waited_micro': v_end_event['time_waited_micro'] - v_start_event['time_waited_micro']
+            }
+
+    return v_delta
+
+
+# ----------------------------------------------------
+# Merge source delta into target delta
+# ----------------------------------------------------
+def merge_dbstats_delta(p_target, p_source):
+
+    p_target['elapsed_sec'] = max(p_target['elapsed_sec'], p_source['elapsed_sec'])
+
+    for v_name, v_value in p_source['statistics'].items():
+        p_target['statistics'][v_name] = p_target['statistics'].get(v_name, 0) + v_value
+
+    for v_event, v_source_event in p_source['events'].items():
+        if v_event in p_target['events']:
+            p_target['events'][v_event]['total_waits'] = p_target['events'][v_event]['total_waits'] + v_source_event['total_waits']
+            p_target['events'][v_event]['time_waited_micro'] = p_target['events'][v_event]['time_waited_micro'] + v_source_event['time_waited_micro']
+        else:
+            p_target['events'][v_event] = copy.deepcopy(v_source_event)
+
+    return p_target
+
+
+# ----------------------------------------------------
+# Get report of statistics with rates and top wait events from delta
+# ----------------------------------------------------
+def get_dbstats_report(p_delta):
+
+    v_elapsed_sec = p_delta['elapsed_sec']
+    v_report = {
+        'elapsed_sec': v_elapsed_sec,
+        'statistics': dict(),
+        'top_events': []
+    }
+
+    for v_name, v_value in p_delta['statistics'].items():
+        v_report['statistics'][v_name] = {
+            'delta': v_value,
+            'per_sec': round(v_value/v_elapsed_sec, 2) if v_elapsed_sec > 0 else None
+        }
+
+    v_events = sorted(p_delta['events'].items(), key=lambda v_item: v_item[1]['time_waited_micro'], reverse=True)
+    for v_event, v_delta_event in v_events[0:g_dbstats_top_events]:
+        v_report['top_events'].append({
+            'event': v_event,
+            'wait_class': v_delta_event['wait_class'],
+            'total_waits': v_delta_event['total_waits'],
+            'time_waited_sec': round(v_delta_event['time_waited_micro']/1000000, 3),
+            'avg_wait_ms': round(v_delta_event['time_waited_micro']/v_delta_event['total_waits']/1000, 3)
+        })
+
+    return v_report
+
+
+# ----------------------------------------------------
+# Add delta of session statistics since the start snapshot to the deltas of previous sessions of the thread
+# ----------------------------------------------------
+def add_session_dbstats(p_context):
+
+    v_start = p_context.pop('dbstats_start')
+    v_delta = get_dbstats_delta(v_start, get_dbstats_snapshot(p_context, p_session=True))
+
+    # Sessions of the thread follow each other, so their elapsed times add up
+    if 'session_dbstats' in p_context:
+        v_elapsed_sec = p_context['session_dbstats']['elapsed_sec'] + v_delta['elapsed_sec']
+        v_delta = merge_dbstats_delta(p_context['session_dbstats'], v_delta)
+        v_delta['elapsed_sec'] = v_elapsed_sec
+
+    p_context['session_dbstats'] = v_delta
+
+
+# ----------------------------------------------------
+# Snapshot system statistics as init or finish task
+# ----------------------------------------------------
+def run_dbstats_snapshot(p_params, p_context, p_summary=None):
+    return get_dbstats_snapshot(p_context, p_session=False)
+
+
+# ----------------------------------------------------
+# Create dbstats record from system snapshots and session deltas of the run
+# ----------------------------------------------------
+def get_dbstats_result(p_params, p_start, p_end, p_result_sum):
+
+    v_result = {
+        'type' : 'dbstats',
+        'scenario' : p_params['scenario'],
+        'table' : p_params['table'],
+        'size' : p_params['size'],
+        'threads' : p_params['threads'],
+        'run_id' : p_result_sum['run_id'],
+        'system' : get_dbstats_report(get_dbstats_delta(p_start, p_end)),
+        'session' : get_dbstats_report(p_result_sum['session_dbstats']) if 'session_dbstats' in p_result_sum else None
+    }
+
+    return v_result
+
+
+# ----------------------------------------------------
+# FAST INGEST FUNCTIONS
+# ----------------------------------------------------
+
+# Interval in seconds of polling of apply high water mark while fast ingest data drain to the table
+g_fast_drain_poll_sec = 0.1
+
+# Usage of memoptimize write area in large pool, summed over containers
+g_write_area_sql = '''
+    select
+      nvl(sum(total_size),0) as total_size,
+      nvl(sum(used_space),0) as used_space,
+      nvl(sum(num_writes),0) as num_writes,
+      nvl(sum(num_writers),0) as num_writers
+    from v$memoptimize_write_area
+'''
+
+# Fast ingest statistics of the instance, such as rows written and flushed
+g_write_area_statistics_sql = "select name, value from v$sysstat where name like 'memopt w%'"
+
+
+# ----------------------------------------------------
+# Flush fast ingest data of the session from large pool to the table
+# ----------------------------------------------------
+def flush_fast_ingest(p_context, p_stats):
 
-    # Create array of messages for streaming
-    for v_data_line in v_data_array:
+    v_time = time.perf_counter()
+    p_context['cursor'].execute('begin dbms_memoptimize.write_end; end;')
+    p_stats['flush_count'] = p_stats['flush_count']+1
+    p_context['flush_time'] = add_phase_time(p_stats, 'flush', v_time)
 
-        v_value = {
-            'uuid': str(uuid.uuid4()),
-            'run_id': p_run_id,
-            'scenario': p_params['scenario'],
-            'timestamp': v_timestamp.isoformat(),
-            'data': v_data_line
-        }
 
-        v_value_string = json.dumps(v_value)
-        v_key_string = v_data_line['journal_external_reference']
-        v_value_encoded = b64encode(v_value_string.encode()).decode()
-        v_key_encoded = b64encode(v_key_string.encode()).decode()
-        v_data_size = v_data_size + (len(v_value_string)+len(v_key_string))
-        v_encoded_size = v_encoded_size + (len(v_value_encoded)+len(v_key_encoded))
+# ----------------------------------------------------
+# Flush fast ingest data of the session and wait until they are applied to the table, return drain seconds
+# ----------------------------------------------------
+def drain_fast_ingest(p_params, p_context):
 
-        v_data.append(oci.streaming.models.PutMessagesDetailsEntry(key=v_key_encoded, value=v_value_encoded))
-        v_data_count = v_data_count+1
+    v_start = time.perf_counter()
+    v_apply_seqid = p_context['cursor'].var(int)
+    v_write_seqid = p_context['cursor'].var(int)
+    v_sql = 'begin :apply_seqid := dbms_memoptimize.get_apply_hwm_seqid; :write_seqid := dbms_memoptimize.get_write_hwm_seqid; end;'
 
-    v_messages = oci.streaming.models.PutMessagesDetails(messages=v_data)
+    # Data written by the session to large pool are applied once the apply high water mark reaches the write one
+    p_context['cursor'].execute(v_sql, apply_seqid=v_apply_seqid, write_seqid=v_write_seqid)
+    v_session_seqid = v_write_seqid.getvalue()
+    p_context['cursor'].execute('begin dbms_memoptimize.write_end; end;')
 
-    # Put messages to the stream
-    (v_retry_count, v_data_count, v_success_count, v_failure_count) = put_messages_with_retry(
-        p_streamclient=p_context['streamclient'],
-        p_stream_id=p_params['topic'],
-        p_messages=v_messages,
-        p_data=v_data,
-        p_max_retries=8
-    )
+    while v_session_seqid != None:
+        p_context['cursor'].execute(v_sql, apply_seqid=v_apply_seqid, write_seqid=v_write_seqid)
+        if v_apply_seqid.getvalue() != None and v_apply_seqid.getvalue() >= v_session_seqid:
+            break
+        if time.perf_counter()-v_start > p_params['fastdrain']:
+            g_logger.warning ('Fast ingest data of thread {0} not applied within {1} seconds'.format(p_params['thread'], p_params['fastdrain']))
+            break
+        time.sleep(g_fast_drain_poll_sec)
 
-    return v_success_count, v_failure_count, v_data_size, v_encoded_size
+    return round(time.perf_counter()-v_start, 3)
 
 
 # ----------------------------------------------------
-# Truncate the target table
+# Get sample of memoptimize write area usage and fast ingest statistics
 # ----------------------------------------------------
-def run_truncate(p_params, p_context):
+def get_write_area_sample(p_context):
 
-    v_sql = 'truncate table {}'.format(p_params["table"])
-    p_context['cursor'].execute(v_sql)
+    v_sample = dict()
+    for row in p_context['cursor'].execute(g_write_area_sql):
+        v_sample['total_mb'] = round(row[0]/1024/1024, 2)
+        v_sample['used_mb'] = round(row[1]/1024/1024, 2)
+        v_sample['used_pct'] = round(row[1]/row[0]*100, 2) if row[0] > 0 else None
+        v_sample['writes'] = row[2]
+        v_sample['writers'] = row[3]
 
-    v_result = {
-        'type' : 'init',
-        'scenario' : p_params['scenario'],
-        'table' : p_params['table'],
-        'size' : p_params['size'],
-        'message' : 'table truncated'
-    }
+    v_sample['statistics'] = { row[0]: row[1] for row in p_context['cursor'].execute(g_write_area_statistics_sql) }
 
-    return v_result
+    return v_sample
 
 
 # ----------------------------------------------------
-# Get final statistics
+# Monitor memoptimize write area during the load and until it drains after the load
+# - prints sample records with statistics deltas and returns summary of the samples
 # ----------------------------------------------------
-def run_finish(p_params, p_context):
+def run_write_area_monitor(p_params, fn_connect, fn_close):
+
+    v_run_id = datetime.datetime.today().strftime('%Y%0m%0d_%H%M%S') + '_'+str(os.getpid())
+    v_start = time.perf_counter()
+    v_load_end = v_start + p_params['duration']
+
+    try:
+        v_context = fn_connect(p_params=p_params)
+        v_first = get_write_area_sample(v_context)
+    except oracledb.DatabaseError as e:
+        g_logger.warning ('Cannot monitor memoptimize write area, check privileges on v$memoptimize_write_area and v$sysstat: {0}'.format(e))
+        return None
+
+    v_previous = v_first
+    v_summary = {
+        'samples': 0,
+        'total_mb': v_first['total_mb'],
+        'max_used_mb': v_first['used_mb'],
+        'max_used_pct': v_first['used_pct'],
+        'max_writers': v_first['writers'],
+        'drain_sec': None
+    }
+
+    # Sample until the end of the load, then until the used space returns to the level before the load
+    while True:
+        time.sleep(p_params['fastsample'])
+        v_now = time.perf_counter()
+        try:
+            v_sample = get_write_area_sample(v_context)
+        except oracledb.DatabaseError as e:
+            g_logger.warning ('Sampling of memoptimize write area failed: {0}'.format(e))
+            break
+
+        v_summary['samples'] = v_summary['samples']+1
+        v_summary['max_used_mb'] = max(v_summary['max_used_mb'], v_sample['used_mb'])
+        v_summary['max_used_pct'] = max(v_summary['max_used_pct'] or 0, v_sample['used_pct'] or 0)
+        v_summary['max_writers'] = max(v_summary['max_writers'], v_sample['writers'])
 
-    v_sql = '''
-        with
-          table_stats as (
-            select
-              count(distinct run_id) as threads,
-              count(*) as inserts,
-              nvl(min(ts),systimestamp) as start_ts,
-              nvl(max(ts),systimestamp) as end_ts
-            from {0}
-          ),
-          segment_stats as (
-            select
-              sum(bytes) as bytes,
-              sum(blocks) as blocks
-            from user_segments
-            where segment_name = upper(\'{0}\')
-          )
-        select
-          threads,
-          inserts,
-          bytes,
-          blocks,
-          start_ts,
-          end_ts
-        from table_stats, segment_stats
-    '''.format(p_params["table"])
-
-    for row in p_context['cursor'].execute(v_sql):
         v_result = {
-           'type' : 'database',
-           'scenario' : p_params['scenario'],
-           'table' : p_params['table'],
-           'size' : p_params['size'],
-           'threads' : row[0],
-           'start_ts' : row[4].strftime('%Y/%0m/%0d %H:%M:%S,%f'),
-           'end_ts' : row[5].strftime('%Y/%0m/%0d %H:%M:%S,%f'),
-           'inserts' : row[1],
-           'bytes' : row[2],
-           'blocks' : row[3]
+            'type': 'write_area',
+            'run_id': v_run_id,
+            'elapsed_sec': round(v_now-v_start, 3),
+            'phase': 'load' if v_now < v_load_end else 'drain'
         }
+        v_result.update(v_sample)
+        v_result['statistics'] = { v_name: v_value - v_previous['statistics'].get(v_name, 0) for v_name, v_value in v_sample['statistics'].items() }
+        print_result(v_result)
+        v_previous = v_sample
 
-    return v_result
+        if v_now >= v_load_end and v_sample['used_mb'] <= v_first['used_mb']:
+            v_summary['drain_sec'] = round(max(v_now-v_load_end, 0), 3)
+            break
+        if v_now >= v_load_end + p_params['fastdrain']:
+            g_logger.warning ('Memoptimize write area not drained within {0} seconds after the load'.format(p_params['fastdrain']))
+            break
+
+    v_summary['statistics'] = { v_name: v_value - v_first['statistics'].get(v_name, 0) for v_name, v_value in v_previous['statistics'].items() }
+
+    fn_close(p_params=p_params, p_context=v_context)
+
+    return v_summary
 
 
 # ----------------------------------------------------
@@ -781,6 +3071,10 @@ def run_finish(p_params, p_context):
 # ----------------------------------------------------
 def close_oracle(p_params, p_context):
 
+    if 'dbstats_start' in p_context:
+        add_session_dbstats(p_context)
+    if 'lobs' in p_context:
+        free_payload_lobs(p_context)
     p_context['cursor'].close()
     return
 
@@ -790,8 +3084,12 @@ def close_oracle(p_params, p_context):
 # ----------------------------------------------------
 def close_oracle_fast(p_params, p_context):
 
-    v_sql = 'begin dbms_memoptimize.write_end; end;'
-    p_context['cursor'].execute(v_sql)
+    # Drain time is reported separately from the load time
+    p_context['drain_sec'] = drain_fast_ingest(p_params, p_context)
+
+    # Session statistics include the work of write_end
+    if 'dbstats_start' in p_context:
+        add_session_dbstats(p_context)
     p_context['cursor'].close()
     return
 
@@ -805,6 +3103,365 @@ def close_streaming(p_params, p_context):
     return
 
 
+# ----------------------------------------------------
+# Close simulated database
+# ----------------------------------------------------
+def close_simulated(p_params, p_context):
+
+    time.sleep(get_simulated_latency(p_context['random'], p_params['simrtt']/1000, p_params['simdist']))
+    return
+
+
+# ----------------------------------------------------
+# METRICS FUNCTIONS
+# ----------------------------------------------------
+
+# Shared array with metrics of load processes, set in load processes by initialize_worker()
+g_metrics = None
+
+# Shared time when the simulated server becomes free, set in load processes by initialize_worker()
+g_simulated_server = None
+
+# Start and end time of simulated outage of load process, set by connect_simulated()
+g_simulated_outage = None
+
+# Counters of load process in shared array, followed by buckets of iteration latency histogram
+g_metrics_fields = ('rows', 'bytes', 'failures', 'iterations', 'retries', 'reconnects', 'latency_sum', 'heartbeat', 'running')
+g_metrics_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+g_metrics_slot_size = len(g_metrics_fields) + len(g_metrics_buckets)
+
+# Load process is considered alive if it updated metrics within this number of seconds
+g_metrics_heartbeat_sec = 30
+
+
+# ----------------------------------------------------
+# Initialize load process with shared objects
+# ----------------------------------------------------
+def initialize_worker(p_metrics, p_simulated_server):
+
+    global g_metrics
+    global g_simulated_server
+    g_metrics = p_metrics
+    g_simulated_server = p_simulated_server
+
+
+# ----------------------------------------------------
+# Update metrics of load process after iteration
+# ----------------------------------------------------
+def update_metrics(p_params, p_running, p_data_count=0, p_data_size=0, p_failure_count=0, p_retry_count=0, p_iteration_sec=None, p_reconnect_count=0):
+
+    if g_metrics == None:
+        return
+
+    v_offset = (p_params['thread']-1) * g_metrics_slot_size
+    v_fields = { v_field: v_offset+i for i, v_field in enumerate(g_metrics_fields) }
+
+    if p_iteration_sec != None:
+        g_metrics[v_fields['rows']] += p_data_count
+        g_metrics[v_fields['bytes']] += p_data_size
+        g_metrics[v_fields['failures']] += p_failure_count
+        g_metrics[v_fields['iterations']] += 1
+        g_metrics[v_fields['retries']] += p_retry_count
+        g_metrics[v_fields['latency_sum']] += p_iteration_sec
+        for i, v_bound in enumerate(g_metrics_buckets):
+            if p_iteration_sec <= v_bound:
+                g_metrics[v_offset+len(g_metrics_fields)+i] += 1
+                break
+
+    g_metrics[v_fields['reconnects']] += p_reconnect_count
+
+    g_metrics[v_fields['heartbeat']] = time.time()
+    g_metrics[v_fields['running']] = 1 if p_running else 0
+
+
+# ----------------------------------------------------
+# Get counters summed over all load processes and number of running load processes
+# ----------------------------------------------------
+def get_metrics_totals(p_params, p_metrics):
+
+    v_totals = { v_field: 0 for v_field in ('rows', 'bytes', 'failures', 'iterations', 'retries', 'running') }
+    for i in range(p_params['threads']):
+        v_offset = i * g_metrics_slot_size
+        for j, v_field in enumerate(g_metrics_fields):
+            if v_field in v_totals:
+                v_totals[v_field] = v_totals[v_field] + int(p_metrics[v_offset+j])
+
+    return v_totals
+
+
+# ----------------------------------------------------
+# Get metrics of all load processes in Prometheus or OpenMetrics text format
+# ----------------------------------------------------
+def get_metrics_text(p_params, p_metrics, p_openmetrics):
+
+    v_now = time.time()
+    v_lines = []
+    v_counters = (
+        ('rows', 'loadgen_rows', 'Number of rows or messages written'),
+        ('bytes', 'loadgen_bytes', 'Number of bytes written'),
+        ('failures', 'loadgen_failures', 'Number of rows or messages failed'),
+        ('iterations', 'loadgen_iterations', 'Number of completed iterations'),
+        ('retries', 'loadgen_retries', 'Number of retries'),
+        ('reconnects', 'loadgen_reconnects', 'Number of reconnect attempts')
+    )
+
+    v_slots = []
+    for i in range(p_params['threads']):
+        v_offset = i * g_metrics_slot_size
+        v_slot = { v_field: p_metrics[v_offset+j] for j, v_field in enumerate(g_metrics_fields) }
+        v_slot['buckets'] = p_metrics[v_offset+len(g_metrics_fields):v_offset+g_metrics_slot_size]
+        v_slot['labels'] = 'scenario="{}",size="{}",threads="{}",thread="{}"'.format(p_params['scenario'], p_params['size'], p_params['threads'], i+1)
+        v_slots.append(v_slot)
+
+    for v_field, v_name, v_help in v_counters:
+        v_lines.append('# HELP {} {}'.format(v_name if p_openmetrics else v_name+'_total', v_help))
+        v_lines.append('# TYPE {} counter'.format(v_name if p_openmetrics else v_name+'_total'))
+        for v_slot in v_slots:
+            v_lines.append('{}_total{{{}}} {}'.format(v_name, v_slot['labels'], int(v_slot[v_field])))
+
+    v_name = 'loadgen_iteration_duration_seconds'
+    v_lines.append('# HELP {} Duration of load iteration'.format(v_name))
+    v_lines.append('# TYPE {} histogram'.format(v_name))
+    for v_slot in v_slots:
+        v_cumulative_count = 0
+        for v_bound, v_count in zip(g_metrics_buckets, v_slot['buckets']):
+            v_cumulative_count = v_cumulative_count+int(v_count)
+            v_lines.append('{}_bucket{{{},le="{}"}} {}'.format(v_name, v_slot['labels'], '+Inf' if math.isinf(v_bound) else v_bound, v_cumulative_count))
+        v_lines.append('{}_sum{{{}}} {}'.format(v_name, v_slot['labels'], v_slot['latency_sum']))
+        v_lines.append('{}_count{{{}}} {}'.format(v_name, v_slot['labels'], v_cumulative_count))
+
+    v_name = 'loadgen_worker_up'
+    v_lines.append('# HELP {} Load process is running and updated metrics recently'.format(v_name))
+    v_lines.append('# TYPE {} gauge'.format(v_name))
+    for v_slot in v_slots:
+        v_up = 1 if v_slot['running'] == 1 and v_now-v_slot['heartbeat'] <= g_metrics_heartbeat_sec else 0
+        v_lines.append('{}{{{}}} {}'.format(v_name, v_slot['labels'], v_up))
+
+    v_name = 'loadgen_worker_heartbeat_timestamp_seconds'
+    v_lines.append('# HELP {} Time of last metrics update by load process'.format(v_name))
+    v_lines.append('# TYPE {} gauge'.format(v_name))
+    for v_slot in v_slots:
+        v_lines.append('{}{{{}}} {}'.format(v_name, v_slot['labels'], v_slot['heartbeat']))
+
+    if p_openmetrics:
+        v_lines.append('# EOF')
+
+    return '\n'.join(v_lines)+'\n'
+
+
+# ----------------------------------------------------
+# Start HTTP server with metrics endpoint in background thread
+# ----------------------------------------------------
+def start_metrics_server(p_params, p_metrics):
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            v_openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+            v_body = get_metrics_text(p_params, p_metrics, v_openmetrics).encode()
+            self.send_response(200)
+            if v_openmetrics:
+                self.send_header('Content-Type', 'application/openmetrics-text; version=1.0.0; charset=utf-8')
+            else:
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(v_body)))
+            self.end_headers()
+            self.wfile.write(v_body)
+
+        def log_message(self, format, *args):
+            g_logger.debug ('Metrics request: {0}'.format(format % args))
+
+    v_server = ThreadingHTTPServer(('', p_params['metricsport']), MetricsHandler)
+    v_thread = threading.Thread(target=v_server.serve_forever, daemon=True)
+    v_thread.start()
+    g_logger.info ('Metrics endpoint listening on port {0}'.format(p_params['metricsport']))
+
+    return v_server
+
+
+# ----------------------------------------------------
+# PROFILE FUNCTIONS
+# ----------------------------------------------------
+
+# ----------------------------------------------------
+# Get readable name of profiled function
+# ----------------------------------------------------
+def get_profile_function_name(p_function):
+
+    (v_file, v_line, v_name) = p_function
+    if v_file == '~':
+        return v_name
+    return '{}:{}({})'.format(os.path.basename(v_file), v_line, v_name)
+
+
+# ----------------------------------------------------
+# Stop profiler and save profile of load process
+# ----------------------------------------------------
+def save_profile(p_params, p_profiler, p_run_id):
+
+    p_profiler.disable()
+    os.makedirs(p_params['profiledir'], exist_ok=True)
+    v_profile_file = os.path.join(p_params['profiledir'], '{}_{}.prof'.format(p_run_id, p_params['thread']))
+    p_profiler.dump_stats(v_profile_file)
+
+    return v_profile_file
+
+
+# ----------------------------------------------------
+# Merge profiles of load processes and create profile record with hot functions
+# ----------------------------------------------------
+def get_profile_result(p_params, p_result_array):
+
+    v_profile_files = [ v_result['profile_file'] for v_result in p_result_array if v_result['type'] == 'detail' and v_result.get('profile_file') != None ]
+    if len(v_profile_files) == 0:
+        return None
+
+    v_run_id = next(v_result['run_id'] for v_result in p_result_array if v_result['type'] == 'sum')
+    v_merged_file = os.path.join(p_params['profiledir'], '{}_merged.prof'.format(v_run_id))
+    v_collapsed_file = os.path.join(p_params['profiledir'], '{}_merged.collapsed'.format(v_run_id))
+
+    # Merge profiles into single pstats file
+    v_stats = pstats.Stats(*v_profile_files)
+    v_stats.dump_stats(v_merged_file)
+
+    # Write caller;callee pairs weighted by own time in microseconds, usable by flame graph tools
+    with open(v_collapsed_file, 'w') as v_file:
+        for v_function, (v_cc, v_nc, v_tt, v_ct, v_callers) in v_stats.stats.items():
+            v_function_name = get_profile_function_name(v_function).replace(';', ':')
+            if len(v_callers) == 0:
+                v_file.write('{} {}\n'.format(v_function_name, round(v_tt*1000000)))
+            for v_caller, v_caller_stats in v_callers.items():
+                v_file.write('{};{} {}\n'.format(get_profile_function_name(v_caller).replace(';', ':'), v_function_name, round(v_caller_stats[2]*1000000)))
+
+    # Hot functions by own time
+    v_functions = sorted(v_stats.stats.items(), key=lambda v_item: v_item[1][2], reverse=True)
+    v_hot_functions = []
+    for v_function, (v_cc, v_nc, v_tt, v_ct, v_callers) in v_functions[0:p_params['profiletop']]:
+        v_hot_functions.append({
+            'function': get_profile_function_name(v_function),
+            'ncalls': v_nc,
+            'tottime_sec': round(v_tt, 3),
+            'cumtime_sec': round(v_ct, 3),
+            'tottime_pct': round(v_tt/v_stats.total_tt*100, 2) if v_stats.total_tt > 0 else None
+        })
+
+    v_result = {
+        'type' : 'profile',
+        'scenario' : p_params['scenario'],
+        'size' : p_params['size'],
+        'threads' : p_params['threads'],
+        'run_id' : v_run_id,
+        'profile_seconds' : p_params['profile'],
+        'profile_files' : len(v_profile_files),
+        'merged_file' : v_merged_file,
+        'collapsed_file' : v_collapsed_file,
+        'total_sec' : round(v_stats.total_tt, 3),
+        'hot_functions' : v_hot_functions
+    }
+
+    return v_result
+
+
+# ----------------------------------------------------
+# RECOVERY FUNCTIONS
+# ----------------------------------------------------
+
+# Errors meaning the connection or the session is lost
+g_connection_error_codes = (
+    'ORA-00028', 'ORA-01012', 'ORA-01033', 'ORA-01034', 'ORA-01089', 'ORA-01092', 'ORA-03113',
+    'ORA-03114', 'ORA-03135', 'ORA-12170', 'ORA-12514', 'ORA-12528', 'ORA-12537', 'ORA-12541',
+    'ORA-12547', 'ORA-25408', 'DPI-1010', 'DPI-1080', 'DPY-1001', 'DPY-4011'
+)
+
+# Base of exponential backoff between reconnect attempts
+g_reconnect_base_sec = 0.5
+
+
+# ----------------------------------------------------
+# Check if exception means the connection is lost
+# ----------------------------------------------------
+def is_connection_error(p_exception):
+
+    if isinstance(p_exception, (ConnectionError, oci.exceptions.RequestException, oci.exceptions.ConnectTimeout)):
+        return True
+
+    if isinstance(p_exception, oracledb.Error) and len(p_exception.args) > 0:
+        v_error = p_exception.args[0]
+        return getattr(v_error, 'isrecoverable', False) or getattr(v_error, 'full_code', None) in g_connection_error_codes
+
+    return False
+
+
+# ----------------------------------------------------
+# Execute insert of single row, return False if the row failed with row level error
+# ----------------------------------------------------
+def execute_row(p_context, p_sql, **p_binds):
+
+    try:
+        p_context['cursor'].execute(p_sql, **p_binds)
+    except oracledb.DatabaseError as e:
+        if is_connection_error(e):
+            raise
+        g_logger.debug ('Insert of row failed: {0}'.format(e))
+        return False
+
+    return True
+
+
+# ----------------------------------------------------
+# Get number of rows failed in last executemany() with batch errors
+# ----------------------------------------------------
+def get_batch_error_count(p_cursor):
+
+    v_errors = p_cursor.getbatcherrors()
+    if len(v_errors) > 0:
+        g_logger.debug ('Insert of {0} rows failed, first error at offset {1}: {2}'.format(len(v_errors), v_errors[0].offset, v_errors[0].message))
+
+    return len(v_errors)
+
+
+# ----------------------------------------------------
+# Close lost connection and connect again with exponential backoff until connected or deadline
+# - returns number of attempts and whether connected
+# ----------------------------------------------------
+def reconnect_worker(p_params, p_context, fn_connect, fn_close, p_deadline):
+
+    # Closing lost connection is expected to fail
+    if fn_close != None:
+        try:
+            fn_close(
+                p_params=p_params,
+                p_context=p_context
+            )
+        except Exception as e:
+            g_logger.debug ('Close of lost connection failed: {0}'.format(e))
+
+    if fn_connect == None:
+        return 0, True
+
+    v_attempt_count = 0
+    while time.time() < p_deadline:
+
+        v_backoff = min(g_reconnect_base_sec * (2 ** v_attempt_count), p_params['reconnectmax'])
+        time.sleep(min((v_backoff / 2.0) + random.uniform(0, v_backoff / 2.0), max(p_deadline-time.time(), 0)))
+        v_attempt_count = v_attempt_count+1
+
+        try:
+            # Data source and identifier state of the context are kept
+            p_context.update(fn_connect(
+                p_params=p_params
+            ))
+            g_logger.info ('Thread {0} reconnected after {1} attempts'.format(p_params['thread'], v_attempt_count))
+            return v_attempt_count, True
+        except Exception as e:
+            g_logger.warning ('Reconnect attempt {0} of thread {1} failed: {2}'.format(v_attempt_count, p_params['thread'], e))
+
+    return v_attempt_count, False
+
+
 # ----------------------------------------------------
 # TASK FUNCTIONS
 # ----------------------------------------------------
@@ -820,11 +3477,28 @@ def run_one_thread(p_params, fn_connect, fn_run, fn_close):
     v_timestamp['start'] = datetime.datetime.today()
     v_run_id = v_timestamp['start'].strftime('%Y%0m%0d_%H%M%S') + '_'+str(os.getpid())
 
+    # Pin load process before it connects, so that the driver threads inherit the affinity
+    v_cpus = None
+    if p_params['pin'] != 'none':
+        v_cpus = set_worker_affinity(p_params)
+    v_usage_start = get_process_usage()
+
     # Initialize connection
     if fn_connect != None:
         v_context = fn_connect(
             p_params=p_params
         )
+
+    # Snapshot statistics of load session only
+    if p_params['dbstats']:
+        v_context['dbstats_start'] = get_dbstats_snapshot(v_context, p_session=True)
+
+    # Initialize data source
+    if p_params['seed'] != None:
+        random.seed(p_params['seed'] + get_worker_index(p_params)[0])
+        set_generator_clock(p_params)
+    if p_params['replay'] != None:
+        v_context['replay'] = open_replay(p_params)
     
     # Iterate until the time is exceeded
     v_total_iteration_count = 0
@@ -832,16 +3506,90 @@ def run_one_thread(p_params, fn_connect, fn_run, fn_close):
     v_total_failure_count = 0
     v_total_data_size = 0
     v_total_encoded_size = 0
+    v_solo_end = v_timestamp['start'] + datetime.timedelta(seconds=p_params['readerdelay'])
+    v_windows = {
+        'solo': { 'data_count': 0, 'start': None, 'end': None },
+        'mixed': { 'data_count': 0, 'start': None, 'end': None }
+    }
+    v_stats = {
+        'phase_sec': { v_phase: 0.0 for v_phase in g_phases },
+        'retry_count': 0,
+        'flush_count': 0,
+        'latency_histogram': dict()
+    }
+    update_metrics(p_params, p_running=True)
+
+    # Start profiler for the profiling window
+    v_profiler = None
+    v_profile_file = None
+    if p_params['profile'] > 0:
+        v_profiler = cProfile.Profile()
+        v_profiler.enable()
     
+    # Outages of the connection
+    v_recovery = {
+        'failed_iteration_count': 0,
+        'outage_count': 0,
+        'reconnect_count': 0,
+        'downtime_sec': 0.0,
+        'max_downtime_sec': 0.0
+    }
+    v_outage_start = None
+    v_recovered_start = None
+    v_recovered_data_count = 0
+    v_deadline = time.time() + p_params['duration']
+    v_connected = True
+
     while (datetime.datetime.today()-v_timestamp['start']).total_seconds() <= p_params['duration']:
     
         # Generate and insert data
-        (v_data_count, v_failure_count, v_data_size, v_encoded_size) = fn_run(
-            p_params=p_params,
-            p_context=v_context,
-            p_scenario_name='{}-{}-{}'.format(p_params['scenario'], p_params['size'], p_params['threads']),
-            p_run_id=v_run_id
-        )
+        v_iteration_start = time.perf_counter()
+        v_iteration_begin = datetime.datetime.today()
+        v_retry_count = v_stats['retry_count']
+        try:
+            (v_data_count, v_failure_count, v_data_size, v_encoded_size) = fn_run(
+                p_params=p_params,
+                p_context=v_context,
+                p_scenario_name='{}-{}-{}'.format(p_params['scenario'], p_params['size'], p_params['threads']),
+                p_run_id=v_run_id,
+                p_stats=v_stats
+            )
+        except Exception as e:
+            if not p_params['reconnect']:
+                raise
+
+            # Failed iteration starts an outage lasting until the next successful iteration
+            g_logger.warning ('Iteration of thread {0} failed: {1}'.format(p_params['thread'], e))
+            v_recovery['failed_iteration_count'] = v_recovery['failed_iteration_count']+1
+            if v_outage_start == None:
+                v_outage_start = v_iteration_start
+                v_recovery['outage_count'] = v_recovery['outage_count']+1
+
+            # Keep statistics of the failed session if it still responds
+            if 'dbstats_start' in v_context:
+                try:
+                    add_session_dbstats(v_context)
+                except Exception as e:
+                    g_logger.warning ('Session statistics of thread {0} since the last connect are lost: {1}'.format(p_params['thread'], e))
+
+            (v_attempt_count, v_connected) = reconnect_worker(p_params, v_context, fn_connect, fn_close, v_deadline)
+            v_recovery['reconnect_count'] = v_recovery['reconnect_count'] + v_attempt_count
+            update_metrics(p_params, True, p_reconnect_count=v_attempt_count)
+            if not v_connected:
+                break
+            if p_params['dbstats']:
+                v_context['dbstats_start'] = get_dbstats_snapshot(v_context, p_session=True)
+            continue
+
+        # End of outage
+        if v_outage_start != None:
+            v_downtime_sec = time.perf_counter() - v_outage_start
+            v_recovery['downtime_sec'] = v_recovery['downtime_sec'] + v_downtime_sec
+            v_recovery['max_downtime_sec'] = max(v_recovery['max_downtime_sec'], v_downtime_sec)
+            v_outage_start = None
+            v_recovered_start = v_iteration_start
+            v_recovered_data_count = 0
+        v_recovered_data_count = v_recovered_data_count+v_data_count
     
         # Increment counters
         v_total_iteration_count = v_total_iteration_count+1         
@@ -849,16 +3597,53 @@ def run_one_thread(p_params, fn_connect, fn_run, fn_close):
         v_total_failure_count = v_total_failure_count+v_failure_count
         v_total_data_size = v_total_data_size+v_data_size
         v_total_encoded_size = v_total_encoded_size+v_encoded_size
+
+        v_iteration_sec = time.perf_counter()-v_iteration_start
+        add_to_histogram(v_stats['latency_histogram'], v_iteration_sec)
+        update_metrics(p_params, True, v_data_count, v_data_size, v_failure_count, v_stats['retry_count']-v_retry_count, v_iteration_sec)
+
+        # Count data inserted before and after readers start, iteration crossing the start belongs to neither
+        v_iteration_end = datetime.datetime.today()
+        if v_iteration_end <= v_solo_end:
+            v_window = v_windows['solo']
+        elif v_iteration_begin >= v_solo_end:
+            v_window = v_windows['mixed']
+        else:
+            v_window = None
+        if v_window != None:
+            v_window['data_count'] = v_window['data_count']+v_data_count
+            v_window['start'] = v_iteration_begin if v_window['start'] == None else v_window['start']
+            v_window['end'] = v_iteration_end
     
-        # Sleep
-        time.sleep(p_params['sleep'])
-    
-    # Close connection
-    if fn_close != None:
+        # Sleep, zero sleep is skipped as sleep(0) still yields the CPU
+        if p_params['sleep'] > 0:
+            v_time = time.perf_counter()
+            time.sleep(p_params['sleep'])
+            add_phase_time(v_stats, 'sleep', v_time)
+
+        # Stop profiler after the profiling window
+        if v_profiler != None and (datetime.datetime.today()-v_timestamp['start']).total_seconds() > p_params['profile']:
+            v_profile_file = save_profile(p_params, v_profiler, v_run_id)
+            v_profiler = None
+
+    if v_profiler != None:
+        v_profile_file = save_profile(p_params, v_profiler, v_run_id)
+
+    # Outage lasting until the end of the load
+    if v_outage_start != None:
+        v_downtime_sec = time.perf_counter() - v_outage_start
+        v_recovery['downtime_sec'] = v_recovery['downtime_sec'] + v_downtime_sec
+        v_recovery['max_downtime_sec'] = max(v_recovery['max_downtime_sec'], v_downtime_sec)
+
+    # Close connection, lost connection was closed already, close takes the end snapshot of session statistics
+    if fn_close != None and v_connected:
         fn_close(
             p_params=p_params,
             p_context=v_context
         )
+
+    if 'replay' in v_context:
+        close_replay(v_context['replay'])
     
     # Save end timestamp
     v_timestamp['end'] = datetime.datetime.today()
@@ -885,16 +3670,276 @@ def run_one_thread(p_params, fn_connect, fn_run, fn_close):
         'total_data_count' : v_total_data_count,
         'total_failure_count' : v_total_failure_count,
         'total_data_size' : v_total_data_size,
-        'total_encoded_size' : v_total_encoded_size
+        'total_encoded_size' : v_total_encoded_size,
+        'total_retry_count' : v_stats['retry_count'],
+        'latency_histogram' : v_stats['latency_histogram'],
+        'latency' : get_histogram_percentiles(v_stats['latency_histogram']),
+        'peak_rss_mb' : get_peak_rss_mb()
+    }
+
+    # Throughput in rows and in MiB of payload, identifiers and timestamps
+    v_result['rows_per_sec'] = round(v_total_data_count/v_result['elapsed_sec_total'], 1) if v_result['elapsed_sec_total'] > 0 else None
+    v_result['mb_per_sec'] = round(v_total_data_size/v_result['elapsed_sec_total']/1024/1024, 2) if v_result['elapsed_sec_total'] > 0 else None
+
+    # Elapsed time of fast ingest includes the drain of data to the table, load time excludes it
+    if p_params['scenario'] == 'fast':
+        v_result['flush_count'] = v_stats['flush_count']
+        v_result['drain_sec'] = v_context.get('drain_sec')
+        v_result['load_sec'] = round(v_result['elapsed_sec_total'] - (v_result['drain_sec'] or 0), 3)
+        v_result['load_rows_per_sec'] = round(v_total_data_count/v_result['load_sec'], 1) if v_result['load_sec'] > 0 else None
+
+    # Resource usage of the load process during the run
+    v_result.update(get_process_usage_delta(v_usage_start, get_process_usage(), v_result['elapsed_sec_total']))
+    if v_cpus != None:
+        v_result['cpus'] = v_cpus
+
+    if p_params['targets'] != None:
+        v_result['target'] = p_params['target']
+
+    # Throughput after the last recovery from outage
+    if p_params['reconnect']:
+        v_result.update({ v_key: round(v_value, 3) if isinstance(v_value, float) else v_value for v_key, v_value in v_recovery.items() })
+        if v_recovered_start != None and time.perf_counter() > v_recovered_start:
+            v_result['recovered_rows_per_sec'] = round(v_recovered_data_count / (time.perf_counter()-v_recovered_start), 1)
+        else:
+            v_result['recovered_rows_per_sec'] = None
+
+    update_metrics(p_params, p_running=False)
+
+    # Time accounting of phases, the time outside of measured phases is reported as "other"
+    v_result['phase_sec'] = { v_phase: round(v_seconds, 3) for v_phase, v_seconds in v_stats['phase_sec'].items() }
+    v_result['phase_sec']['other'] = round(max(v_result['elapsed_sec_total'] - sum(v_stats['phase_sec'].values()), 0), 3)
+    v_result['phase_share'] = get_phase_share(v_result['phase_sec'], v_result['elapsed_sec_total'])
+
+    if 'session_dbstats' in v_context:
+        v_result['session_dbstats'] = v_context['session_dbstats']
+
+    if v_profile_file != None:
+        v_result['profile_file'] = v_profile_file
+
+    # Split throughput to the phases without and with concurrent readers
+    if p_params['readers'] > 0:
+        for v_name, v_window in v_windows.items():
+            v_result[v_name+'_elapsed_sec'] = (v_window['end']-v_window['start']).total_seconds() if v_window['start'] != None else 0
+            v_result[v_name+'_data_count'] = v_window['data_count']
+
+    return v_result
+
+
+# ----------------------------------------------------
+# Run single reader
+# ----------------------------------------------------
+def run_one_reader(p_params, fn_connect, fn_close):
+
+    # Initialize
+    v_context = dict()
+    v_timestamp = dict()
+    v_timestamp['start'] = datetime.datetime.today()
+    v_run_id = v_timestamp['start'].strftime('%Y%0m%0d_%H%M%S') + '_'+str(os.getpid())
+    v_query_names = p_params['queries'].split(',')
+
+    v_queries = dict()
+    for v_query_name in v_query_names:
+        v_queries[v_query_name] = {
+            'query_count': 0,
+            'error_count': 0,
+            'row_count': 0,
+            'latency_histogram': dict()
+        }
+
+    # Initialize connection
+    if fn_connect != None:
+        v_context = fn_connect(
+            p_params=p_params
+        )
+
+    # Wait for writers to run alone
+    time.sleep(p_params['readerdelay'])
+
+    # Run queries in round robin until the time is exceeded
+    v_ids = []
+    v_query_number = 0
+
+    while (datetime.datetime.today()-v_timestamp['start']).total_seconds() <= p_params['duration']:
+
+        v_query_name = v_query_names[v_query_number % len(v_query_names)]
+        v_query_number = v_query_number+1
+
+        v_query_start = time.perf_counter()
+        try:
+            if v_query_name == 'point_lookup' and len(v_ids) == 0:
+                v_ids = get_reader_ids(p_params, v_context)
+                v_query_start = time.perf_counter()
+            v_row_count = run_query(p_params, v_context, v_query_name, v_ids)
+        except oracledb.DatabaseError as e:
+            g_logger.warning ('Reader query {0} failed with exception: {1}'.format(v_query_name, e))
+            v_queries[v_query_name]['error_count'] = v_queries[v_query_name]['error_count']+1
+            continue
+
+        add_to_histogram(v_queries[v_query_name]['latency_histogram'], time.perf_counter()-v_query_start)
+        v_queries[v_query_name]['query_count'] = v_queries[v_query_name]['query_count']+1
+        v_queries[v_query_name]['row_count'] = v_queries[v_query_name]['row_count']+v_row_count
+
+        # Refresh ids for point lookups once per round
+        if v_query_number % len(v_query_names) == 0:
+            v_ids = []
+
+    # Close connection
+    if fn_close != None:
+        fn_close(
+            p_params=p_params,
+            p_context=v_context
+        )
+
+    # Save end timestamp
+    v_timestamp['end'] = datetime.datetime.today()
+
+    # Create result
+    for v_query_name in v_query_names:
+        v_queries[v_query_name]['latency'] = get_histogram_percentiles(v_queries[v_query_name]['latency_histogram'])
+
+    v_result = {
+        'type' : 'reader',
+        'scenario' : p_params['scenario'],
+        'table' : p_params['table'],
+        'size' : p_params['size'],
+        'threads' : p_params['threads'],
+        'readers' : p_params['readers'],
+        'reader' : p_params['reader'],
+        'run_id' : v_run_id,
+        'max_run_seconds' : p_params['duration'],
+        'reader_delay_seconds' : p_params['readerdelay'],
+        'load_start_datetime' : v_timestamp['start'],
+        'load_end_datetime' : v_timestamp['end'],
+        'elapsed_sec_total' : (v_timestamp['end']-v_timestamp['start']).total_seconds(),
+        'queries' : v_queries
     }
 
-    return v_result
+    if p_params['targets'] != None:
+        v_result['target'] = p_params['target']
+
+    return v_result
+
+
+# ----------------------------------------------------
+# Add result of load process to summary result
+# ----------------------------------------------------
+def add_result_to_sum(p_result_sum, p_result):
+
+    if p_result['load_start_datetime'] < p_result_sum['load_start_datetime']:
+        p_result_sum['load_start_datetime'] = p_result['load_start_datetime']
+
+    if p_result['load_end_datetime'] > p_result_sum['load_end_datetime']:
+        p_result_sum['load_end_datetime'] = p_result['load_end_datetime']
+
+    p_result_sum['elapsed_sec_total'] = (p_result_sum['load_end_datetime']-p_result_sum['load_start_datetime']).total_seconds()
+
+    p_result_sum['total_iteration_count'] = p_result_sum['total_iteration_count'] + p_result['total_iteration_count']
+    p_result_sum['total_data_count'] = p_result_sum['total_data_count'] + p_result['total_data_count']
+    p_result_sum['total_failure_count'] = p_result_sum['total_failure_count'] + p_result['total_failure_count']
+    p_result_sum['total_data_size'] = p_result_sum['total_data_size'] + p_result['total_data_size']
+    p_result_sum['total_encoded_size'] = p_result_sum['total_encoded_size'] + p_result['total_encoded_size']
+    p_result_sum['total_retry_count'] = p_result_sum['total_retry_count'] + p_result['total_retry_count']
+    p_result_sum['peak_rss_mb'] = max(p_result_sum['peak_rss_mb'], p_result['peak_rss_mb'])
+    p_result_sum['cpu_sec'] = round(p_result_sum['cpu_sec'] + p_result['cpu_sec'], 3)
+    for v_key in ('voluntary_ctx_switches', 'involuntary_ctx_switches', 'io_read_bytes', 'io_write_bytes'):
+        p_result_sum[v_key] = p_result_sum[v_key] + p_result[v_key] if p_result_sum[v_key] != None and p_result[v_key] != None else None
+    merge_histograms(p_result_sum['latency_histogram'], p_result['latency_histogram'])
+
+    for v_phase, v_seconds in p_result['phase_sec'].items():
+        p_result_sum['phase_sec'][v_phase] = round(p_result_sum['phase_sec'][v_phase] + v_seconds, 3)
+
+    if 'session_dbstats' in p_result:
+        merge_dbstats_delta(p_result_sum['session_dbstats'], p_result['session_dbstats'])
+
+    if 'targets' in p_result_sum:
+        add_targets_to_sum(p_result_sum, p_result)
+
+    if 'drain_sec' in p_result:
+        p_result_sum['flush_count'] = p_result_sum['flush_count'] + p_result['flush_count']
+        if p_result['drain_sec'] != None:
+            p_result_sum['drain_sec'] = max(p_result_sum['drain_sec'] or 0, p_result['drain_sec'])
+
+    if 'outage_count' in p_result:
+        p_result_sum['failed_iteration_count'] = p_result_sum['failed_iteration_count'] + p_result['failed_iteration_count']
+        p_result_sum['outage_count'] = p_result_sum['outage_count'] + p_result['outage_count']
+        p_result_sum['reconnect_count'] = p_result_sum['reconnect_count'] + p_result['reconnect_count']
+        p_result_sum['downtime_sec'] = round(p_result_sum['downtime_sec'] + p_result['downtime_sec'], 3)
+        p_result_sum['max_downtime_sec'] = max(p_result_sum['max_downtime_sec'], p_result['max_downtime_sec'])
+        if p_result['recovered_rows_per_sec'] != None:
+            p_result_sum['recovered_rows_per_sec'] = round((p_result_sum['recovered_rows_per_sec'] or 0) + p_result['recovered_rows_per_sec'], 1)
+
+    if 'solo_data_count' in p_result:
+        p_result_sum['solo_elapsed_sec'] = max(p_result_sum['solo_elapsed_sec'], p_result['solo_elapsed_sec'])
+        p_result_sum['solo_data_count'] = p_result_sum['solo_data_count'] + p_result['solo_data_count']
+        p_result_sum['mixed_elapsed_sec'] = max(p_result_sum['mixed_elapsed_sec'], p_result['mixed_elapsed_sec'])
+        p_result_sum['mixed_data_count'] = p_result_sum['mixed_data_count'] + p_result['mixed_data_count']
+
+
+# ----------------------------------------------------
+# Compute derived values of summary result
+# ----------------------------------------------------
+def finish_result_sum(p_result_sum):
+
+    p_result_sum['latency'] = get_histogram_percentiles(p_result_sum['latency_histogram'])
+    p_result_sum['rows_per_sec'] = round(p_result_sum['total_data_count']/p_result_sum['elapsed_sec_total'], 1) if p_result_sum['elapsed_sec_total'] > 0 else None
+    p_result_sum['mb_per_sec'] = round(p_result_sum['total_data_size']/p_result_sum['elapsed_sec_total']/1024/1024, 2) if p_result_sum['elapsed_sec_total'] > 0 else None
+
+    # Load time of fast ingest excludes the drain of the slowest load process
+    if 'drain_sec' in p_result_sum:
+        p_result_sum['load_sec'] = round(p_result_sum['elapsed_sec_total'] - (p_result_sum['drain_sec'] or 0), 3)
+        p_result_sum['load_rows_per_sec'] = round(p_result_sum['total_data_count']/p_result_sum['load_sec'], 1) if p_result_sum['load_sec'] > 0 else None
+
+    # Throughput per target
+    if 'targets' in p_result_sum:
+        for v_target_sum in p_result_sum['targets'].values():
+            v_target_sum['rows_per_sec'] = round(v_target_sum['total_data_count']/v_target_sum['elapsed_sec_total'], 1) if v_target_sum['elapsed_sec_total'] > 0 else None
+            v_target_sum['mb_per_sec'] = round(v_target_sum['total_data_size']/v_target_sum['elapsed_sec_total']/1024/1024, 2) if v_target_sum['elapsed_sec_total'] > 0 else None
+
+    # Phase shares and CPU utilization are relative to the time of all load processes
+    p_result_sum['phase_share'] = get_phase_share(p_result_sum['phase_sec'], sum(p_result_sum['phase_sec'].values()))
+    p_result_sum['cpu_pct'] = round(p_result_sum['cpu_sec']/sum(p_result_sum['phase_sec'].values())*100, 2) if sum(p_result_sum['phase_sec'].values()) > 0 else None
+
+    # Compute writer degradation caused by readers
+    if 'solo_data_count' in p_result_sum:
+        p_result_sum['solo_rows_per_sec'] = round(p_result_sum['solo_data_count']/p_result_sum['solo_elapsed_sec'], 1) if p_result_sum['solo_elapsed_sec'] > 0 else None
+        p_result_sum['mixed_rows_per_sec'] = round(p_result_sum['mixed_data_count']/p_result_sum['mixed_elapsed_sec'], 1) if p_result_sum['mixed_elapsed_sec'] > 0 else None
+        if p_result_sum['solo_rows_per_sec'] != None and p_result_sum['solo_rows_per_sec'] > 0 and p_result_sum['mixed_rows_per_sec'] != None:
+            p_result_sum['writer_degradation_pct'] = round((1 - p_result_sum['mixed_rows_per_sec']/p_result_sum['solo_rows_per_sec'])*100, 2)
+        else:
+            p_result_sum['writer_degradation_pct'] = None
+
+
+# ----------------------------------------------------
+# Add result of reader to summary reader result
+# ----------------------------------------------------
+def add_reader_result_to_sum(p_reader_sum, p_result):
+
+    p_reader_sum['load_start_datetime'] = min(p_reader_sum['load_start_datetime'], p_result['load_start_datetime'])
+    p_reader_sum['load_end_datetime'] = max(p_reader_sum['load_end_datetime'], p_result['load_end_datetime'])
+    p_reader_sum['elapsed_sec_total'] = (p_reader_sum['load_end_datetime']-p_reader_sum['load_start_datetime']).total_seconds()
+
+    for v_query_name, v_query in p_result['queries'].items():
+        v_query_sum = p_reader_sum['queries'][v_query_name]
+        v_query_sum['query_count'] = v_query_sum['query_count'] + v_query['query_count']
+        v_query_sum['error_count'] = v_query_sum['error_count'] + v_query['error_count']
+        v_query_sum['row_count'] = v_query_sum['row_count'] + v_query['row_count']
+        merge_histograms(v_query_sum['latency_histogram'], v_query['latency_histogram'])
+
+
+# ----------------------------------------------------
+# Compute derived values of summary reader result
+# ----------------------------------------------------
+def finish_reader_result_sum(p_reader_sum):
+
+    for v_query_sum in p_reader_sum['queries'].values():
+        v_query_sum['latency'] = get_histogram_percentiles(v_query_sum['latency_histogram'])
 
 
 # ----------------------------------------------------
 # Run all threads
 # ----------------------------------------------------
-def run_all_threads(p_params, fn_connect, fn_run, fn_close):
+def run_all_threads(p_params, fn_connect, fn_run, fn_close, fn_reader_connect=None, fn_reader_close=None, p_metrics=None):
 
     # Initialize parameters
     v_timestamp = dict()
@@ -905,48 +3950,111 @@ def run_all_threads(p_params, fn_connect, fn_run, fn_close):
     for i in range(p_params['threads']):
         v_params = copy.deepcopy(p_params)
         v_params['thread'] = i+1
+        if p_params['targets'] != None:
+            set_worker_target(v_params)
         v_params_array.append(v_params)
 
     fn_connect_array = [ fn_connect for i in range(p_params['threads']) ]
     fn_run_array = [ fn_run for i in range(p_params['threads']) ]
     fn_close_array = [ fn_close for i in range(p_params['threads']) ]
 
-    # Run all threads in parallel
-    with ProcessPoolExecutor(max_workers=p_params['threads']) as v_executor:
+    v_reader_params_array = []
+    for i in range(p_params['readers']):
+        v_params = copy.deepcopy(p_params)
+        v_params['reader'] = i+1
+        if p_params['targets'] != None:
+            set_reader_target(v_params)
+        v_reader_params_array.append(v_params)
+
+    # Shared metrics and metrics endpoint, agent passes its own metrics for interval reports
+    v_metrics = p_metrics
+    v_metrics_server = None
+    if v_metrics == None and p_params['metricsport'] > 0:
+        v_metrics = multiprocessing.Array('d', p_params['threads']*g_metrics_slot_size, lock=False)
+    if p_params['metricsport'] > 0:
+        v_metrics_server = start_metrics_server(p_params, v_metrics)
+
+    # Shared state of simulated server
+    v_simulated_server = None
+    if p_params['scenario'] == 'simulated' and p_params['simcapacity'] > 0:
+        v_simulated_server = multiprocessing.Value('d', 0.0)
+
+    # Sample client host in background thread
+    v_client = { 'cpu_count': len(get_available_cpus()), 'pin': p_params['pin'] }
+    v_client_stop = threading.Event()
+    v_client_thread = threading.Thread(target=run_client_sampler, args=(v_client, v_client_stop), daemon=True)
+    v_client_thread.start()
+
+    # Fast ingest write area is monitored by additional process
+    v_monitor_count = 1 if p_params['scenario'] == 'fast' and p_params['fastsample'] > 0 else 0
+
+    # Run all threads and readers in parallel
+    with ProcessPoolExecutor(max_workers=p_params['threads']+p_params['readers']+v_monitor_count, initializer=initialize_worker, initargs=(v_metrics, v_simulated_server)) as v_executor:
+        v_monitor_futures = [ v_executor.submit(run_write_area_monitor, p_params, fn_reader_connect, fn_reader_close) for i in range(v_monitor_count) ]
+        v_reader_futures = [ v_executor.submit(run_one_reader, v_params, fn_reader_connect, fn_reader_close) for v_params in v_reader_params_array ]
         v_result_set = v_executor.map(run_one_thread, v_params_array, fn_connect_array, fn_run_array, fn_close_array)
 
+    v_client_stop.set()
+    v_client_thread.join()
+
     # Consolidate results
     v_result_array = []
-    v_result_count = 0
+    v_result_sum = None
 
     for v_result in v_result_set:
 
         v_result_array.append(v_result)
 
-        if (v_result_count <= 0):
+        if v_result_sum == None:
             v_result_sum = copy.deepcopy(v_result)
             v_result_sum['type'] = 'sum'
             v_result_sum['thread'] = 0
             v_result_sum['run_id'] = v_result['run_id'][0:15]
+            v_result_sum.pop('profile_file', None)
+            v_result_sum.pop('cpus', None)
+            if 'target' in v_result:
+                v_result_sum.pop('target')
+                v_result_sum['targets'] = dict()
+                add_targets_to_sum(v_result_sum, v_result)
         else:
+            add_result_to_sum(v_result_sum, v_result)
 
-            if v_result['load_start_datetime'] < v_result_sum['load_start_datetime']:
-                v_result_sum['load_start_datetime'] = v_result['load_start_datetime']
-            
-            if v_result['load_end_datetime'] > v_result_sum['load_end_datetime']:
-                v_result_sum['load_end_datetime'] = v_result['load_end_datetime']
+    finish_result_sum(v_result_sum)
 
-            v_result_sum['elapsed_sec_total'] = (v_result_sum['load_end_datetime']-v_result_sum['load_start_datetime']).total_seconds()
-            
-            v_result_sum['total_iteration_count'] = v_result_sum['total_iteration_count'] + v_result['total_iteration_count']
-            v_result_sum['total_data_count'] = v_result_sum['total_data_count'] + v_result['total_data_count']
-            v_result_sum['total_failure_count'] = v_result_sum['total_failure_count'] + v_result['total_failure_count']
-            v_result_sum['total_data_size'] = v_result_sum['total_data_size'] + v_result['total_data_size']
-            v_result_sum['total_encoded_size'] = v_result_sum['total_encoded_size'] + v_result['total_encoded_size']
+    for v_future in v_monitor_futures:
+        v_result_sum['write_area'] = v_future.result()
 
-        v_result_count = v_result_count+1
+    # Client telemetry and detection of run limited by the client
+    v_result_sum['client'] = v_client
+    v_result_sum['client_bound'] = is_client_bound(p_params, v_result_sum)
+    if v_result_sum['client_bound']:
+        g_logger.warning ('Run is client-bound, CPU utilization of host {0}% and of load processes {1}%, add client CPUs or agents'.format(v_client.get('cpu_util_avg_pct'), v_result_sum['cpu_pct']))
 
     v_result_array.append(v_result_sum)
+
+    # Consolidate reader results
+    v_reader_sum = None
+    for v_future in v_reader_futures:
+
+        v_result = v_future.result()
+        v_result_array.append(v_result)
+
+        if v_reader_sum == None:
+            v_reader_sum = copy.deepcopy(v_result)
+            v_reader_sum['type'] = 'reader_sum'
+            v_reader_sum['reader'] = 0
+            v_reader_sum['run_id'] = v_result['run_id'][0:15]
+        else:
+            add_reader_result_to_sum(v_reader_sum, v_result)
+
+    if v_reader_sum != None:
+        finish_reader_result_sum(v_reader_sum)
+        v_result_array.append(v_reader_sum)
+
+    if v_metrics_server != None:
+        v_metrics_server.shutdown()
+        v_metrics_server.server_close()
+
     return v_result_array
 
 
@@ -988,7 +4096,7 @@ def init_task(p_params, fn_connect, fn_run, fn_close):
 # ----------------------------------------------------
 # Execute finish task
 # ----------------------------------------------------
-def finish_task(p_params, fn_connect, fn_run, fn_close):
+def finish_task(p_params, fn_connect, fn_run, fn_close, p_summary=None):
 
     # Initialize
     v_context = dict()
@@ -1005,7 +4113,8 @@ def finish_task(p_params, fn_connect, fn_run, fn_close):
     if fn_run != None:
         v_result = fn_run(
             p_params=p_params,
-            p_context=v_context
+            p_context=v_context,
+            p_summary=p_summary
         )
     else:
         v_result = None
@@ -1021,79 +4130,890 @@ def finish_task(p_params, fn_connect, fn_run, fn_close):
 
 
 # ----------------------------------------------------
-# MAIN FUNCTION
+# LOAD FUNCTIONS
 # ----------------------------------------------------
-def main(p_argv):
 
-    # Initialize logging
-    initialize_logging(p_argv[0], 'INFO');
+# ----------------------------------------------------
+# Convert values not supported by JSON, such as timestamps
+# ----------------------------------------------------
+def get_json_value(p_value):
 
-    # Get command line parameters
-    v_params = get_input_parameters(p_argv)
-    g_logger.setLevel(v_params['loglevel'])
+    if isinstance(p_value, datetime.datetime):
+        return p_value.strftime('%Y/%0m/%0d %H:%M:%S,%f')
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(p_value).__name__))
 
-    # Initialize functions for scenarios
-    if v_params['scenario'] == 'single':
+
+# ----------------------------------------------------
+# Print result as JSON line
+# ----------------------------------------------------
+def print_result(p_result):
+    print(json.dumps(p_result, default=get_json_value), flush=True)
+
+
+# ----------------------------------------------------
+# Get connect, execute and close functions of init, run and finish tasks of scenario
+# ----------------------------------------------------
+def get_scenario_functions(p_scenario):
+
+    if p_scenario == 'single':
         fn_init_connect,   fn_init_execute,   fn_init_close   = connect_oracle,      run_truncate,  close_oracle
         fn_run_connect,    fn_run_execute,    fn_run_close    = connect_oracle,      run_single,    close_oracle
         fn_finish_connect, fn_finish_execute, fn_finish_close = connect_oracle,      run_finish,    close_oracle
-    if v_params['scenario'] == 'batch':
+    if p_scenario == 'batch':
         fn_init_connect,   fn_init_execute,   fn_init_close   = connect_oracle,      run_truncate,  close_oracle
         fn_run_connect,    fn_run_execute,    fn_run_close    = connect_oracle,      run_batch,     close_oracle
         fn_finish_connect, fn_finish_execute, fn_finish_close = connect_oracle,      run_finish,    close_oracle
-    if v_params['scenario'] == 'array':
+    if p_scenario == 'array':
         fn_init_connect,   fn_init_execute,   fn_init_close   = connect_oracle,      run_truncate,  close_oracle
         fn_run_connect,    fn_run_execute,    fn_run_close    = connect_oracle,      run_array,     close_oracle
         fn_finish_connect, fn_finish_execute, fn_finish_close = connect_oracle,      run_finish,    close_oracle
-    if v_params['scenario'] == 'fast':
+    if p_scenario == 'fast':
         fn_init_connect,   fn_init_execute,   fn_init_close   = connect_oracle,      run_truncate,  close_oracle
-        fn_run_connect,    fn_run_execute,    fn_run_close    = connect_oracle_fast, run_fast,      close_oracle
+        fn_run_connect,    fn_run_execute,    fn_run_close    = connect_oracle_fast, run_fast,      close_oracle_fast
         fn_finish_connect, fn_finish_execute, fn_finish_close = connect_oracle,      run_finish,    close_oracle
-    if v_params['scenario'] == 'stream':
+    if p_scenario == 'stream':
         fn_init_connect,   fn_init_execute,   fn_init_close   = None,                None,          None
         fn_run_connect,    fn_run_execute,    fn_run_close    = connect_streaming,   run_streaming, close_streaming
         fn_finish_connect, fn_finish_execute, fn_finish_close = None,                None,          None
+    if p_scenario == 'null':
+        fn_init_connect,   fn_init_execute,   fn_init_close   = None,                None,          None
+        fn_run_connect,    fn_run_execute,    fn_run_close    = None,                run_null,      None
+        fn_finish_connect, fn_finish_execute, fn_finish_close = None,                None,          None
+    if p_scenario == 'simulated':
+        fn_init_connect,   fn_init_execute,   fn_init_close   = None,                None,          None
+        fn_run_connect,    fn_run_execute,    fn_run_close    = connect_simulated,   run_simulated, close_simulated
+        fn_finish_connect, fn_finish_execute, fn_finish_close = None,                None,          None
+
+    return {
+        'init':   (fn_init_connect,   fn_init_execute,   fn_init_close),
+        'run':    (fn_run_connect,    fn_run_execute,    fn_run_close),
+        'finish': (fn_finish_connect, fn_finish_execute, fn_finish_close),
+        'reader': (connect_oracle,    close_oracle)
+    }
+
+
+# ----------------------------------------------------
+# Run the load with init, run, and finish tasks and return all results
+# ----------------------------------------------------
+def run_load(p_params):
+
+    v_results = []
+
+    # Initialize functions for scenarios
+    v_functions = get_scenario_functions(p_params['scenario'])
+    fn_init_connect,   fn_init_execute,   fn_init_close   = v_functions['init']
+    fn_run_connect,    fn_run_execute,    fn_run_close    = v_functions['run']
+    fn_finish_connect, fn_finish_execute, fn_finish_close = v_functions['finish']
+    fn_reader_connect, fn_reader_close = v_functions['reader']
 
     # Execute init task
     if fn_init_execute != None:
 
         v_result = init_task(
-            p_params=v_params,
+            p_params=p_params,
             fn_connect=fn_init_connect,
             fn_run=fn_init_execute,
             fn_close=fn_init_close
         )
         if v_result != None:
-            print(json.dumps(v_result))
+            print_result(v_result)
+            v_results.append(v_result)
+
+    # Snapshot database statistics before the load
+    if p_params['dbstats']:
+        v_dbstats_start = init_task(
+            p_params=p_params,
+            fn_connect=connect_oracle,
+            fn_run=run_dbstats_snapshot,
+            fn_close=close_oracle
+        )
 
     # Execute run tasks
+    v_result_sum = None
     if fn_run_execute != None:
 
-        # Run all threads
-        v_result_array = run_all_threads(
-            p_params=v_params,
-            fn_connect=fn_run_connect,
-            fn_run=fn_run_execute,
-            fn_close=fn_run_close
-        )
+        # Run all threads locally or on agents
+        if p_params['agents'] != None:
+            v_result_array = run_all_agents(p_params)
+        else:
+            v_result_array = run_all_threads(
+                p_params=p_params,
+                fn_connect=fn_run_connect,
+                fn_run=fn_run_execute,
+                fn_close=fn_run_close,
+                fn_reader_connect=fn_reader_connect,
+                fn_reader_close=fn_reader_close
+            )
+
+        v_result_sum = next(v_result for v_result in v_result_array if v_result['type'] == 'sum')
 
         # Print results
         for v_result in v_result_array:
-            v_result_output = copy.deepcopy(v_result)
-            v_result_output['load_start_datetime'] = v_result['load_start_datetime'].strftime('%Y/%0m/%0d %H:%M:%S,%f')
-            v_result_output['load_end_datetime'] = v_result['load_end_datetime'].strftime('%Y/%0m/%0d %H:%M:%S,%f')
-            print(json.dumps(v_result_output))
+            print_result(v_result)
+            v_results.append(v_result)
+
+        # Merge profiles of load processes, profiles of agents stay on their hosts
+        if p_params['profile'] > 0 and p_params['agents'] == None:
+            v_result = get_profile_result(p_params, v_result_array)
+            if v_result != None:
+                print_result(v_result)
+                v_results.append(v_result)
+
+        # Snapshot database statistics after the load and report the difference
+        if p_params['dbstats']:
+            v_dbstats_end = finish_task(
+                p_params=p_params,
+                fn_connect=connect_oracle,
+                fn_run=run_dbstats_snapshot,
+                fn_close=close_oracle
+            )
+            v_result = get_dbstats_result(p_params, v_dbstats_start, v_dbstats_end, v_result_sum)
+            print_result(v_result)
+            v_results.append(v_result)
 
     # Execute finish tasks
     if fn_finish_execute != None:
         v_result = finish_task(
-            p_params=v_params,
+            p_params=p_params,
             fn_connect=fn_finish_connect,
             fn_run=fn_finish_execute,
-            fn_close=fn_finish_close
+            fn_close=fn_finish_close,
+            p_summary=v_result_sum
         )
         if v_result != None:
-            print(json.dumps(v_result))
+            print_result(v_result)
+            v_results.append(v_result)
+
+    # Persist parameters and results of the run
+    if p_params['store'] != None:
+        store_results(p_params, v_results)
+
+    return v_results
+
+
+# ----------------------------------------------------
+# AGENT FUNCTIONS
+# ----------------------------------------------------
+
+# Timeout in seconds of connecting to agent
+g_agent_connect_timeout = 10
+
+
+# ----------------------------------------------------
+# Check if agent address accepts only local connections
+# ----------------------------------------------------
+def is_loopback_address(p_address):
+    return p_address in ('localhost', '::1') or p_address.startswith('127.')
+
+
+# ----------------------------------------------------
+# Send message to agent or coordinator as JSON line
+# ----------------------------------------------------
+def send_agent_message(p_file, p_message):
+
+    p_file.write((json.dumps(p_message, default=get_json_value)+'\n').encode())
+    p_file.flush()
+
+
+# ----------------------------------------------------
+# Convert timestamps of result received from agent back to datetime and tag result with agent
+# ----------------------------------------------------
+def get_agent_result(p_agent, p_result):
+
+    for v_key in ('load_start_datetime', 'load_end_datetime'):
+        if isinstance(p_result.get(v_key), str):
+            p_result[v_key] = datetime.datetime.strptime(p_result[v_key], '%Y/%m/%d %H:%M:%S,%f')
+    p_result['agent'] = p_agent
+
+    return p_result
+
+
+# ----------------------------------------------------
+# Run load processes on command of coordinator and send interval and final results
+# ----------------------------------------------------
+def run_agent_command(p_params, p_rfile, p_wfile):
+
+    v_command = json.loads(p_rfile.readline())
+
+    # Coordinator must know the token of the agent
+    if p_params['agenttoken'] != None and not hmac.compare_digest(str(v_command.get('token')).encode(), p_params['agenttoken'].encode()):
+        g_logger.warning ('Command rejected, invalid token')
+        send_agent_message(p_wfile, { 'type': 'error', 'message': 'Invalid token' })
+        return
+
+    if v_command.get('command') != 'run':
+        send_agent_message(p_wfile, { 'type': 'error', 'message': 'Unknown command {}'.format(v_command.get('command')) })
+        return
+
+    # Metrics endpoint is configured per agent, other parameters come from coordinator
+    v_params = v_command['params']
+    v_params['metricsport'] = p_params['metricsport']
+    if v_params['autothreads']:
+        v_params['threads'] = get_auto_threads(v_params)
+    v_functions = get_scenario_functions(v_params['scenario'])
+    fn_connect, fn_run, fn_close = v_functions['run']
+    fn_reader_connect, fn_reader_close = v_functions['reader']
+
+    # Wait for synchronized start of all agents
+    v_start_time = v_command['start_time']
+    v_wait_sec = v_start_time - time.time()
+    if v_wait_sec > 0:
+        time.sleep(v_wait_sec)
+    else:
+        g_logger.warning ('Load started {0:.3f} seconds after synchronized start, check clocks of agent and coordinator'.format(-v_wait_sec))
+
+    g_logger.info ('Agent {0} starting {1} threads of scenario {2}'.format(v_params['agent'], v_params['threads'], v_params['scenario']))
+
+    # Send totals of load processes in background thread at interval boundaries common to all agents
+    v_metrics = multiprocessing.Array('d', v_params['threads']*g_metrics_slot_size, lock=False)
+    v_stop = threading.Event()
+
+    def send_intervals():
+        v_interval = 1
+        while not v_stop.wait(max(v_start_time + v_interval*v_params['interval'] - time.time(), 0)):
+            v_message = { 'type': 'interval', 'interval': v_interval }
+            v_message.update(get_metrics_totals(v_params, v_metrics))
+            try:
+                send_agent_message(p_wfile, v_message)
+            except OSError as e:
+                g_logger.warning ('Cannot send interval to coordinator: {0}'.format(e))
+                return
+            v_interval = v_interval+1
+
+    v_thread = threading.Thread(target=send_intervals, daemon=True)
+    v_thread.start()
+
+    try:
+        v_result_array = run_all_threads(
+            p_params=v_params,
+            fn_connect=fn_connect,
+            fn_run=fn_run,
+            fn_close=fn_close,
+            fn_reader_connect=fn_reader_connect,
+            fn_reader_close=fn_reader_close,
+            p_metrics=v_metrics
+        )
+        v_message = { 'type': 'results', 'results': v_result_array }
+    except Exception as e:
+        g_logger.error ('Load failed: {0}'.format(e))
+        v_message = { 'type': 'error', 'message': str(e) }
+    finally:
+        v_stop.set()
+        v_thread.join()
+
+    send_agent_message(p_wfile, v_message)
+    g_logger.info ('Agent {0} finished'.format(v_params['agent']))
+
+
+# ----------------------------------------------------
+# Run agent serving commands of coordinator until interrupted
+# ----------------------------------------------------
+def run_agent(p_params):
+
+    class AgentHandler(socketserver.StreamRequestHandler):
+
+        def handle(self):
+            g_logger.info ('Coordinator {0} connected'.format(self.client_address[0]))
+            try:
+                run_agent_command(p_params, self.rfile, self.wfile)
+            except (OSError, ValueError) as e:
+                g_logger.error ('Command of coordinator {0} failed: {1}'.format(self.client_address[0], e))
+
+    class AgentServer(socketserver.TCPServer):
+        allow_reuse_address = True
+
+    with AgentServer((p_params['agentbind'], p_params['agentport']), AgentHandler) as v_server:
+        g_logger.info ('Agent listening on {0} port {1}'.format(p_params['agentbind'], p_params['agentport']))
+        try:
+            v_server.serve_forever()
+        except KeyboardInterrupt:
+            g_logger.info ('Agent stopped')
+
+
+# ----------------------------------------------------
+# Get cluster interval record from interval totals of all agents
+# ----------------------------------------------------
+def get_cluster_interval(p_params, p_run_id, p_interval, p_messages, p_previous_data_count, p_previous_data_size):
+
+    v_result = {
+        'type' : 'interval',
+        'run_id' : p_run_id,
+        'interval' : p_interval,
+        'elapsed_sec' : p_interval * p_params['interval'],
+        'agents' : len(p_messages),
+        'running_threads' : sum(v_message['running'] for v_message in p_messages),
+        'total_iteration_count' : sum(v_message['iterations'] for v_message in p_messages),
+        'total_data_count' : sum(v_message['rows'] for v_message in p_messages),
+        'total_failure_count' : sum(v_message['failures'] for v_message in p_messages),
+        'total_data_size' : sum(v_message['bytes'] for v_message in p_messages),
+        'total_retry_count' : sum(v_message['retries'] for v_message in p_messages)
+    }
+    v_result['interval_rows_per_sec'] = round((v_result['total_data_count'] - p_previous_data_count) / p_params['interval'], 1)
+    v_result['interval_mb_per_sec'] = round((v_result['total_data_size'] - p_previous_data_size) / p_params['interval'] / 1024 / 1024, 2)
+
+    return v_result
+
+
+# ----------------------------------------------------
+# Run load processes on all agents and merge their results into cluster results
+# ----------------------------------------------------
+def run_all_agents(p_params):
+
+    v_run_id = datetime.datetime.today().strftime('%Y%0m%0d_%H%M%S')
+    v_agents = p_params['agents'].split(',')
+    v_start_time = time.time() + p_params['startdelay']
+    v_queue = queue.Queue()
+
+    def receive_messages(p_agent, p_file):
+        try:
+            for v_line in p_file:
+                v_queue.put((p_agent, json.loads(v_line)))
+        except (OSError, ValueError) as e:
+            g_logger.error ('Cannot receive message from agent {0}: {1}'.format(p_agent, e))
+        v_queue.put((p_agent, None))
+
+    # Send parameters and common start time to all agents
+    v_connections = []
+    for i, v_agent in enumerate(v_agents):
+        (v_host, v_port) = v_agent.rsplit(':', 1)
+        try:
+            v_socket = socket.create_connection((v_host, int(v_port)), timeout=g_agent_connect_timeout)
+        except OSError as e:
+            g_logger.error ('Cannot connect to agent {0}: {1}'.format(v_agent, e))
+            for (v_connected_socket, v_connected_file) in v_connections:
+                v_connected_socket.close()
+            sys.exit(2)
+        v_socket.settimeout(None)
+        v_file = v_socket.makefile('rwb')
+
+        # Capacity of simulated server is shared by all agents, token is not forwarded as parameter
+        v_params = copy.deepcopy(p_params)
+        v_params['agent'] = i+1
+        v_params['agenttoken'] = None
+        v_params['simcapacity'] = p_params['simcapacity'] / len(v_agents)
+        send_agent_message(v_file, { 'command': 'run', 'token': p_params['agenttoken'], 'params': v_params, 'start_time': v_start_time })
+        v_connections.append((v_socket, v_file))
+
+        threading.Thread(target=receive_messages, args=(v_agent, v_file), daemon=True).start()
+
+    g_logger.info ('Load starts on {0} agents in {1} seconds'.format(len(v_agents), p_params['startdelay']))
+
+    # Print cluster intervals once all running agents reported them and collect final results
+    v_agent_results = dict()
+    v_intervals = dict()
+    v_previous_data_count = 0
+    v_previous_data_size = 0
+    v_running_agents = len(v_agents)
+    while v_running_agents > 0:
+
+        (v_agent, v_message) = v_queue.get()
+
+        if v_message == None:
+            v_running_agents = v_running_agents-1
+            if v_agent not in v_agent_results:
+                g_logger.error ('Agent {0} closed connection without results'.format(v_agent))
+        elif v_message['type'] == 'interval':
+            v_interval = v_message['interval']
+            v_intervals.setdefault(v_interval, dict())[v_agent] = v_message
+            if len(v_intervals[v_interval]) >= v_running_agents:
+                v_result = get_cluster_interval(p_params, v_run_id, v_interval, list(v_intervals.pop(v_interval).values()), v_previous_data_count, v_previous_data_size)
+                v_previous_data_count = v_result['total_data_count']
+                v_previous_data_size = v_result['total_data_size']
+                print_result(v_result)
+        elif v_message['type'] == 'results':
+            v_agent_results[v_agent] = [ get_agent_result(v_agent, v_result) for v_result in v_message['results'] ]
+        elif v_message['type'] == 'error':
+            g_logger.error ('Agent {0} failed: {1}'.format(v_agent, v_message['message']))
+
+    for (v_socket, v_file) in v_connections:
+        v_file.close()
+        v_socket.close()
+
+    # Merge sums of agents into cluster sum
+    v_result_array = []
+    v_result_sum = None
+    v_reader_sum = None
+
+    for v_agent in v_agents:
+        for v_result in v_agent_results.get(v_agent, []):
+
+            v_result_array.append(v_result)
+
+            if v_result['type'] == 'sum':
+                v_result['type'] = 'agent_sum'
+                if v_result_sum == None:
+                    v_result_sum = copy.deepcopy(v_result)
+                    v_result_sum['type'] = 'sum'
+                    v_result_sum['run_id'] = v_run_id
+                    v_result_sum['agents'] = 0
+                    v_result_sum['threads'] = 0
+                    v_result_sum['client_bound_agents'] = []
+                    v_result_sum.pop('agent')
+                    v_result_sum.pop('client')
+                else:
+                    add_result_to_sum(v_result_sum, v_result)
+                v_result_sum['agents'] = v_result_sum['agents']+1
+                v_result_sum['threads'] = v_result_sum['threads'] + v_result['threads']
+                if v_result['client_bound']:
+                    v_result_sum['client_bound_agents'].append(v_result['agent'])
+
+            elif v_result['type'] == 'reader_sum':
+                v_result['type'] = 'agent_reader_sum'
+                if v_reader_sum == None:
+                    v_reader_sum = copy.deepcopy(v_result)
+                    v_reader_sum['type'] = 'reader_sum'
+                    v_reader_sum['run_id'] = v_run_id
+                    v_reader_sum.pop('agent')
+                else:
+                    add_reader_result_to_sum(v_reader_sum, v_result)
+
+    if v_result_sum == None:
+        g_logger.error ('No results received from agents')
+        sys.exit(1)
+
+    finish_result_sum(v_result_sum)
+    v_result_sum['client_bound'] = len(v_result_sum['client_bound_agents']) > 0
+    v_result_array.append(v_result_sum)
+
+    if v_reader_sum != None:
+        finish_reader_result_sum(v_reader_sum)
+        v_result_array.append(v_reader_sum)
+
+    return v_result_array
+
+
+# ----------------------------------------------------
+# STORE FUNCTIONS
+# ----------------------------------------------------
+
+# Parameters not saved to the store
+g_store_excluded_params = ('dbpwd', 'agenttoken')
+
+# Parameters not defining the workload, compared runs may differ in them, all other parameters are compared
+g_compare_excluded_params = (
+    'size', 'store', 'savebaseline', 'compare', 'baseline', 'threshold', 'matrix', 'record', 'recordrows',
+    'loglevel', 'metricsport', 'profiledir', 'profiletop', 'agentport', 'agentbind', 'startdelay', 'interval',
+    'finishstats', 'scanparallel', 'scantimeout', 'clientcpu', 'dbuser'
+)
+
+
+# ----------------------------------------------------
+# Open results store and create tables if they do not exist
+# ----------------------------------------------------
+def open_store(p_file_name):
+
+    v_connection = sqlite3.connect(p_file_name)
+    v_connection.executescript('''
+        create table if not exists runs (
+          run_id text primary key,
+          created text not null,
+          scenario text,
+          size text,
+          threads integer,
+          params text not null
+        );
+        create table if not exists results (
+          run_id text not null,
+          seq integer not null,
+          type text not null,
+          thread integer,
+          record text not null,
+          primary key (run_id, seq)
+        );
+        create table if not exists baselines (
+          name text primary key,
+          run_id text not null,
+          created text not null
+        );
+    ''')
+
+    return v_connection
+
+
+# ----------------------------------------------------
+# Save parameters and results of the run to the store
+# ----------------------------------------------------
+def store_results(p_params, p_results):
+
+    v_result_sum = next((v_result for v_result in p_results if v_result['type'] == 'sum'), None)
+    if v_result_sum == None:
+        g_logger.warning ('Run has no summary record, results are not stored')
+        return
+
+    v_run_id = v_result_sum['run_id']
+    v_params = { v_key: v_value for v_key, v_value in p_params.items() if v_key not in g_store_excluded_params }
+    v_created = datetime.datetime.today().isoformat()
+
+    v_connection = open_store(p_params['store'])
+    with v_connection:
+
+        # Runs started in the same second get sequence suffix, stored runs are never replaced
+        v_sequence = 1
+        v_store_run_id = v_run_id
+        while True:
+            try:
+                v_connection.execute(
+                    'insert into runs (run_id, created, scenario, size, threads, params) values (?, ?, ?, ?, ?, ?)',
+                    (v_store_run_id, v_created, p_params['scenario'], p_params['size'], p_params['threads'], json.dumps(v_params))
+                )
+                break
+            except sqlite3.IntegrityError:
+                v_sequence = v_sequence+1
+                v_store_run_id = '{0}_{1}'.format(v_run_id, v_sequence)
+        v_run_id = v_store_run_id
+
+        v_connection.executemany(
+            'insert into results (run_id, seq, type, thread, record) values (?, ?, ?, ?, ?)',
+            [ (v_run_id, i, v_result['type'], v_result.get('thread'), json.dumps(v_result, default=get_json_value)) for i, v_result in enumerate(p_results) ]
+        )
+        if p_params['savebaseline'] != None:
+            v_connection.execute(
+                'insert or replace into baselines (name, run_id, created) values (?, ?, ?)',
+                (p_params['savebaseline'], v_run_id, v_created)
+            )
+    v_connection.close()
+
+    g_logger.info ('Run {0} stored in {1}'.format(v_run_id, p_params['store']))
+
+
+# ----------------------------------------------------
+# Get summary record of stored run
+# ----------------------------------------------------
+def get_stored_summary(p_connection, p_run_id):
+
+    v_row = p_connection.execute('select record from results where run_id = ? and type = \'sum\'', (p_run_id,)).fetchone()
+    if v_row == None:
+        g_logger.error ('Run {0} not found in the store'.format(p_run_id))
+        sys.exit(2)
+
+    return json.loads(v_row[0])
+
+
+# ----------------------------------------------------
+# Get parameters of stored run
+# ----------------------------------------------------
+def get_stored_params(p_connection, p_run_id):
+
+    v_row = p_connection.execute('select params from runs where run_id = ?', (p_run_id,)).fetchone()
+
+    return json.loads(v_row[0]) if v_row != None else dict()
+
+
+# ----------------------------------------------------
+# Get metrics compared between runs, with direction of improvement
+# ----------------------------------------------------
+def get_compare_metrics(p_result_sum):
+
+    v_elapsed_sec = p_result_sum['elapsed_sec_total']
+
+    return {
+        'rows_per_sec': (p_result_sum['total_data_count']/v_elapsed_sec if v_elapsed_sec > 0 else None, 'higher'),
+        'mb_per_sec': (p_result_sum['total_data_size']/v_elapsed_sec/1024/1024 if v_elapsed_sec > 0 else None, 'higher'),
+        'failure_count': (p_result_sum['total_failure_count'], 'lower'),
+        'latency_p50_ms': (p_result_sum.get('latency', dict()).get('p50_ms'), 'lower'),
+        'latency_p99_ms': (p_result_sum.get('latency', dict()).get('p99_ms'), 'lower')
+    }
+
+
+# ----------------------------------------------------
+# Compare two stored runs and report regressions beyond threshold
+# ----------------------------------------------------
+def run_compare(p_params):
+
+    v_connection = open_store(p_params['store'])
+    v_run_ids = p_params['compare'].split(',')
+
+    if len(v_run_ids) == 1:
+        v_row = v_connection.execute('select run_id from baselines where name = ?', (p_params['baseline'],)).fetchone()
+        if v_row == None:
+            g_logger.error ('Baseline {0} not found in the store'.format(p_params['baseline']))
+            sys.exit(2)
+        v_run_ids = [ v_row[0], v_run_ids[0] ]
+
+    v_base_metrics = get_compare_metrics(get_stored_summary(v_connection, v_run_ids[0]))
+    v_run_metrics = get_compare_metrics(get_stored_summary(v_connection, v_run_ids[1]))
+
+    # Runs of different workloads are not comparable
+    v_base_params = get_stored_params(v_connection, v_run_ids[0])
+    v_run_params = get_stored_params(v_connection, v_run_ids[1])
+    v_connection.close()
+    v_param_names = [ v_name for v_name in dict.fromkeys(list(v_base_params) + list(v_run_params)) if v_name not in g_compare_excluded_params ]
+    v_param_differences = { v_name: {'base': v_base_params.get(v_name), 'run': v_run_params.get(v_name)} for v_name in v_param_names if v_base_params.get(v_name) != v_run_params.get(v_name) }
+    if len(v_param_differences) > 0:
+        g_logger.warning ('Compared runs differ in parameters {0}, changes may be caused by the configuration'.format(', '.join(v_param_differences)))
+
+    v_metrics = dict()
+    v_regressions = []
+    for v_name, (v_base_value, v_direction) in v_base_metrics.items():
+        v_run_value = v_run_metrics[v_name][0]
+        if v_base_value == None or v_run_value == None:
+            v_change_pct = None
+        elif v_base_value == 0:
+            v_change_pct = 0.0 if v_run_value == 0 else None
+        else:
+            v_change_pct = round((v_run_value-v_base_value)/v_base_value*100, 2)
+
+        if v_direction == 'higher':
+            v_regression = v_change_pct != None and v_change_pct < -p_params['threshold']
+        else:
+            v_regression = (v_change_pct != None and v_change_pct > p_params['threshold']) or (v_change_pct == None and v_base_value == 0 and v_run_value != None and v_run_value > 0)
+
+        v_metrics[v_name] = {
+            'base': round(v_base_value, 3) if v_base_value != None else None,
+            'run': round(v_run_value, 3) if v_run_value != None else None,
+            'change_pct': v_change_pct,
+            'regression': v_regression
+        }
+        if v_regression:
+            v_regressions.append(v_name)
+
+    v_result = {
+        'type' : 'compare',
+        'base_run_id' : v_run_ids[0],
+        'run_id' : v_run_ids[1],
+        'baseline' : p_params['baseline'],
+        'threshold_pct' : p_params['threshold'],
+        'param_differences' : v_param_differences,
+        'metrics' : v_metrics,
+        'regressions' : v_regressions
+    }
+    print_result(v_result)
+
+    return len(v_regressions) == 0
+
+
+# ----------------------------------------------------
+# MATRIX FUNCTIONS
+# ----------------------------------------------------
+
+# ----------------------------------------------------
+# Get label of axis value
+# ----------------------------------------------------
+def get_matrix_label(p_value):
+
+    if isinstance(p_value, dict):
+        return ','.join('{}={}'.format(v_key, v_value) for v_key, v_value in p_value.items())
+    return str(p_value)
+
+
+# ----------------------------------------------------
+# Expand matrix config to list of runs with parameters
+# ----------------------------------------------------
+def get_matrix_runs(p_params, p_config):
+
+    v_base_params = copy.deepcopy(p_params)
+    v_base_params['matrix'] = None
+    v_base_params.update(p_config.get('parameters', dict()))
+
+    v_axes = p_config.get('axes', dict())
+    v_axis_names = list(v_axes.keys())
+    v_runs = []
+
+    for v_combination in itertools.product(*[ v_axes[v_axis_name] for v_axis_name in v_axis_names ]):
+        for v_repetition in range(p_config.get('repetitions', 1)):
+
+            v_params = copy.deepcopy(v_base_params)
+            v_labels = dict()
+            for v_axis_name, v_value in zip(v_axis_names, v_combination):
+                if isinstance(v_value, dict):
+                    v_params.update(v_value)
+                else:
+                    v_params[v_axis_name] = v_value
+                v_labels[v_axis_name] = get_matrix_label(v_value)
+
+            v_runs.append({
+                'run': len(v_runs)+1,
+                'repetition': v_repetition+1,
+                'axes': v_labels,
+                'params': v_params
+            })
+
+    return v_runs
+
+
+# ----------------------------------------------------
+# Get mean, standard deviation and range of values
+# ----------------------------------------------------
+def get_matrix_summary(p_values):
+
+    v_values = [ v_value for v_value in p_values if v_value != None ]
+    if len(v_values) == 0:
+        return { 'runs': 0, 'mean': None, 'stdev': None, 'cv_pct': None, 'min': None, 'max': None }
+
+    v_mean = statistics.mean(v_values)
+    v_stdev = statistics.stdev(v_values) if len(v_values) > 1 else 0.0
+
+    return {
+        'runs': len(v_values),
+        'mean': round(v_mean, 3),
+        'stdev': round(v_stdev, 3),
+        'cv_pct': round(v_stdev/v_mean*100, 2) if v_mean != 0 else None,
+        'min': round(min(v_values), 3),
+        'max': round(max(v_values), 3)
+    }
+
+
+# ----------------------------------------------------
+# Get throughput and latency metrics of run from its sum record
+# ----------------------------------------------------
+def get_matrix_metrics(p_result_sum):
+
+    v_elapsed_sec = p_result_sum['elapsed_sec_total']
+
+    return {
+        'rows_per_sec': p_result_sum['total_data_count']/v_elapsed_sec if v_elapsed_sec > 0 else None,
+        'mb_per_sec': p_result_sum['total_data_size']/v_elapsed_sec/1024/1024 if v_elapsed_sec > 0 else None,
+        'latency_p50_ms': p_result_sum['latency']['p50_ms'],
+        'latency_p99_ms': p_result_sum['latency']['p99_ms']
+    }
+
+
+# ----------------------------------------------------
+# Get report records per axis value and per combination of axis values
+# ----------------------------------------------------
+def get_matrix_report(p_runs):
+
+    v_metric_names = ('rows_per_sec', 'mb_per_sec', 'latency_p50_ms', 'latency_p99_ms')
+    v_report = []
+
+    # Group runs by value of every axis
+    v_axis_names = list(p_runs[0]['axes'].keys()) if len(p_runs) > 0 else []
+    for v_axis_name in v_axis_names:
+        v_groups = dict()
+        for v_run in p_runs:
+            v_groups.setdefault(v_run['axes'][v_axis_name], []).append(v_run)
+        for v_label, v_group in v_groups.items():
+            v_record = { 'type': 'matrix_axis', 'axis': v_axis_name, 'value': v_label }
+            for v_metric_name in v_metric_names:
+                v_record[v_metric_name] = get_matrix_summary([ v_run['metrics'][v_metric_name] for v_run in v_group ])
+            v_report.append(v_record)
+
+    # Group runs by combination of axis values, the variance is across repetitions
+    v_groups = dict()
+    for v_run in p_runs:
+        v_groups.setdefault(tuple(v_run['axes'].items()), []).append(v_run)
+    for v_key, v_group in v_groups.items():
+        v_record = { 'type': 'matrix_combination', 'axes': dict(v_key) }
+        for v_metric_name in v_metric_names:
+            v_record[v_metric_name] = get_matrix_summary([ v_run['metrics'][v_metric_name] for v_run in v_group ])
+        v_report.append(v_record)
+
+    return v_report
+
+
+# ----------------------------------------------------
+# Write report records as Markdown tables
+# ----------------------------------------------------
+def write_matrix_report(p_file_name, p_report):
+
+    v_header = '| rows/s mean | rows/s stdev | rows/s cv % | MiB/s mean | p50 ms mean | p99 ms mean | p99 ms cv % |'
+    v_separator = '|---|---|---|---|---|---|---|'
+
+    def get_row(p_record):
+        return '| {} | {} | {} | {} | {} | {} | {} |'.format(
+            p_record['rows_per_sec']['mean'], p_record['rows_per_sec']['stdev'], p_record['rows_per_sec']['cv_pct'],
+            p_record['mb_per_sec']['mean'], p_record['latency_p50_ms']['mean'], p_record['latency_p99_ms']['mean'], p_record['latency_p99_ms']['cv_pct'])
+
+    with open(p_file_name, 'w') as v_file:
+
+        v_axis_names = []
+        for v_record in p_report:
+            if v_record['type'] == 'matrix_axis' and v_record['axis'] not in v_axis_names:
+                v_axis_names.append(v_record['axis'])
+
+        for v_axis_name in v_axis_names:
+            v_file.write('## {}\n\n'.format(v_axis_name))
+            v_file.write('| {} | runs {}\n'.format(v_axis_name, v_header))
+            v_file.write('|---|---{}\n'.format(v_separator))
+            for v_record in p_report:
+                if v_record['type'] == 'matrix_axis' and v_record['axis'] == v_axis_name:
+                    v_file.write('| {} | {} {}\n'.format(v_record['value'], v_record['rows_per_sec']['runs'], get_row(v_record)))
+            v_file.write('\n')
+
+        v_file.write('## combinations\n\n')
+        v_file.write('| {} | runs {}\n'.format(' | '.join(v_axis_names), v_header))
+        v_file.write('|{}---{}\n'.format('---|' * len(v_axis_names), v_separator))
+        for v_record in p_report:
+            if v_record['type'] == 'matrix_combination':
+                v_file.write('| {} | {} {}\n'.format(' | '.join(v_record['axes'][v_axis_name] for v_axis_name in v_axis_names), v_record['rows_per_sec']['runs'], get_row(v_record)))
+
+
+# ----------------------------------------------------
+# Run benchmark matrix sequentially and report results
+# ----------------------------------------------------
+def run_matrix(p_params):
+
+    try:
+        with open(p_params['matrix']) as v_file:
+            v_config = json.load(v_file)
+    except Exception as e:
+        g_logger.error ('Cannot read matrix config file {0}: {1}'.format(p_params['matrix'], e))
+        sys.exit(2)
+
+    v_runs = get_matrix_runs(p_params, v_config)
+    v_output_file_name = v_config.get('output', 'matrix-results.jsonl')
+    v_report_file_name = v_config.get('report', 'matrix-report.md')
+    v_settle_sec = v_config.get('settle', 0)
+
+    # Check parameters of all runs before starting
+    for v_run in v_runs:
+        v_error = check_input_parameters(v_run['params'])
+        if v_error != None:
+            g_logger.error ('Matrix run {0} {1}: {2}'.format(v_run['run'], v_run['axes'], v_error))
+            sys.exit(2)
+
+    # Execute runs and store all results
+    with open(v_output_file_name, 'a') as v_output_file:
+        for v_run in v_runs:
+
+            g_logger.info ('Matrix run {0}/{1}, repetition {2}: {3}'.format(v_run['run'], len(v_runs), v_run['repetition'], v_run['axes']))
+            v_results = run_load(v_run['params'])
+
+            for v_result in v_results:
+                v_result['matrix'] = { 'file': p_params['matrix'], 'run': v_run['run'], 'repetition': v_run['repetition'], 'axes': v_run['axes'] }
+                v_output_file.write(json.dumps(v_result, default=get_json_value)+'\n')
+            v_output_file.flush()
+
+            v_result_sum = next(v_result for v_result in v_results if v_result['type'] == 'sum')
+            v_run['metrics'] = get_matrix_metrics(v_result_sum)
+
+            # Let the target settle before the next run
+            if v_run['run'] < len(v_runs) and v_settle_sec > 0:
+                g_logger.info ('Settling for {0} seconds'.format(v_settle_sec))
+                time.sleep(v_settle_sec)
+
+    # Report throughput and latency per axis
+    v_report = get_matrix_report(v_runs)
+    for v_result in v_report:
+        print_result(v_result)
+    write_matrix_report(v_report_file_name, v_report)
+    g_logger.info ('Matrix results stored in {0}, report in {1}'.format(v_output_file_name, v_report_file_name))
+
+
+# ----------------------------------------------------
+# MAIN FUNCTION
+# ----------------------------------------------------
+def main(p_argv):
+
+    # Initialize logging
+    initialize_logging(p_argv[0], 'INFO');
+
+    # Get command line parameters
+    v_params = get_input_parameters(p_argv)
+    g_logger.setLevel(v_params['loglevel'])
+
+    # Compare stored runs, record dataset, run agent, run benchmark matrix, or run single load
+    if v_params['compare'] != None:
+        if not run_compare(v_params):
+            sys.exit(1)
+    elif v_params['record'] != None:
+        run_record(v_params)
+    elif v_params['agentport'] > 0:
+        run_agent(v_params)
+    elif v_params['matrix'] != None:
+        run_matrix(v_params)
+    else:
+        run_load(v_params)
 
 
 # ----------------------------------------------------